@@ -1,7 +1,11 @@
+import asyncio
+import dataclasses
 import json
 import logging
+from typing import AsyncIterator, Optional
 
 import anthropic
+import httpx
 
 from app.config import settings
 from app.core.entities import CandidateScore, Opportunity, RankedMatch
@@ -9,16 +13,170 @@ from app.ports.ai_port import AIPort
 
 logger = logging.getLogger(__name__)
 
+MODEL = "claude-sonnet-4-20250514"
+
+
+def _to_ranked_match(item: dict) -> RankedMatch:
+    return RankedMatch(
+        user_id=item["user_id"],
+        rank=item["rank"],
+        score=item["score"],
+        explanation=item["explanation"],
+    )
+
+
+def _fallback(candidates: list[CandidateScore]) -> list[RankedMatch]:
+    """Phase 1 order with a generic explanation, used when the LLM call fails."""
+    return [
+        RankedMatch(
+            user_id=c.user.id,
+            rank=i + 1,
+            score=c.combined_score,
+            explanation=f"Matched based on profile similarity ({c.embedding_score:.0%} skill match).",
+            is_fallback=True,
+        )
+        for i, c in enumerate(candidates)
+    ]
+
+
+class _JsonArrayObjectParser:
+    """Incrementally extracts the objects of a streamed top-level JSON array.
+
+    Feed it text chunks as they arrive; it returns every object whose closing brace
+    has been seen. Anything before the opening bracket (e.g. a markdown fence) is skipped.
+    """
 
-class AnthropicAdapter(AIPort):
     def __init__(self):
-        self._client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._buf: list[str] = []
+
+    def feed(self, chunk: str) -> list[dict]:
+        items = []
+        for ch in chunk:
+            if not self._in_array:
+                self._in_array = ch == "["
+                continue
+            if self._depth:
+                self._buf.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if not self._depth:
+                    self._buf = [ch]
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    items.append(json.loads("".join(self._buf)))
+        return items
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return anthropic.DefaultAsyncHttpxClient(
+        timeout=httpx.Timeout(settings.llm_read_timeout, connect=settings.llm_connect_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_connections,
+        ),
+    )
+
+
+class AnthropicAdapter(AIPort):
+    """Non-blocking ranking client.
+
+    A single instance is shared per process (see `get_ai`), so every request reuses the
+    same connection pool. The semaphore caps in-flight LLM calls; requests beyond the cap
+    wait on the event loop instead of opening more connections.
+    """
+
+    def __init__(self, client: Optional[anthropic.AsyncAnthropic] = None):
+        self._client = client or anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=_build_http_client(),
+        )
+        self._semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
 
     async def rank_and_explain(
         self,
         opportunity: Opportunity,
         candidates: list[CandidateScore],
     ) -> list[RankedMatch]:
+        prompt = self._build_prompt(opportunity, candidates)
+
+        try:
+            async with self._semaphore:
+                response = await self._client.messages.create(
+                    model=MODEL,
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            raw = response.content[0].text.strip()
+            if raw.startswith("```"):
+                raw = raw.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+
+            parsed = json.loads(raw)
+            return [_to_ranked_match(item) for item in parsed]
+        except Exception as e:
+            logger.error("Anthropic ranking failed: %s", e)
+            return _fallback(candidates)
+
+    async def stream_rank_and_explain(
+        self,
+        opportunity: Opportunity,
+        candidates: list[CandidateScore],
+    ) -> AsyncIterator[RankedMatch]:
+        # The LLM stream is drained into a queue by its own task, so the semaphore is
+        # released as soon as the model finishes, however slowly our caller (an SSE
+        # client) consumes the matches.
+        prompt = self._build_prompt(opportunity, candidates)
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async with self._semaphore:
+                    async with self._client.messages.stream(
+                        model=MODEL,
+                        max_tokens=1024,
+                        messages=[{"role": "user", "content": prompt}],
+                    ) as stream:
+                        parser = _JsonArrayObjectParser()
+                        async for text in stream.text_stream:
+                            for item in parser.feed(text):
+                                queue.put_nowait(_to_ranked_match(item))
+                queue.put_nowait(done)
+            except Exception as e:
+                queue.put_nowait(e)
+
+        pump_task = asyncio.create_task(pump())
+        emitted: set[str] = set()
+        try:
+            while (item := await queue.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                emitted.add(item.user_id)
+                yield item
+        except Exception as e:
+            logger.error("Anthropic streaming ranking failed: %s", e)
+            # Ranks continue after the matches the caller already has.
+            remaining = [m for m in _fallback(candidates) if m.user_id not in emitted]
+            for rank, match in enumerate(remaining, start=len(emitted) + 1):
+                yield dataclasses.replace(match, rank=rank)
+        finally:
+            pump_task.cancel()  # the caller went away: stop the LLM call too
+
+    @staticmethod
+    def _build_prompt(opportunity: Opportunity, candidates: list[CandidateScore]) -> str:
         profiles_text = ""
         for i, c in enumerate(candidates, 1):
             shared = ", ".join(c.shared_connections) if c.shared_connections else "none"
@@ -34,7 +192,7 @@ class AnthropicAdapter(AIPort):
                 f"Shared connections: {shared}\n"
             )
 
-        prompt = f"""You are the matching engine for Serendip Lab, a platform that creates intentional connections between people and opportunities. Analyze the opportunity and candidates, then rank them by fit.
+        return f"""You are the matching engine for Serendip Lab, a platform that creates intentional connections between people and opportunities. Analyze the opportunity and candidates, then rank them by fit.
 
 OPPORTUNITY:
 Title: {opportunity.title}
@@ -58,35 +216,3 @@ Respond ONLY with a JSON array (no markdown, no explanation outside the array):
 ]
 
 Score should be 0-1, reflecting overall match quality. Rank 1 is the best match."""
-
-        try:
-            response = self._client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw = response.content[0].text.strip()
-            if raw.startswith("```"):
-                raw = raw.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-
-            parsed = json.loads(raw)
-            return [
-                RankedMatch(
-                    user_id=item["user_id"],
-                    rank=item["rank"],
-                    score=item["score"],
-                    explanation=item["explanation"],
-                )
-                for item in parsed
-            ]
-        except Exception as e:
-            logger.error("Anthropic ranking failed: %s", e)
-            return [
-                RankedMatch(
-                    user_id=c.user.id,
-                    rank=i + 1,
-                    score=c.combined_score,
-                    explanation=f"Matched based on profile similarity ({c.embedding_score:.0%} skill match).",
-                )
-                for i, c in enumerate(candidates)
-            ]
@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when as many hashes are pending as the hasher accepts."""
+
+
+# Module-level so the process pool can pickle them by reference.
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(password, hashed)
+    except ValueError:  # not a bcrypt hash, e.g. a seeded user without a password
+        return False
+
+
+def cost_of(hashed: str) -> Optional[int]:
+    """The cost factor of a `$2b$12$...` hash, or None if it is not one."""
+    parts = hashed.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt in a dedicated process pool, off the request threads and the event loop.
+
+    At most `max_pending` hashes are running or queued; beyond that `hash` and `verify`
+    raise PasswordHasherBusy instead of queueing, so a login storm is shed at the door
+    rather than holding every caller for seconds. The pool's processes are spawned on
+    first use.
+    """
+
+    def __init__(
+        self,
+        rounds: int,
+        workers: int,
+        max_pending: int,
+        executor: Optional[Executor] = None,
+    ):
+        self.rounds = rounds
+        self._max_pending = max_pending
+        self._pending = 0  # only touched on the event loop
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash, password.encode(), self.rounds)
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_check, password.encode(), hashed.encode())
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return cost_of(hashed) != self.rounds
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self._max_pending:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._pending -= 1
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: str
+    issued_at: int  # unix seconds
+    key_id: str
+    token_id: str  # random; what a logout puts on the denylist
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def parse_signing_keys(spec: str) -> dict[str, bytes]:
+    """`kid:secret,kid:secret,...` -> {kid: secret}, in order; the first key signs."""
+    keys: dict[str, bytes] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kid, sep, secret = item.partition(":")
+        if not sep or not kid or not secret:
+            raise ValueError("Signing keys must be given as kid:secret pairs")
+        keys[kid] = secret.encode()
+    return keys
+
+
+class TokenSigner:
+    """Stateless session tokens: `<payload>.<signature>`, both base64url.
+
+    The payload is JSON with the user id, issue time, signing key id and a random token
+    id; the signature is HMAC-SHA256 of the encoded payload under that key. Verifying
+    needs no storage. To rotate, put the new key first (it signs from then on) and keep
+    the old one listed until tokens it signed have expired.
+    """
+
+    def __init__(
+        self,
+        keys: dict[str, bytes],
+        ttl_seconds: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        if not keys:
+            raise ValueError("Signed session tokens need at least one signing key")
+        self._keys = keys
+        self._active = next(iter(keys))
+        self._ttl = ttl_seconds
+        self._clock = clock
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever the keys or TTL do, i.e. whenever a token may verify differently."""
+        material = [self._ttl] + [[kid, key.hex()] for kid, key in self._keys.items()]
+        return hashlib.sha256(json.dumps(material).encode()).hexdigest()
+
+    def issue(self, user_id: str) -> str:
+        claims = {
+            "sub": user_id,
+            "iat": int(self._clock()),
+            "kid": self._active,
+            "jti": secrets.token_urlsafe(12),
+        }
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{payload}.{self._sign(self._keys[self._active], payload)}"
+
+    def verify(self, token: str) -> Optional[TokenClaims]:
+        """The token's claims, or None if it is malformed, forged, signed by a key no
+        longer listed, or older than the TTL."""
+        payload, sep, signature = token.partition(".")
+        if not sep:
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+            key = self._keys.get(claims["kid"])
+            if key is None or not hmac.compare_digest(self._sign(key, payload), signature):
+                return None
+            parsed = TokenClaims(
+                user_id=str(claims["sub"]),
+                issued_at=int(claims["iat"]),
+                key_id=claims["kid"],
+                token_id=str(claims["jti"]),
+            )
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            return None
+        if parsed.issued_at + self._ttl <= self._clock():
+            return None
+        return parsed
+
+    @staticmethod
+    def _sign(key: bytes, payload: str) -> str:
+        return _b64encode(hmac.new(key, payload.encode(), hashlib.sha256).digest())
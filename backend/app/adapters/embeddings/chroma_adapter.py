@@ -1,44 +1,131 @@
+from typing import Iterator, Optional
+
 import chromadb
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 
+from app.adapters.embeddings.embedding_cache import EmbeddingCache
 from app.config import settings
-from app.ports.embedding_port import EmbeddingPort
+from app.ports.embedding_port import EmbeddingPort, open_to_metadata
+
+
+def _to_chroma_where(where: Optional[dict]) -> Optional[dict]:
+    if not where:
+        return None
+    if len(where) == 1:
+        return dict(where)
+    return {"$and": [{k: v} for k, v in where.items()]}
+
+
+def _to_items(results: dict, q: int) -> list[dict]:
+    """Hits for the q-th query of a Chroma query result."""
+    items = []
+    for i, uid in enumerate(results["ids"][q]):
+        distance = results["distances"][q][i] if results["distances"] else 0.0
+        score = 1.0 - distance
+        meta = results["metadatas"][q][i] if results["metadatas"] else {}
+        items.append({"user_id": uid, "score": score, "metadata": meta})
+    return items
 
 
 class ChromaEmbeddingAdapter(EmbeddingPort):
     def __init__(self):
         self._client = chromadb.PersistentClient(path=settings.chroma_persist_dir)
+        self._embedding_fn = DefaultEmbeddingFunction()
         self._collection = self._client.get_or_create_collection(
             name="profiles",
             metadata={"hnsw:space": "cosine"},
+            embedding_function=self._embedding_fn,
+        )
+        # Queries repeat (re-matches, repeated searches); profiles are embedded uncached.
+        self._query_cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_size,
+            path=settings.embedding_cache_path or None,
+            max_disk_entries=settings.embedding_cache_disk_max_rows,
         )
 
-    def upsert_profile(self, user_id: str, text: str, metadata: dict) -> None:
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return self._query_cache.embed(texts, self._embedding_fn)
+
+    def query_cache_stats(self) -> dict:
+        return self._query_cache.stats()
+
+    def upsert_profile(self, user_id: str, text: str, metadata: dict) -> list[float]:
+        vector = [float(x) for x in self._embedding_fn([text])[0]]
         self._collection.upsert(
             ids=[user_id],
+            embeddings=[vector],
             documents=[text],
             metadatas=[metadata],
         )
+        return vector
 
-    def search_similar(self, query_text: str, n_results: int = 15) -> list[dict]:
+    def search_similar(
+        self,
+        query_text: str,
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[dict]:
+        return self.search_similar_batch([query_text], n_results, where)[0]
+
+    def search_similar_batch(
+        self,
+        query_texts: list[str],
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        if not query_texts:
+            return []
         results = self._collection.query(
-            query_texts=[query_text],
+            query_embeddings=self.embed_texts(query_texts),
             n_results=n_results,
+            where=_to_chroma_where(where),
         )
-
-        items = []
-        if not results["ids"] or not results["ids"][0]:
-            return items
-
-        for i, uid in enumerate(results["ids"][0]):
-            distance = results["distances"][0][i] if results["distances"] else 0.0
-            score = 1.0 - distance
-            meta = results["metadatas"][0][i] if results["metadatas"] else {}
-            items.append({"user_id": uid, "score": score, "metadata": meta})
-
-        return items
+        if not results["ids"]:
+            return [[] for _ in query_texts]
+        return [_to_items(results, q) for q in range(len(query_texts))]
 
     def delete_profile(self, user_id: str) -> None:
         try:
             self._collection.delete(ids=[user_id])
         except Exception:
             pass
+
+    def iter_embeddings(self, batch_size: int = 500) -> Iterator[tuple[list, list, list]]:
+        """Stored (ids, embeddings, metadatas) in pages, e.g. to seed another index."""
+        offset = 0
+        while True:
+            page = self._collection.get(
+                include=["embeddings", "metadatas"], limit=batch_size, offset=offset
+            )
+            if not page["ids"]:
+                return
+            yield page["ids"], page["embeddings"], page["metadatas"]
+            offset += len(page["ids"])
+
+    def backfill_open_to_fields(self, batch_size: int = 500) -> int:
+        """Add per-category open_to flags to profiles stored before they existed.
+
+        Only metadata is rewritten, so documents are not re-embedded.
+        Returns the number of profiles updated.
+        """
+        updated = 0
+        offset = 0
+        while True:
+            page = self._collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            if not page["ids"]:
+                break
+            ids, metadatas = [], []
+            for uid, meta in zip(page["ids"], page["metadatas"]):
+                meta = dict(meta or {})
+                open_to = [c for c in str(meta.get("open_to", "")).split(",") if c]
+                flags = open_to_metadata(open_to)
+                if all(meta.get(k) == v for k, v in flags.items()):
+                    continue
+                meta.update(flags)
+                ids.append(uid)
+                metadatas.append(meta)
+            if ids:
+                self._collection.update(ids=ids, metadatas=metadatas)
+                updated += len(ids)
+            offset += len(page["ids"])
+        return updated
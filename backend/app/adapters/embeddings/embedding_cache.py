@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Cache key for a query: surrounding and repeated whitespace do not change the vector."""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """Bounded LRU of text -> embedding vector.
+
+    With `path` set, vectors are also written through to a small SQLite file and read
+    back on a memory miss, so the cache survives restarts. The file keeps at most
+    `max_disk_entries` rows, dropping the least recently written or read on insert.
+    Safe to share across the threads FastAPI runs sync routes on.
+    """
+
+    def __init__(
+        self, max_entries: int, path: Optional[str] = None, max_disk_entries: int = 50_000
+    ):
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(query_embeddings)")}
+            if "last_used" not in columns:
+                self._db.execute(
+                    "ALTER TABLE query_embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ix_query_embeddings_last_used"
+                " ON query_embeddings (last_used)"
+            )
+            self._db.commit()
+
+    def get_many(self, keys: list[str]) -> list[Optional[np.ndarray]]:
+        with self._lock:
+            found: list[Optional[np.ndarray]] = []
+            read_from_disk = []
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                else:
+                    vector = self._load(key)
+                    if vector is not None:
+                        self._remember(key, vector)
+                        self._stats["disk_hits"] += 1
+                        read_from_disk.append(key)
+                    else:
+                        self._stats["misses"] += 1
+                found.append(vector)
+            if read_from_disk:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE query_embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in read_from_disk],
+                )
+                self._db.commit()
+            return found
+
+    def put_many(self, keys: list[str], vectors: list[np.ndarray]) -> None:
+        with self._lock:
+            rows = []
+            now = time.time()
+            for key, vector in zip(keys, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes(), now))
+            if self._db is not None and rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings (key, vector, last_used)"
+                    " VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._db.execute(
+                    "DELETE FROM query_embeddings WHERE key IN ("
+                    " SELECT key FROM query_embeddings"
+                    " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self._max_disk_entries,),
+                )
+                self._db.commit()
+
+    def embed(self, texts: list[str], embed_fn: Callable) -> list[list[float]]:
+        """Vectors for `texts`, calling `embed_fn` once for the distinct uncached ones."""
+        keys = [normalize_text(t) for t in texts]
+        vectors = self.get_many(keys)
+        missing = list(dict.fromkeys(k for k, v in zip(keys, vectors) if v is None))
+        if missing:
+            computed = embed_fn(missing)
+            self.put_many(missing, computed)
+            by_key = dict(zip(missing, computed))
+            vectors = [v if v is not None else by_key[k] for k, v in zip(keys, vectors)]
+        return [[float(x) for x in v] for v in vectors]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
@@ -0,0 +1,376 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from app.adapters.embeddings.embedding_cache import EmbeddingCache
+from app.config import settings
+from app.ports.embedding_port import EmbeddingPort
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+_INITIAL_CAPACITY = 1024
+_SCAN_CHUNK_ROWS = 8192
+_SCAN_CHUNK_QUERIES = 64
+_INT8_SCALE = 127.0
+
+
+def _normalize_rows(vectors) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _quantize(vectors: np.ndarray, storage_dtype: str) -> np.ndarray:
+    if storage_dtype == "int8":
+        # Rows are unit-normalised, so every component already lies in [-1, 1].
+        return np.rint(vectors * _INT8_SCALE).astype(np.int8)
+    return vectors.astype(np.float16)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class NumpyEmbeddingAdapter(EmbeddingPort):
+    """In-process brute-force vector index over a memory-mapped `.npy` matrix.
+
+    Rows are stored unit-normalised, so cosine similarity is one matrix-vector product
+    and scores line up with ChromaEmbeddingAdapter's (1 - cosine distance). The row <->
+    user id map and metadata live in a SQLite sidecar and are held in memory.
+
+    Deletes only tombstone a row; once tombstones exceed `compact_ratio` of the rows the
+    matrix is compacted in place. With `storage_dtype` "float16" or "int8" searches scan a
+    quantized copy and rescore the best `rescore_factor * n_results` rows exactly against
+    the float32 matrix, which then stays on disk except for the rows touched.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        storage_dtype: str = "float32",
+        rescore_factor: int = 4,
+        compact_ratio: float = 0.25,
+        embedding_fn: Optional[Callable] = None,
+    ):
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                f"storage_dtype must be one of {STORAGE_DTYPES}, got {storage_dtype!r}"
+            )
+        os.makedirs(index_dir, exist_ok=True)
+        self._vectors_path = os.path.join(index_dir, "vectors.npy")
+        self._codes_path = os.path.join(index_dir, f"vectors.{storage_dtype}.npy")
+        self._storage_dtype = storage_dtype
+        self._rescore_factor = max(1, rescore_factor)
+        self._compact_ratio = compact_ratio
+        self._embedding_fn = embedding_fn or DefaultEmbeddingFunction()
+        self._query_cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_size,
+            path=settings.embedding_cache_path or None,
+            max_disk_entries=settings.embedding_cache_disk_max_rows,
+        )
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(os.path.join(index_dir, "rows.db"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "row INTEGER PRIMARY KEY, user_id TEXT NOT NULL UNIQUE, metadata TEXT NOT NULL)"
+        )
+        self._db.commit()
+        self._load()
+
+    # -- EmbeddingPort ---------------------------------------------------------------
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return self._query_cache.embed(texts, self._embedding_fn)
+
+    def query_cache_stats(self) -> dict:
+        return self._query_cache.stats()
+
+    def upsert_profile(self, user_id: str, text: str, metadata: dict) -> list[float]:
+        vector = [float(x) for x in self._embedding_fn([text])[0]]
+        self.upsert_vectors([user_id], [vector], [metadata])
+        return vector
+
+    def search_similar(
+        self,
+        query_text: str,
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[dict]:
+        return self.search_by_vector(self.embed_texts([query_text])[0], n_results, where)
+
+    def search_similar_batch(
+        self,
+        query_texts: list[str],
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        if not query_texts:
+            return []
+        return self.search_by_vectors(self.embed_texts(query_texts), n_results, where)
+
+    def delete_profile(self, user_id: str) -> None:
+        with self._lock:
+            row = self._rows.pop(user_id, None)
+            if row is None:
+                return
+            self._alive[row] = False
+            self._ids[row] = None
+            self._metadata[row] = None
+            for column in self._columns.values():
+                column[row] = None
+            self._dead += 1
+            self._db.execute("DELETE FROM profiles WHERE row = ?", (row,))
+            self._db.commit()
+            if self._dead > self._compact_ratio * self._size:
+                self._compact()
+
+    # -- Bulk / vector-level API ----------------------------------------------------
+
+    def upsert_vectors(self, user_ids: list[str], vectors, metadatas: list[dict]) -> None:
+        """Store precomputed embeddings (bulk loads, migrating from Chroma)."""
+        vectors = _normalize_rows(vectors)
+        with self._lock:
+            new_ids = [u for u in dict.fromkeys(user_ids) if u not in self._rows]
+            self._ensure_capacity(self._size + len(new_ids), vectors.shape[1])
+            for user_id in new_ids:
+                self._rows[user_id] = self._size
+                self._ids.append(user_id)
+                self._metadata.append(None)
+                self._size += 1
+            rows = np.array([self._rows[u] for u in user_ids], dtype=np.int64)
+
+            self._vectors[rows] = vectors
+            if self._codes is not None:
+                self._codes[rows] = _quantize(vectors, self._storage_dtype)
+            self._alive[rows] = True
+            for row, user_id, metadata in zip(rows.tolist(), user_ids, metadatas):
+                self._ids[row] = user_id
+                self._metadata[row] = dict(metadata)
+                for key, column in self._columns.items():
+                    column[row] = metadata.get(key)
+            self._flush()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO profiles (row, user_id, metadata) VALUES (?, ?, ?)",
+                [(r, u, json.dumps(m)) for r, u, m in zip(rows.tolist(), user_ids, metadatas)],
+            )
+            self._db.commit()
+
+    def search_by_vector(
+        self,
+        vector,
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[dict]:
+        return self.search_by_vectors([vector], n_results, where)[0]
+
+    def search_by_vectors(
+        self,
+        vectors,
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """Top-n hits for each query vector; the matrix is scanned once for all of them."""
+        queries = _normalize_rows(vectors)
+        with self._lock:
+            size = self._size
+            if size == 0 or n_results <= 0:
+                return [[] for _ in queries]
+            mask = self._alive[:size].copy()
+            for key, value in (where or {}).items():
+                mask &= self._column(key)[:size] == value
+            n_candidates = int(mask.sum())
+            if n_candidates == 0:
+                return [[] for _ in queries]
+            k = min(n_results, n_candidates)
+
+            if self._codes is None:
+                rows, scores = self._scan(self._vectors, queries, size, mask, k)
+                return [self._hits(rows[q, :k], scores[q, :k]) for q in range(len(queries))]
+            shortlist = min(k * self._rescore_factor, n_candidates)
+            rows, _ = self._scan(self._codes, queries, size, mask, shortlist)
+            return [self._rescored_hits(rows[q], queries[q], k) for q in range(len(queries))]
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "profiles": len(self._rows),
+                "rows": self._size,
+                "tombstones": self._dead,
+                "capacity": 0 if self._vectors is None else self._vectors.shape[0],
+                "storage_dtype": self._storage_dtype,
+            }
+
+    # -- Internals --------------------------------------------------------------------
+
+    def _load(self) -> None:
+        records = self._db.execute("SELECT row, user_id, metadata FROM profiles").fetchall()
+        self._vectors: Optional[np.memmap] = None
+        self._codes: Optional[np.memmap] = None
+        self._columns: dict[str, np.ndarray] = {}
+        self._size = max((r for r, _, _ in records), default=-1) + 1
+        self._ids: list[Optional[str]] = [None] * self._size
+        self._metadata: list[Optional[dict]] = [None] * self._size
+        self._rows: dict[str, int] = {}
+        for row, user_id, metadata in records:
+            self._ids[row] = user_id
+            self._metadata[row] = json.loads(metadata)
+            self._rows[user_id] = row
+        self._dead = self._size - len(records)
+
+        capacity = 0
+        if os.path.exists(self._vectors_path):
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+            capacity = self._vectors.shape[0]
+            if self._storage_dtype != "float32":
+                self._codes = self._open_codes()
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[[r for r, _, _ in records]] = True
+
+    def _open_codes(self) -> np.memmap:
+        """Open the quantized copy, rebuilding it if missing or out of step with the matrix."""
+        if os.path.exists(self._codes_path):
+            codes = np.load(self._codes_path, mmap_mode="r+")
+            if codes.shape == self._vectors.shape:
+                return codes
+            del codes
+        codes = np.lib.format.open_memmap(
+            self._codes_path, mode="w+", dtype=self._storage_dtype, shape=self._vectors.shape
+        )
+        for start in range(0, self._size, _SCAN_CHUNK_ROWS):
+            chunk = np.asarray(self._vectors[start : start + _SCAN_CHUNK_ROWS])
+            codes[start : start + len(chunk)] = _quantize(chunk, self._storage_dtype)
+        codes.flush()
+        return codes
+
+    def _ensure_capacity(self, rows_needed: int, dim: int) -> None:
+        if self._vectors is not None and self._vectors.shape[1] != dim:
+            raise ValueError(f"index holds {self._vectors.shape[1]}-d vectors, got {dim}-d")
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows_needed <= capacity:
+            return
+        new_capacity = max(rows_needed, capacity * 2, _INITIAL_CAPACITY)
+        self._vectors = self._resize(
+            self._vectors_path, self._vectors, new_capacity, dim, "float32"
+        )
+        if self._storage_dtype != "float32":
+            self._codes = self._resize(
+                self._codes_path, self._codes, new_capacity, dim, self._storage_dtype
+            )
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:capacity] = self._alive
+        self._alive = alive
+        self._columns.clear()
+
+    def _resize(
+        self, path: str, old: Optional[np.memmap], capacity: int, dim: int, dtype: str
+    ) -> np.memmap:
+        tmp_path = path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(capacity, dim))
+        if old is not None:
+            grown[: self._size] = old[: self._size]
+        grown.flush()
+        del grown, old
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode="r+")
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self._alive[: self._size])
+        n = len(live)
+        self._vectors[:n] = self._vectors[live]
+        if self._codes is not None:
+            self._codes[:n] = self._codes[live]
+        self._alive[:] = False
+        self._alive[:n] = True
+        self._ids = [self._ids[r] for r in live.tolist()]
+        self._metadata = [self._metadata[r] for r in live.tolist()]
+        self._rows = {user_id: row for row, user_id in enumerate(self._ids)}
+        self._size = n
+        self._dead = 0
+        self._columns.clear()
+        self._flush()
+        with self._db:
+            self._db.execute("DELETE FROM profiles")
+            self._db.executemany(
+                "INSERT INTO profiles (row, user_id, metadata) VALUES (?, ?, ?)",
+                [(r, u, json.dumps(m)) for r, (u, m) in enumerate(zip(self._ids, self._metadata))],
+            )
+
+    def _column(self, key: str) -> np.ndarray:
+        """Metadata values for `key` by row, so `where` filters are one vectorised compare."""
+        column = self._columns.get(key)
+        if column is None:
+            column = np.empty(len(self._alive), dtype=object)
+            column[: self._size] = [m.get(key) if m else None for m in self._metadata]
+            self._columns[key] = column
+        return column
+
+    def _scan(
+        self, matrix: np.ndarray, queries: np.ndarray, size: int, mask: np.ndarray, m: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and scores of the `m` best rows in `mask` for each query, best first.
+
+        Scores are computed a block of queries by a chunk of rows at a time and only the
+        running top `m` per query is kept, so memory stays flat however many queries a
+        batch brings. `m` must not exceed the rows in `mask`.
+        """
+        best_rows = np.empty((len(queries), m), dtype=np.int64)
+        best_scores = np.empty((len(queries), m), dtype=np.float32)
+        for q in range(0, len(queries), _SCAN_CHUNK_QUERIES):
+            block = queries[q : q + _SCAN_CHUNK_QUERIES]
+            rows = np.empty((len(block), 0), dtype=np.int64)
+            scores = np.empty((len(block), 0), dtype=np.float32)
+            for start in range(0, size, _SCAN_CHUNK_ROWS):
+                stop = min(start + _SCAN_CHUNK_ROWS, size)
+                chunk = block @ matrix[start:stop].astype(np.float32, copy=False).T
+                chunk[:, ~mask[start:stop]] = -np.inf
+                scores = np.concatenate([scores, chunk], axis=1)
+                rows = np.concatenate(
+                    [rows, np.broadcast_to(np.arange(start, stop), chunk.shape)], axis=1
+                )
+                if scores.shape[1] > m:
+                    keep = np.argpartition(-scores, m - 1, axis=1)[:, :m]
+                    scores = np.take_along_axis(scores, keep, axis=1)
+                    rows = np.take_along_axis(rows, keep, axis=1)
+            order = np.argsort(-scores, axis=1, kind="stable")[:, :m]
+            best_rows[q : q + len(block)] = np.take_along_axis(rows, order, axis=1)
+            best_scores[q : q + len(block)] = np.take_along_axis(scores, order, axis=1)
+        return best_rows, best_scores
+
+    def _rescored_hits(self, shortlist: np.ndarray, query: np.ndarray, k: int) -> list[dict]:
+        """Rescore a quantized shortlist exactly against the float32 matrix."""
+        # Sorted so the exact rows are read from the memmap in file order.
+        shortlist = np.sort(shortlist)
+        exact = np.asarray(self._vectors[shortlist], dtype=np.float32) @ query
+        order = _top_k(exact, k)
+        return self._hits(shortlist[order], exact[order])
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray) -> list[dict]:
+        return [
+            {
+                "user_id": self._ids[row],
+                "score": float(score),
+                "metadata": dict(self._metadata[row]),
+            }
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+
+    def _flush(self) -> None:
+        self._vectors.flush()
+        if self._codes is not None:
+            self._codes.flush()
@@ -1,10 +1,13 @@
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from typing import Optional
 
+from sqlalchemy import func, or_, select, union, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.adapters.persistence.keyset import keyset_page
 from app.adapters.persistence.models import ConnectionModel, UserModel
 from app.core.entities import Connection
 from app.core.enums import ConnectionSource
-from app.ports.repositories import ConnectionRepository
+from app.ports.repositories import ConnectionRepository, PageKey
 
 
 class SqlConnectionRepository(ConnectionRepository):
@@ -34,27 +37,166 @@ class SqlConnectionRepository(ConnectionRepository):
         )
         return [self._to_entity(m) for m in models]
 
+    def get_connections_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[Connection]:
+        c = ConnectionModel
+        # One ordered index range per endpoint column, merged; an OR filter cannot seek.
+        sides = union_all(
+            keyset_page(select(c).where(c.user_a == user_id), c, limit, after).subquery().select(),
+            keyset_page(select(c).where(c.user_b == user_id, c.user_a != user_id), c, limit, after)
+            .subquery()
+            .select(),
+        ).subquery()
+        merged = aliased(ConnectionModel, sides)
+        models = keyset_page(self._session.query(merged), merged, limit, None).all()
+        return [self._to_entity(m) for m in models]
+
     def get_second_degree(self, user_id: str) -> dict[str, list[str]]:
-        first_degree_conns = self.get_connections(user_id)
-        first_degree_ids = set()
-        for c in first_degree_conns:
-            other = c.user_b if c.user_a == user_id else c.user_a
-            first_degree_ids.add(other)
+        # One round trip: friends of the user, their connections, and each friend's name.
+        c = ConnectionModel
+        first_degree = union(
+            select(c.user_b.label("friend_id")).where(c.user_a == user_id),
+            select(c.user_a).where(c.user_b == user_id),
+        ).cte("first_degree")
+        hops = union_all(
+            select(first_degree.c.friend_id, c.user_b.label("other_id")).join(
+                c, c.user_a == first_degree.c.friend_id
+            ),
+            select(first_degree.c.friend_id, c.user_a).join(
+                c, c.user_b == first_degree.c.friend_id
+            ),
+        ).subquery("hops")
+        rows = self._session.execute(
+            select(hops.c.other_id, UserModel.name)
+            .distinct()
+            .outerjoin(UserModel, UserModel.id == hops.c.friend_id)
+            .where(
+                hops.c.other_id != user_id,
+                hops.c.other_id.not_in(select(first_degree.c.friend_id)),
+            )
+            .order_by(hops.c.other_id, UserModel.name)
+        )
 
         second_degree: dict[str, list[str]] = {}
-        for fid in first_degree_ids:
-            friend_name = self._session.query(UserModel.name).filter(UserModel.id == fid).scalar()
-            their_conns = self.get_connections(fid)
-            for c in their_conns:
-                other = c.user_b if c.user_a == fid else c.user_a
-                if other == user_id or other in first_degree_ids:
+        for other, friend_name in rows:
+            shared = second_degree.setdefault(other, [])
+            if friend_name:
+                shared.append(friend_name)
+        return second_degree
+
+    def count_connections(self, user_ids: list[str]) -> dict[str, int]:
+        c = ConnectionModel
+        counts = dict.fromkeys(user_ids, 0)
+        for i in range(0, len(user_ids), 500):
+            chunk = user_ids[i : i + 500]
+            # A self-connection matches get_connections' OR filter once, so count it once.
+            ends = union_all(
+                select(c.user_a.label("user_id")).where(c.user_a.in_(chunk)),
+                select(c.user_b).where(c.user_b.in_(chunk), c.user_b != c.user_a),
+            ).subquery()
+            rows = self._session.execute(
+                select(ends.c.user_id, func.count()).group_by(ends.c.user_id)
+            )
+            counts.update(rows.all())
+        return counts
+
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        c = ConnectionModel
+        first_degree = union(
+            select(c.user_b.label("friend_id")).where(c.user_a == user_id),
+            select(c.user_a).where(c.user_b == user_id),
+        ).cte("first_degree")
+        others = [o for o in dict.fromkeys(other_ids) if o != user_id]
+        related: dict[str, tuple[int, list[str]]] = {}
+        for i in range(0, len(others), 500):
+            chunk = others[i : i + 500]
+            friends = set(
+                self._session.scalars(
+                    select(first_degree.c.friend_id).where(first_degree.c.friend_id.in_(chunk))
+                )
+            )
+            related.update((o, (1, [])) for o in chunk if o in friends)
+            # Only the given users' connections are read, not the whole 2nd-degree network.
+            hops = union_all(
+                select(c.user_a.label("other_id"), c.user_b.label("via_id")).where(
+                    c.user_a.in_(chunk)
+                ),
+                select(c.user_b, c.user_a).where(c.user_b.in_(chunk)),
+            ).subquery("hops")
+            rows = self._session.execute(
+                select(hops.c.other_id, hops.c.via_id, UserModel.name)
+                .distinct()
+                .outerjoin(UserModel, UserModel.id == hops.c.via_id)
+                .where(hops.c.via_id.in_(select(first_degree.c.friend_id)))
+                .order_by(hops.c.other_id, UserModel.name)
+            )
+            for other, _, name in rows:
+                if other in friends:
                     continue
-                if other not in second_degree:
-                    second_degree[other] = []
-                if friend_name and friend_name not in second_degree[other]:
-                    second_degree[other].append(friend_name)
+                shared = related.setdefault(other, (2, []))[1]
+                if name:
+                    shared.append(name)
+        return related
 
-        return second_degree
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int, max_visited: int
+    ) -> Optional[list[str]]:
+        if source_id == target_id:
+            return [source_id]
+        # Bidirectional BFS as in SocialGraphCache, one query per level expanded.
+        parent: list[dict[str, Optional[str]]] = [{source_id: None}, {target_id: None}]
+        dist = [{source_id: 0}, {target_id: 0}]
+        frontier = [[source_id], [target_id]]
+        depths, visited = [0, 0], 2
+
+        while sum(depths) < max_depth and frontier[0] and frontier[1]:
+            side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+            depths[side] += 1
+            fresh = []
+            for via, other in self._neighbor_pairs(frontier[side]):
+                if other not in dist[side]:
+                    dist[side][other] = depths[side]
+                    parent[side][other] = via
+                    fresh.append(other)
+
+            meets = [n for n in fresh if n in dist[1 - side]]
+            if meets:
+                meet = min(meets, key=dist[1 - side].__getitem__)
+                return self._join_path(parent, meet)
+            visited += len(fresh)
+            if visited > max_visited:
+                return None
+            frontier[side] = fresh
+        return None
+
+    def _neighbor_pairs(self, user_ids: list[str]) -> list[tuple[str, str]]:
+        c = ConnectionModel
+        pairs = []
+        for i in range(0, len(user_ids), 500):
+            chunk = user_ids[i : i + 500]
+            rows = self._session.execute(
+                union_all(
+                    select(c.user_a, c.user_b).where(c.user_a.in_(chunk)),
+                    select(c.user_b, c.user_a).where(c.user_b.in_(chunk)),
+                )
+            )
+            pairs.extend((via, other) for via, other in rows)
+        return pairs
+
+    @staticmethod
+    def _join_path(parent: list[dict[str, Optional[str]]], meet: str) -> list[str]:
+        forward: list[str] = []
+        node: Optional[str] = meet
+        while node is not None:
+            forward.append(node)
+            node = parent[0][node]
+        backward: list[str] = []
+        node = parent[1][meet]
+        while node is not None:
+            backward.append(node)
+            node = parent[1][node]
+        return forward[::-1] + backward
 
     def create(self, connection: Connection) -> Connection:
         model = ConnectionModel(
@@ -1,10 +1,12 @@
 from typing import Optional
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.adapters.persistence.keyset import keyset_page
 from app.adapters.persistence.models import ConnectionRequestModel
 from app.core.entities import ConnectionRequest
-from app.ports.repositories import ConnectionRequestRepository
+from app.ports.repositories import ConnectionRequestRepository, PageKey
 
 
 class SqlConnectionRequestRepository(ConnectionRequestRepository):
@@ -57,6 +59,24 @@ class SqlConnectionRequestRepository(ConnectionRequestRepository):
         )
         return [self._to_entity(m) for m in models]
 
+    def get_incoming_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[ConnectionRequest]:
+        query = self._session.query(ConnectionRequestModel).filter(
+            ConnectionRequestModel.to_user_id == user_id,
+            ConnectionRequestModel.status == "pending",
+        )
+        models = keyset_page(query, ConnectionRequestModel, limit, after, descending=True)
+        return [self._to_entity(m) for m in models.all()]
+
+    def count_incoming(self, user_id: str) -> int:
+        return self._session.scalar(
+            select(func.count()).where(
+                ConnectionRequestModel.to_user_id == user_id,
+                ConnectionRequestModel.status == "pending",
+            )
+        )
+
     def get_outgoing(self, user_id: str) -> list[ConnectionRequest]:
         models = (
             self._session.query(ConnectionRequestModel)
@@ -66,6 +86,15 @@ class SqlConnectionRequestRepository(ConnectionRequestRepository):
         )
         return [self._to_entity(m) for m in models]
 
+    def get_outgoing_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[ConnectionRequest]:
+        query = self._session.query(ConnectionRequestModel).filter(
+            ConnectionRequestModel.from_user_id == user_id
+        )
+        models = keyset_page(query, ConnectionRequestModel, limit, after, descending=True)
+        return [self._to_entity(m) for m in models.all()]
+
     def update_status(self, request_id: str, status: str) -> Optional[ConnectionRequest]:
         model = (
             self._session.query(ConnectionRequestModel)
@@ -1,15 +1,28 @@
 import os
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
+from app.adapters.persistence.engine_config import PoolConfig, SqliteTuning, build_engine
 from app.config import settings
 
 os.makedirs(os.path.dirname(settings.database_url.replace("sqlite:///", "")) or ".", exist_ok=True)
 
-engine = create_engine(
+sqlite_tuning = SqliteTuning(
+    journal_mode=settings.sqlite_journal_mode,
+    synchronous=settings.sqlite_synchronous,
+    busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+    cache_size_kib=settings.sqlite_cache_size_kib,
+    mmap_size_bytes=settings.sqlite_mmap_size_mb * 1024 * 1024,
+    temp_store=settings.sqlite_temp_store,
+)
+engine = build_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False},
+    tuning=sqlite_tuning,
+    pool=PoolConfig(
+        size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        timeout_seconds=settings.db_pool_timeout_seconds,
+    ),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -0,0 +1,120 @@
+"""SQLite engine tuning: per-connection pragmas and pool sizing.
+
+Pragmas are applied on every new DBAPI connection through the engine's `connect` event,
+so pooled connections, the migration runner and background sessions all see the same
+settings. Pool sizing only applies to file databases; in-memory SQLite keeps
+SQLAlchemy's single-connection pools.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import Engine, create_engine, event, make_url, text
+
+_JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+_SYNCHRONOUS = {"off", "normal", "full", "extra"}
+_TEMP_STORE = {"default", "file", "memory"}
+# SQLite reports these two as numbers; named here so effective and configured compare.
+_REPORTED_AS_NUMBER = {
+    "synchronous": ["off", "normal", "full", "extra"],
+    "temp_store": ["default", "file", "memory"],
+}
+
+
+@dataclass(frozen=True)
+class SqliteTuning:
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 65_536
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    temp_store: str = "memory"
+
+    def __post_init__(self):
+        # Values are spliced into PRAGMA statements, so only known keywords get through.
+        for name, allowed in (
+            ("journal_mode", _JOURNAL_MODES),
+            ("synchronous", _SYNCHRONOUS),
+            ("temp_store", _TEMP_STORE),
+        ):
+            if getattr(self, name).lower() not in allowed:
+                raise ValueError(f"{name} must be one of {sorted(allowed)}")
+
+    def pragmas(self) -> dict[str, Any]:
+        """PRAGMA name -> value, in the order they are applied."""
+        return {
+            "journal_mode": self.journal_mode.lower(),
+            "synchronous": self.synchronous.lower(),
+            "busy_timeout": int(self.busy_timeout_ms),
+            "cache_size": -int(self.cache_size_kib),  # negative: KiB rather than pages
+            "mmap_size": int(self.mmap_size_bytes),
+            "temp_store": self.temp_store.lower(),
+        }
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    size: int = 5
+    max_overflow: int = 10
+    timeout_seconds: float = 30.0
+
+
+def _is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return (
+        parsed.get_backend_name() == "sqlite"
+        and database not in ("", ":memory:")
+        and parsed.query.get("mode") != "memory"
+    )
+
+
+def build_engine(
+    url: str, tuning: Optional[SqliteTuning] = None, pool: Optional[PoolConfig] = None
+) -> Engine:
+    """Create the engine for `url`, with `tuning` applied to each SQLite connection."""
+    kwargs: dict[str, Any] = {}
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if pool and (_is_file_sqlite(url) or not is_sqlite):
+        kwargs.update(
+            pool_size=pool.size, max_overflow=pool.max_overflow, pool_timeout=pool.timeout_seconds
+        )
+    engine = create_engine(url, **kwargs)
+    if tuning and is_sqlite:
+        pragmas = tuning.pragmas()
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    return engine
+
+
+def describe_engine(engine: Engine, tuning: Optional[SqliteTuning] = None) -> dict[str, Any]:
+    """Configured vs effective pragmas, read back from a pooled connection, and pool state."""
+    effective: dict[str, Any] = {}
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            for name in SqliteTuning().pragmas():
+                value = conn.execute(text(f"PRAGMA {name}")).scalar()
+                names = _REPORTED_AS_NUMBER.get(name)
+                effective[name] = names[value] if names and value < len(names) else value
+    pool = engine.pool
+    pool_state: dict[str, Any] = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow", "timeout"):
+        value = getattr(pool, name, None)  # methods on QueuePool; some pools lack them
+        if value is not None:
+            pool_state[name] = value() if callable(value) else value
+    return {
+        "dialect": engine.dialect.name,
+        "configured": tuning.pragmas() if tuning else {},
+        "effective": effective,
+        "pool": pool_state,
+    }
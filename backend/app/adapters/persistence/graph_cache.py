@@ -0,0 +1,505 @@
+import threading
+import time
+from array import array
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.models import ConnectionModel, UserModel
+from app.adapters.persistence.resource_version_repo import SqlResourceVersionRepository
+from app.core.entities import Connection
+from app.core.enums import ConnectionSource
+from app.ports.repositories import ConnectionRepository, PageKey
+
+_MIN_DELTA_BEFORE_REBUILD = 1024
+_LOAD_BATCH = 50_000
+_SOURCES = list(ConnectionSource)
+_SOURCE_CODES = {s.value: i for i, s in enumerate(_SOURCES)}
+_NO_TIMESTAMP = -(2**63)
+_EPOCH = datetime(1970, 1, 1)
+# resource_versions key bumped (by trigger) once per inserted or deleted connection.
+GRAPH_VERSION_KEY = "graph"
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return _NO_TIMESTAMP
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    # SQLite hands back naive UTC datetimes; return them in the same form.
+    if value == _NO_TIMESTAMP:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class SocialGraphCache:
+    """Process-wide copy of the connections graph in compressed sparse row form.
+
+    User ids map to dense integer indexes. Row i of the CSR arrays lists the neighbours
+    of user i and, in parallel, the edge each adjacency came from, so strengths and
+    other edge attributes sit in flat per-edge arrays. Edges created after the last
+    build go to a small per-node delta list and are folded into the CSR arrays once the
+    delta passes 10% of the graph, so writes stay O(1).
+
+    The cache is filled from the database on first use and updated by
+    CachedConnectionRepository on every write made through this process. Writes made
+    elsewhere (another worker, seed.py) move the `graph` counter in resource_versions;
+    `refresh` re-reads it at most every `poll_seconds` and reloads when it moved by more
+    than this process's own writes account for.
+    """
+
+    def __init__(self, poll_seconds: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._generation = 0
+        self._poll = poll_seconds
+        self._clock = clock
+        self._stamp: Optional[int] = None
+        self._next_poll = float("-inf")
+        self._listeners: list[Callable[[list[Connection]], None]] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self._index: dict[str, int] = {}
+        self._user_ids: list[str] = []
+        self._names: list[str] = []
+        # Per-edge attributes, indexed by edge number.
+        self._edge_ids: list[str] = []
+        self._edge_a = array("i")
+        self._edge_b = array("i")
+        self._strengths = array("d")
+        self._sources = array("b")
+        self._created_at = array("q")  # microseconds since the epoch, UTC
+        # CSR adjacency over the first `_csr_edges` edges.
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._neighbors = np.zeros(0, dtype=np.int32)
+        self._adj_edges = np.zeros(0, dtype=np.int32)
+        self._csr_edges = 0
+        self._delta: dict[int, list[tuple[int, int]]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every (re)load, so derived indexes know to start over."""
+        return self._generation
+
+    def add_listener(self, listener: Callable[[list[Connection]], None]) -> None:
+        """Call `listener(connections)` after connections are added to a loaded graph."""
+        self._listeners.append(listener)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._generation += 1
+            self._stamp = None
+            self._next_poll = float("-inf")
+            self._reset()
+
+    def needs_refresh(self) -> bool:
+        return not self._loaded or self._clock() >= self._next_poll
+
+    def refresh(self, session: Session) -> None:
+        """Load the graph, or reload it if connections changed outside this process."""
+        if not self.needs_refresh():
+            return
+        with self._lock:
+            # Read before loading: a write landing in between only costs a spare reload.
+            stamp = SqlResourceVersionRepository(session).get_version(GRAPH_VERSION_KEY)
+            self._next_poll = self._clock() + self._poll
+            if self._loaded and stamp != self._stamp:
+                self.invalidate()
+                self._next_poll = self._clock() + self._poll
+            if not self._loaded:
+                self.load(session)
+                self._stamp = stamp
+
+    def note_writes(self, stamp: int, count: int) -> None:
+        """Accept `stamp` read after writing `count` connections here, if only they moved it."""
+        with self._lock:
+            if self._stamp is not None and stamp == self._stamp + count:
+                self._stamp = stamp
+
+    def load(self, session: Session) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._reset()
+            names = dict(session.query(UserModel.id, UserModel.name).all())
+            rows = session.query(
+                ConnectionModel.id,
+                ConnectionModel.user_a,
+                ConnectionModel.user_b,
+                ConnectionModel.strength,
+                ConnectionModel.source,
+                ConnectionModel.created_at,
+            ).yield_per(_LOAD_BATCH)
+            for edge_id, a, b, strength, source, created_at in rows:
+                self._append_edge(edge_id, a, b, strength, source, created_at, names)
+            self._rebuild()
+            self._generation += 1
+            self._loaded = True
+
+    def add(self, connections: list[Connection], names: dict[str, str]) -> None:
+        """Record newly stored connections; `names` covers users not yet in the graph."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for c in connections:
+                if self._has_edge(c):
+                    continue  # already picked up by a load that raced with the write
+                e = self._append_edge(
+                    c.id, c.user_a, c.user_b, c.strength, c.source.value, c.created_at, names
+                )
+                a, b = self._edge_a[e], self._edge_b[e]
+                self._delta.setdefault(a, []).append((b, e))
+                if a != b:
+                    self._delta.setdefault(b, []).append((a, e))
+            if len(self._edge_ids) - self._csr_edges > max(
+                _MIN_DELTA_BEFORE_REBUILD, self._csr_edges // 10
+            ):
+                self._rebuild()
+        for listener in self._listeners:
+            listener(connections)
+
+    def has_user(self, user_id: str) -> bool:
+        return user_id in self._index
+
+    def user_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._user_ids)
+
+    def get_connections(self, user_id: str) -> list[Connection]:
+        with self._lock:
+            node = self._index.get(user_id)
+            if node is None:
+                return []
+            _, edges = self._adjacency(node)
+            return [self._to_entity(e) for e in edges.tolist()]
+
+    def get_connections_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[Connection]:
+        with self._lock:
+            node = self._index.get(user_id)
+            if node is None:
+                return []
+            _, edges = self._adjacency(node)
+            keys = sorted((self._created_at[e], self._edge_ids[e], e) for e in edges.tolist())
+            if after is not None:
+                bound = (_to_micros(after[0]), after[1])
+                keys = [k for k in keys if k[:2] > bound]
+            return [self._to_entity(e) for _, _, e in keys[:limit]]
+
+    def count_connections(self, user_ids: list[str]) -> dict[str, int]:
+        with self._lock:
+            counts = {}
+            for user_id in user_ids:
+                node = self._index.get(user_id)
+                counts[user_id] = 0 if node is None else len(self._adjacency(node)[1])
+            return counts
+
+    def get_second_degree(self, user_id: str) -> dict[str, list[str]]:
+        with self._lock:
+            node = self._index.get(user_id)
+            if node is None:
+                return {}
+            friends = np.unique(self._adjacency(node)[0])
+            via, others = self._gather_neighbors(friends)
+            keep = (others != node) & ~np.isin(others, friends)
+
+            second_degree: dict[str, list[str]] = {}
+            for friend, other in zip(via[keep].tolist(), others[keep].tolist()):
+                shared = second_degree.setdefault(self._user_ids[other], [])
+                name = self._names[friend]
+                if name and name not in shared:
+                    shared.append(name)
+            return second_degree
+
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        """(degree, names of shared connections) of each given user relative to `user_id`,
+        for those within two hops. Only the given users' rows are read, so annotating a
+        page of results costs the same however large the 2nd-degree network is."""
+        with self._lock:
+            node = self._index.get(user_id)
+            if node is None:
+                return {}
+            friends = set(self._adjacency(node)[0].tolist())
+            related: dict[str, tuple[int, list[str]]] = {}
+            for other_id in other_ids:
+                other = self._index.get(other_id)
+                if other is None or other == node:
+                    continue
+                if other in friends:
+                    related[other_id] = (1, [])
+                    continue
+                via = [n for n in dict.fromkeys(self._adjacency(other)[0].tolist()) if n in friends]
+                if via:
+                    related[other_id] = (2, [self._names[n] for n in via if self._names[n]])
+            return related
+
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int, max_visited: int
+    ) -> Optional[list[str]]:
+        """User ids along a shortest path from source to target, both included.
+
+        Bidirectional BFS: each round expands a whole level of the smaller frontier, so
+        the two searches meet after visiting roughly 2 * d^(k/2) users instead of d^k.
+        Returns None when there is no path of at most `max_depth` hops, or when more
+        than `max_visited` users were reached before the searches met.
+        """
+        if source_id == target_id:
+            return [source_id]
+        with self._lock:
+            source, target = self._index.get(source_id), self._index.get(target_id)
+            if source is None or target is None:
+                return None
+            n_nodes = len(self._user_ids)
+            dist = [np.full(n_nodes, -1, dtype=np.int32) for _ in range(2)]
+            parent = [np.full(n_nodes, -1, dtype=np.int32) for _ in range(2)]
+            frontier = [np.array([source], dtype=np.int32), np.array([target], dtype=np.int32)]
+            dist[0][source] = dist[1][target] = 0
+            depths, visited = [0, 0], 2
+
+            while sum(depths) < max_depth and len(frontier[0]) and len(frontier[1]):
+                side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+                via, others = self._gather_neighbors(frontier[side])
+                fresh = dist[side][others] < 0
+                others, first = np.unique(others[fresh], return_index=True)
+                depths[side] += 1
+                dist[side][others] = depths[side]
+                parent[side][others] = via[fresh][first]
+
+                meets = others[dist[1 - side][others] >= 0]
+                if len(meets):
+                    meet = int(meets[np.argmin(dist[1 - side][meets])])
+                    return self._join_path(parent, meet)
+                visited += len(others)
+                if visited > max_visited:
+                    return None
+                frontier[side] = others
+            return None
+
+    def _join_path(self, parent: list[np.ndarray], meet: int) -> list[str]:
+        forward = []
+        node = meet
+        while node >= 0:
+            forward.append(node)
+            node = int(parent[0][node])
+        backward = []
+        node = int(parent[1][meet])
+        while node >= 0:
+            backward.append(node)
+            node = int(parent[1][node])
+        return [self._user_ids[n] for n in forward[::-1] + backward]
+
+    def personalized_pagerank(
+        self, user_id: str, alpha: float, epsilon: float, top_n: int
+    ) -> dict[str, float]:
+        """Strength-weighted personalized PageRank from `user_id`, top `top_n` others.
+
+        Forward push (Andersen, Chung & Lang): a node holding at least `epsilon` residual
+        keeps `alpha` of it and spreads the rest over its edges in proportion to
+        strength. Larger `alpha` makes scores fall off faster with distance.
+        """
+        with self._lock:
+            source = self._index.get(user_id)
+            if source is None:
+                return {}
+            strengths = np.frombuffer(self._strengths, dtype=np.float64)
+            estimate = np.zeros(len(self._user_ids))
+            residual = np.zeros(len(self._user_ids))
+            residual[source] = 1.0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                mass = residual[node]
+                residual[node] = 0.0
+                estimate[node] += alpha * mass
+                neighbors, edges = self._adjacency(node)
+                weights = strengths[edges]
+                total = weights.sum()
+                if total <= 0:
+                    continue
+                before = residual[neighbors] < epsilon
+                np.add.at(residual, neighbors, (1 - alpha) * mass * weights / total)
+                crossed = neighbors[before & (residual[neighbors] >= epsilon)]
+                queue.extend(np.unique(crossed).tolist())
+
+            estimate[source] = 0.0
+            reached = np.flatnonzero(estimate)
+            if len(reached) > top_n:
+                reached = reached[np.argpartition(-estimate[reached], top_n - 1)[:top_n]]
+            return {self._user_ids[n]: float(estimate[n]) for n in reached.tolist()}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "users": len(self._user_ids),
+                "edges": len(self._edge_ids),
+                "delta_edges": len(self._edge_ids) - self._csr_edges,
+            }
+
+    # -- Internals --------------------------------------------------------------------
+
+    def _node(self, user_id: str, names: dict[str, str]) -> int:
+        node = self._index.get(user_id)
+        if node is None:
+            node = len(self._user_ids)
+            self._index[user_id] = node
+            self._user_ids.append(user_id)
+            self._names.append(names.get(user_id) or "")
+        return node
+
+    def _append_edge(self, edge_id, a, b, strength, source, created_at, names) -> int:
+        self._edge_ids.append(edge_id)
+        self._edge_a.append(self._node(a, names))
+        self._edge_b.append(self._node(b, names))
+        self._strengths.append(strength if strength is not None else 1.0)
+        self._sources.append(_SOURCE_CODES[source])
+        self._created_at.append(_to_micros(created_at))
+        return len(self._edge_ids) - 1
+
+    def _has_edge(self, connection: Connection) -> bool:
+        node = self._index.get(connection.user_a)
+        if node is None:
+            return False
+        edges = self._adjacency(node)[1].tolist()
+        return any(self._edge_ids[e] == connection.id for e in edges)
+
+    def _rebuild(self) -> None:
+        n_nodes = len(self._user_ids)
+        a = np.frombuffer(self._edge_a, dtype=np.int32)
+        b = np.frombuffer(self._edge_b, dtype=np.int32)
+        edge_numbers = np.arange(len(a), dtype=np.int32)
+        # Self-connections get one adjacency entry, as SQL's user_a OR user_b filter does.
+        loop = a == b
+        src = np.concatenate([a, b[~loop]])
+        dst = np.concatenate([b, a[~loop]])
+        edges = np.concatenate([edge_numbers, edge_numbers[~loop]])
+        order = np.argsort(src, kind="stable")
+        self._neighbors = dst[order]
+        self._adj_edges = edges[order]
+        self._indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n_nodes), out=self._indptr[1:])
+        self._csr_edges = len(a)
+        self._delta = {}
+
+    def _adjacency(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        """(neighbour nodes, edge numbers) of one node, CSR rows plus any delta."""
+        if node + 1 < len(self._indptr):
+            start, end = self._indptr[node], self._indptr[node + 1]
+            neighbors, edges = self._neighbors[start:end], self._adj_edges[start:end]
+        else:
+            neighbors = edges = np.zeros(0, dtype=np.int32)
+        delta = self._delta.get(node)
+        if delta:
+            extra = np.asarray(delta, dtype=np.int32)
+            neighbors = np.concatenate([neighbors, extra[:, 0]])
+            edges = np.concatenate([edges, extra[:, 1]])
+        return neighbors, edges
+
+    def _gather_neighbors(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Every (node, neighbour) pair for `nodes`, gathered from the CSR rows in one pass."""
+        in_csr = nodes[nodes + 1 < len(self._indptr)]
+        starts = self._indptr[in_csr]
+        lengths = self._indptr[in_csr + 1] - starts
+        total = int(lengths.sum())
+        # Positions starts[i] .. starts[i] + lengths[i] for every friend, without a loop.
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        via = [np.repeat(in_csr, lengths)]
+        others = [self._neighbors[positions]]
+        for node in nodes.tolist():
+            delta = self._delta.get(node)
+            if delta:
+                via.append(np.full(len(delta), node, dtype=np.int32))
+                others.append(np.asarray([n for n, _ in delta], dtype=np.int32))
+        return np.concatenate(via), np.concatenate(others)
+
+    def _to_entity(self, edge: int) -> Connection:
+        return Connection(
+            id=self._edge_ids[edge],
+            user_a=self._user_ids[self._edge_a[edge]],
+            user_b=self._user_ids[self._edge_b[edge]],
+            source=_SOURCES[self._sources[edge]],
+            strength=self._strengths[edge],
+            created_at=_from_micros(self._created_at[edge]),
+        )
+
+
+class CachedConnectionRepository(ConnectionRepository):
+    """Read-through SocialGraphCache in front of SqlConnectionRepository."""
+
+    def __init__(self, session: Session, cache: SocialGraphCache):
+        self._session = session
+        self._inner = SqlConnectionRepository(session)
+        self._cache = cache
+
+    def _graph(self) -> SocialGraphCache:
+        self._cache.refresh(self._session)
+        return self._cache
+
+    def get_connections(self, user_id: str) -> list[Connection]:
+        return self._graph().get_connections(user_id)
+
+    def get_connections_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[Connection]:
+        return self._graph().get_connections_page(user_id, limit, after)
+
+    def get_second_degree(self, user_id: str) -> dict[str, list[str]]:
+        return self._graph().get_second_degree(user_id)
+
+    def count_connections(self, user_ids: list[str]) -> dict[str, int]:
+        return self._graph().count_connections(user_ids)
+
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        return self._graph().relate(user_id, other_ids)
+
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int, max_visited: int
+    ) -> Optional[list[str]]:
+        return self._graph().shortest_path(source_id, target_id, max_depth, max_visited)
+
+    def create(self, connection: Connection) -> Connection:
+        created = self._inner.create(connection)
+        self._record([created])
+        return created
+
+    def create_batch(self, connections: list[Connection]) -> list[Connection]:
+        created = self._inner.create_batch(connections)
+        self._record(created)
+        return created
+
+    def _record(self, connections: list[Connection]) -> None:
+        if not self._cache.loaded:
+            return
+        new_users = {
+            uid
+            for c in connections
+            for uid in (c.user_a, c.user_b)
+            if not self._cache.has_user(uid)
+        }
+        names = {}
+        if new_users:
+            names = dict(
+                self._session.query(UserModel.id, UserModel.name)
+                .filter(UserModel.id.in_(new_users))
+                .all()
+            )
+        self._cache.add(connections, names)
+        stamp = SqlResourceVersionRepository(self._session).get_version(GRAPH_VERSION_KEY)
+        self._cache.note_writes(stamp, len(connections))
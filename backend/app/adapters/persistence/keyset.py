@@ -0,0 +1,27 @@
+"""Keyset pagination over (created_at, id).
+
+A page starts strictly after the last row of the previous one, compared as a row value,
+so SQLite seeks straight to it through an index ending in (created_at, id) instead of
+stepping over OFFSET rows: page N costs the same as page 1. The id breaks ties between
+rows created in the same microsecond.
+"""
+
+from typing import Optional, TypeVar
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Query
+
+from app.ports.repositories import PageKey
+
+Q = TypeVar("Q", Query, Select)
+
+
+def keyset_page(
+    query: Q, model, limit: int, after: Optional[PageKey], descending: bool = False
+) -> Q:
+    key = tuple_(model.created_at, model.id)
+    if after is not None:
+        query = query.filter(key < tuple(after) if descending else key > tuple(after))
+    if descending:
+        return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+    return query.order_by(model.created_at, model.id).limit(limit)
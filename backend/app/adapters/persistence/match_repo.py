@@ -1,7 +1,9 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.adapters.persistence.models import MatchModel
 from app.core.entities import Match
+from app.core.enums import MatchSource
 from app.ports.repositories import MatchRepository
 
 
@@ -20,6 +22,7 @@ class SqlMatchRepository(MatchRepository):
             explanation=model.explanation,
             rank=model.rank,
             created_at=model.created_at,
+            source=MatchSource(model.source),
         )
 
     def get_by_opportunity(self, opportunity_id: str) -> list[Match]:
@@ -31,23 +34,72 @@ class SqlMatchRepository(MatchRepository):
         )
         return [self._to_entity(m) for m in models]
 
-    def create_batch(self, matches: list[Match]) -> list[Match]:
-        models = []
-        for m in matches:
-            model = MatchModel(
-                id=m.id,
-                opportunity_id=m.opportunity_id,
-                user_id=m.user_id,
-                score=m.score,
-                embedding_score=m.embedding_score,
-                network_score=m.network_score,
-                explanation=m.explanation,
-                rank=m.rank,
-                created_at=m.created_at,
+    def get_by_opportunities(self, opportunity_ids: list[str]) -> dict[str, list[Match]]:
+        by_opportunity: dict[str, list[Match]] = {oid: [] for oid in opportunity_ids}
+        for i in range(0, len(opportunity_ids), 500):
+            models = (
+                self._session.query(MatchModel)
+                .filter(MatchModel.opportunity_id.in_(opportunity_ids[i : i + 500]))
+                .order_by(MatchModel.opportunity_id, MatchModel.rank)
+                .all()
             )
-            self._session.add(model)
-            models.append(model)
+            for m in models:
+                by_opportunity[m.opportunity_id].append(self._to_entity(m))
+        return by_opportunity
+
+    @staticmethod
+    def _to_model(m: Match) -> MatchModel:
+        return MatchModel(
+            id=m.id,
+            opportunity_id=m.opportunity_id,
+            user_id=m.user_id,
+            score=m.score,
+            embedding_score=m.embedding_score,
+            network_score=m.network_score,
+            explanation=m.explanation,
+            rank=m.rank,
+            created_at=m.created_at,
+            source=m.source.value,
+        )
+
+    def create_batch(self, matches: list[Match]) -> list[Match]:
+        models = [self._to_model(m) for m in matches]
+        self._session.add_all(models)
         self._session.commit()
         for model in models:
             self._session.refresh(model)
         return [self._to_entity(model) for model in models]
+
+    def update_batch(self, upserts: list[Match], removed_ids: list[str]) -> None:
+        if removed_ids:
+            self._session.query(MatchModel).filter(MatchModel.id.in_(removed_ids)).delete(
+                synchronize_session=False
+            )
+        for m in upserts:
+            self._session.merge(self._to_model(m))
+        self._session.commit()
+
+    def get_score_floors(self, opportunity_ids: list[str]) -> dict[str, tuple[int, float]]:
+        floors = {}
+        for i in range(0, len(opportunity_ids), 500):
+            rows = (
+                self._session.query(
+                    MatchModel.opportunity_id,
+                    func.count(MatchModel.id),
+                    func.min(MatchModel.embedding_score + MatchModel.network_score),
+                )
+                .filter(MatchModel.opportunity_id.in_(opportunity_ids[i : i + 500]))
+                .group_by(MatchModel.opportunity_id)
+                .all()
+            )
+            floors.update((oid, (count, floor)) for oid, count, floor in rows)
+        return floors
+
+    def replace_for_opportunities(self, opportunity_ids: list[str], matches: list[Match]) -> None:
+        # Chunked to stay under SQLite's bound-parameter limit on large batches.
+        for i in range(0, len(opportunity_ids), 500):
+            self._session.query(MatchModel).filter(
+                MatchModel.opportunity_id.in_(opportunity_ids[i : i + 500])
+            ).delete(synchronize_session=False)
+        self._session.add_all([self._to_model(m) for m in matches])
+        self._session.commit()
@@ -0,0 +1,179 @@
+"""Versioned schema migrations for the SQLite database.
+
+Each migration runs once and is recorded in `schema_migrations`. Steps are written to be
+safe to re-run, since SQLite DDL does not always roll back with the transaction.
+Version 1 creates whatever tables are missing, which also adopts databases created by
+the old `create_all` startup. Later versions evolve existing files in place; indexes
+they add are declared on the models too, under the same names, so a fresh `create_all`
+and a migrated database end up with the same schema.
+
+    cd backend && uv run python -m app.adapters.persistence.migrations
+"""
+
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import Connection, Engine, text
+
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.models import (
+    AUTH_VERSION_TRIGGERS,
+    RESOURCE_VERSION_TRIGGERS,
+    REVOKED_TOKENS_TRIGGER,
+    USERS_FTS_DDL,
+    ResourceVersionModel,
+    RevokedTokenModel,
+)
+
+# (name, table, columns) for the indexes behind each repository lookup.
+_HOT_PATH_INDEXES = [
+    ("ix_connections_user_a", "connections", "user_a, user_b"),
+    ("ix_connections_user_b", "connections", "user_b, user_a"),
+    ("ix_connection_requests_to_status", "connection_requests", "to_user_id, status, created_at"),
+    ("ix_connection_requests_from", "connection_requests", "from_user_id, created_at"),
+    ("ix_connection_requests_pair", "connection_requests", "from_user_id, to_user_id, status"),
+    ("ix_connection_requests_opportunity", "connection_requests", "opportunity_id, created_at"),
+    ("ix_feedback_to_user", "feedback", "to_user_id, created_at"),
+    ("ix_feedback_pair", "feedback", "from_user_id, to_user_id, opportunity_type"),
+    ("ix_matches_opportunity_rank", "matches", "opportunity_id, rank"),
+    ("ix_sessions_user_id", "sessions", "user_id"),
+    ("ix_users_created_at", "users", "created_at"),
+    ("ix_opportunities_created_at", "opportunities", "created_at"),
+    ("ix_ranking_cache_created_at", "ranking_cache", "created_at"),
+]
+
+# Indexes ending in (created_at, id), so keyset pages seek instead of sorting. The first
+# four replace version 2 indexes of the same name that lacked the id tie-breaker.
+_KEYSET_INDEXES = [
+    ("ix_users_created_at", "users", "created_at, id"),
+    ("ix_opportunities_created_at", "opportunities", "created_at, id"),
+    (
+        "ix_connection_requests_to_status",
+        "connection_requests",
+        "to_user_id, status, created_at, id",
+    ),
+    ("ix_connection_requests_from", "connection_requests", "from_user_id, created_at, id"),
+    ("ix_connections_user_a_created", "connections", "user_a, created_at, id"),
+    ("ix_connections_user_b_created", "connections", "user_b, created_at, id"),
+]
+
+
+def _create_missing_tables(conn: Connection) -> None:
+    Base.metadata.create_all(bind=conn)
+
+
+def _add_hot_path_indexes(conn: Connection) -> None:
+    for name, table, columns in _HOT_PATH_INDEXES:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+    conn.execute(text("ANALYZE"))
+
+
+def _add_keyset_indexes(conn: Connection) -> None:
+    for name, table, columns in _KEYSET_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+    conn.execute(text("ANALYZE"))
+
+
+def _add_users_fts(conn: Connection) -> None:
+    # Also rebuilds the version 4 index, an external-content table keyed by users.rowid.
+    for trigger in ["users_fts_insert", "users_fts_delete", "users_fts_update"]:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text("DROP TABLE IF EXISTS users_fts"))
+    conn.execute(text("DROP TABLE IF EXISTS users_fts_keys"))
+    for statement in USERS_FTS_DDL:
+        conn.execute(text(statement))
+    conn.execute(text("INSERT INTO users_fts_keys(user_id) SELECT id FROM users ORDER BY rowid"))
+    conn.execute(
+        text(
+            "INSERT INTO users_fts(rowid, name, bio, skills, interests) "
+            "SELECT k.rowid, u.name, u.bio, u.skills, u.interests "
+            "FROM users_fts_keys k JOIN users u ON u.id = k.user_id"
+        )
+    )
+
+
+def _add_resource_versions(conn: Connection) -> None:
+    ResourceVersionModel.__table__.create(bind=conn, checkfirst=True)
+    for statement in RESOURCE_VERSION_TRIGGERS:
+        conn.execute(text(statement))
+
+
+def _add_auth_version_triggers(conn: Connection) -> None:
+    for statement in AUTH_VERSION_TRIGGERS:
+        conn.execute(text(statement))
+
+
+def _narrow_users_version_triggers(conn: Connection) -> None:
+    conn.execute(text("DROP TRIGGER IF EXISTS users_version_update"))
+    for statement in AUTH_VERSION_TRIGGERS:
+        conn.execute(text(statement))
+
+
+def _add_revoked_tokens(conn: Connection) -> None:
+    RevokedTokenModel.__table__.create(bind=conn, checkfirst=True)
+    conn.execute(text(REVOKED_TOKENS_TRIGGER))
+
+
+def _add_match_source(conn: Connection) -> None:
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(matches)"))}
+    if "source" not in columns:
+        conn.execute(
+            text("ALTER TABLE matches ADD COLUMN source VARCHAR NOT NULL DEFAULT 'ranked'")
+        )
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create missing tables", _create_missing_tables),
+    (2, "hot-path indexes", _add_hot_path_indexes),
+    (3, "keyset pagination indexes", _add_keyset_indexes),
+    (4, "users full-text index", _add_users_fts),
+    (5, "resource version counters", _add_resource_versions),
+    (6, "session cache invalidation stamp", _add_auth_version_triggers),
+    (7, "revoked signed session tokens", _add_revoked_tokens),
+    (8, "match source", _add_match_source),
+    (9, "users full-text index keyed by id", _add_users_fts),
+    (10, "users version triggers skip password rehashes", _narrow_users_version_triggers),
+]
+
+
+def _ensure_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT NOT NULL)"
+            )
+        )
+
+
+def current_version(engine: Engine) -> int:
+    _ensure_table(engine)
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar() or 0
+
+
+def migrate(engine: Engine) -> list[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        if version <= current_version(engine):
+            continue
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"
+                ),
+                {"v": version, "n": name, "t": datetime.now(timezone.utc).isoformat()},
+            )
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from app.adapters.persistence.database import engine
+
+    done = migrate(engine)
+    print(f"Applied migrations {done}." if done else "Schema is up to date.")
+    print(f"Schema version {current_version(engine)}.")
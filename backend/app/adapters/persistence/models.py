@@ -1,7 +1,19 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.orm import relationship
 
 from app.adapters.persistence.database import Base
@@ -13,6 +25,7 @@ def gen_id() -> str:
 
 class UserModel(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at", "created_at", "id"),)
 
     id = Column(String, primary_key=True, default=gen_id)
     name = Column(String, nullable=False)
@@ -27,8 +40,56 @@ class UserModel(Base):
     opportunities = relationship("OpportunityModel", back_populates="poster")
 
 
+# Full-text index over the searchable user fields. `users` has a String primary key, so
+# its implicit rowid is not stable (VACUUM and table rebuilds may renumber it) and cannot
+# key an external-content index. The index keeps its own copy of the text instead, under
+# the INTEGER PRIMARY KEY of `users_fts_keys`, which maps each user id to its entry.
+# Triggers keep both in step with every write, bulk inserts included. Prefix indexes on
+# 2 and 3 characters serve type-ahead queries.
+_USERS_FTS_COLUMNS = "name, bio, skills, interests"
+_USERS_FTS_KEY = "(SELECT rowid FROM users_fts_keys WHERE user_id = {}.id)"
+USERS_FTS_DDL = [
+    (
+        "CREATE TABLE IF NOT EXISTS users_fts_keys ("
+        "rowid INTEGER PRIMARY KEY, user_id VARCHAR NOT NULL UNIQUE)"
+    ),
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5("
+        f"{_USERS_FTS_COLUMNS}, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN "
+        "INSERT INTO users_fts_keys(user_id) VALUES (new.id); "
+        f"INSERT INTO users_fts(rowid, {_USERS_FTS_COLUMNS}) "
+        f"VALUES ({_USERS_FTS_KEY.format('new')}, "
+        "new.name, new.bio, new.skills, new.interests); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN "
+        f"DELETE FROM users_fts WHERE rowid = {_USERS_FTS_KEY.format('old')}; "
+        "DELETE FROM users_fts_keys WHERE user_id = old.id; END"
+    ),
+    (
+        f"CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF {_USERS_FTS_COLUMNS} "
+        "ON users BEGIN "
+        "UPDATE users_fts SET name = new.name, bio = new.bio, skills = new.skills, "
+        f"interests = new.interests WHERE rowid = {_USERS_FTS_KEY.format('old')}; END"
+    ),
+]
+for _statement in USERS_FTS_DDL:
+    event.listen(UserModel.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _table in ["users_fts", "users_fts_keys"]:
+    event.listen(
+        UserModel.__table__,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {_table}").execute_if(dialect="sqlite"),
+    )
+
+
 class OpportunityModel(Base):
     __tablename__ = "opportunities"
+    __table_args__ = (Index("ix_opportunities_created_at", "created_at", "id"),)
 
     id = Column(String, primary_key=True, default=gen_id)
     title = Column(String, nullable=False)
@@ -41,8 +102,18 @@ class OpportunityModel(Base):
     matches = relationship("MatchModel", back_populates="opportunity")
 
 
+class OpportunityEmbeddingModel(Base):
+    __tablename__ = "opportunity_embeddings"
+
+    opportunity_id = Column(String, ForeignKey("opportunities.id"), primary_key=True)
+    type = Column(String, nullable=False, index=True)
+    vector = Column(LargeBinary, nullable=False)  # unit-normalised float32
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
 class MatchModel(Base):
     __tablename__ = "matches"
+    __table_args__ = (Index("ix_matches_opportunity_rank", "opportunity_id", "rank"),)
 
     id = Column(String, primary_key=True, default=gen_id)
     opportunity_id = Column(String, ForeignKey("opportunities.id"), nullable=False)
@@ -53,6 +124,8 @@ class MatchModel(Base):
     explanation = Column(Text, nullable=False, default="")
     rank = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # MatchSource; `score` is the LLM's only for "ranked" rows, reverse matches store 0.
+    source = Column(String, nullable=False, default="ranked", server_default="ranked")
 
     opportunity = relationship("OpportunityModel", back_populates="matches")
     user = relationship("UserModel")
@@ -60,6 +133,12 @@ class MatchModel(Base):
 
 class ConnectionModel(Base):
     __tablename__ = "connections"
+    __table_args__ = (
+        Index("ix_connections_user_a", "user_a", "user_b"),
+        Index("ix_connections_user_b", "user_b", "user_a"),
+        Index("ix_connections_user_a_created", "user_a", "created_at", "id"),
+        Index("ix_connections_user_b_created", "user_b", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=gen_id)
     user_a = Column(String, ForeignKey("users.id"), nullable=False)
@@ -71,6 +150,7 @@ class ConnectionModel(Base):
 
 class SessionModel(Base):
     __tablename__ = "sessions"
+    __table_args__ = (Index("ix_sessions_user_id", "user_id"),)
 
     id = Column(String, primary_key=True, default=gen_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -79,6 +159,10 @@ class SessionModel(Base):
 
 class FeedbackModel(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        Index("ix_feedback_to_user", "to_user_id", "created_at"),
+        Index("ix_feedback_pair", "from_user_id", "to_user_id", "opportunity_type"),
+    )
 
     id = Column(String, primary_key=True, default=gen_id)
     from_user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -90,6 +174,12 @@ class FeedbackModel(Base):
 
 class ConnectionRequestModel(Base):
     __tablename__ = "connection_requests"
+    __table_args__ = (
+        Index("ix_connection_requests_to_status", "to_user_id", "status", "created_at", "id"),
+        Index("ix_connection_requests_from", "from_user_id", "created_at", "id"),
+        Index("ix_connection_requests_pair", "from_user_id", "to_user_id", "status"),
+        Index("ix_connection_requests_opportunity", "opportunity_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=gen_id)
     from_user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -98,3 +188,115 @@ class ConnectionRequestModel(Base):
     match_id = Column(String, nullable=True, default=None)
     status = Column(String, nullable=False, default="pending")
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class RevokedTokenModel(Base):
+    """Signed session tokens logged out before they expire; rows past expiry are purged."""
+
+    __tablename__ = "revoked_tokens"
+
+    token_id = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class RankingCacheModel(Base):
+    __tablename__ = "ranking_cache"
+    __table_args__ = (Index("ix_ranking_cache_created_at", "created_at"),)
+
+    key = Column(String, primary_key=True)  # fingerprint of opportunity + candidates
+    payload = Column(Text, nullable=False)  # JSON array of RankedMatch
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+
+class RankingCacheMemberModel(Base):
+    __tablename__ = "ranking_cache_members"
+
+    key = Column(String, ForeignKey("ranking_cache.key", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(String, primary_key=True, index=True)
+
+
+class ResourceVersionModel(Base):
+    """Change counter per API resource ("user:<id>", "opportunity:<id>", ...), bumped by
+    the triggers below and read to answer conditional GETs."""
+
+    __tablename__ = "resource_versions"
+
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+
+def _version_trigger(name: str, when: str, *keys: str) -> str:
+    """A trigger that bumps each resource version key (SQL expressions) on `when`."""
+    rows = ", ".join(f"({key}, 1, CURRENT_TIMESTAMP)" for key in keys)
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN "
+        f"INSERT INTO resource_versions (key, version, updated_at) VALUES {rows} "
+        "ON CONFLICT (key) DO UPDATE SET version = version + 1, "
+        "updated_at = excluded.updated_at; END"
+    )
+
+
+# What each resource's response is built from, so any write to it bumps the version:
+#   user:<id>          the user's row and connection count
+#   graph              every connection (networks show 2nd-degree members' counts)
+#   requests:<id>      connection requests from or to the user
+#   opportunity:<id>   the opportunity's matches
+#   auth               sessions, revoked tokens and emails, for the session caches
+# Opportunities are never updated in place, so their own rows need no trigger.
+RESOURCE_VERSION_TRIGGERS = (
+    [
+        _version_trigger(
+            f"connections_version_{op.lower()}",
+            f"AFTER {op} ON connections",
+            f"'user:' || {row}.user_a",
+            f"'user:' || {row}.user_b",
+            "'graph'",
+        )
+        for op, row in [("INSERT", "new"), ("DELETE", "old")]
+    ]
+    + [
+        _version_trigger(
+            f"connection_requests_version_{name}",
+            f"AFTER {op} ON connection_requests",
+            "'requests:' || new.from_user_id",
+            "'requests:' || new.to_user_id",
+        )
+        for name, op in [("insert", "INSERT"), ("update", "UPDATE OF status")]
+    ]
+    + [
+        _version_trigger(
+            f"matches_version_{op.lower()}",
+            f"AFTER {op} ON matches",
+            f"'opportunity:' || {row}.opportunity_id",
+        )
+        for op, row in [("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")]
+    ]
+)
+
+# Logouts and email changes, so every process's session cache drops what it holds. Other
+# profile edits only bump the user's own key. Password hashes are left out, so a rehash at
+# login bumps nothing; changing a password has to revoke the user's sessions anyway.
+AUTH_VERSION_TRIGGERS = [
+    _version_trigger("sessions_version_delete", "AFTER DELETE ON sessions", "'auth'"),
+    _version_trigger(
+        "users_version_update",
+        "AFTER UPDATE OF name, email, bio, skills, interests, open_to ON users",
+        "'user:' || new.id",
+    ),
+    _version_trigger(
+        "users_auth_version_update",
+        "AFTER UPDATE OF email ON users WHEN old.email IS NOT new.email",
+        "'auth'",
+    ),
+]
+
+# Revocations of signed tokens, so every process reloads its denylist.
+REVOKED_TOKENS_TRIGGER = _version_trigger(
+    "revoked_tokens_version_insert", "AFTER INSERT ON revoked_tokens", "'auth'"
+)
+
+# The triggers span several tables, so they are created once every table exists.
+for _statement in RESOURCE_VERSION_TRIGGERS + AUTH_VERSION_TRIGGERS + [REVOKED_TOKENS_TRIGGER]:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
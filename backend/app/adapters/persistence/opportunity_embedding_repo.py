@@ -0,0 +1,50 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.models import OpportunityEmbeddingModel
+from app.core.entities import Opportunity
+from app.ports.repositories import OpportunityEmbeddingRepository
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SqlOpportunityEmbeddingRepository(OpportunityEmbeddingRepository):
+    def __init__(self, session: Session):
+        self._session = session
+
+    def upsert(self, opportunity: Opportunity, vector: list[float]) -> None:
+        self._session.merge(
+            OpportunityEmbeddingModel(
+                opportunity_id=opportunity.id,
+                type=opportunity.type.value,
+                vector=_unit(vector).tobytes(),
+            )
+        )
+        self._session.commit()
+
+    def missing_ids(self, opportunity_ids: list[str]) -> list[str]:
+        stored = {
+            oid
+            for (oid,) in self._session.query(OpportunityEmbeddingModel.opportunity_id).filter(
+                OpportunityEmbeddingModel.opportunity_id.in_(opportunity_ids)
+            )
+        }
+        return [oid for oid in opportunity_ids if oid not in stored]
+
+    def score(self, vector: list[float], types: list[str]) -> dict[str, float]:
+        rows = (
+            self._session.query(
+                OpportunityEmbeddingModel.opportunity_id, OpportunityEmbeddingModel.vector
+            )
+            .filter(OpportunityEmbeddingModel.type.in_(types))
+            .all()
+        )
+        if not rows:
+            return {}
+        matrix = np.frombuffer(b"".join(v for _, v in rows), dtype=np.float32)
+        scores = matrix.reshape(len(rows), -1) @ _unit(vector)
+        return {oid: float(s) for (oid, _), s in zip(rows, scores)}
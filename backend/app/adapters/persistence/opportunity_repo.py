@@ -2,10 +2,11 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
+from app.adapters.persistence.keyset import keyset_page
 from app.adapters.persistence.models import OpportunityModel
 from app.core.entities import Opportunity
 from app.core.enums import OpportunityType
-from app.ports.repositories import OpportunityRepository
+from app.ports.repositories import OpportunityRepository, PageKey
 
 
 class SqlOpportunityRepository(OpportunityRepository):
@@ -38,6 +39,11 @@ class SqlOpportunityRepository(OpportunityRepository):
         )
         return [self._to_entity(m) for m in models]
 
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[Opportunity]:
+        query = self._session.query(OpportunityModel)
+        models = keyset_page(query, OpportunityModel, limit, after, descending=True).all()
+        return [self._to_entity(m) for m in models]
+
     def get_by_id(self, opportunity_id: str) -> Optional[Opportunity]:
         model = (
             self._session.query(OpportunityModel)
@@ -46,6 +52,16 @@ class SqlOpportunityRepository(OpportunityRepository):
         )
         return self._to_entity(model) if model else None
 
+    def get_by_ids(self, opportunity_ids: list[str]) -> list[Opportunity]:
+        if not opportunity_ids:
+            return []
+        models = (
+            self._session.query(OpportunityModel)
+            .filter(OpportunityModel.id.in_(set(opportunity_ids)))
+            .all()
+        )
+        return [self._to_entity(m) for m in models]
+
     def create(self, opportunity: Opportunity) -> Opportunity:
         model = self._to_model(opportunity)
         self._session.add(model)
@@ -0,0 +1,112 @@
+import threading
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.graph_cache import SocialGraphCache
+from app.core.entities import Connection
+from app.ports.proximity_port import ProximityPort
+
+
+class ProximityIndex(ProximityPort):
+    """Per-user sparse proximity vectors over the SocialGraphCache.
+
+    Each vector is the user's strength-weighted personalized PageRank, truncated to the
+    `top_n` closest users and scaled so the closest scores 1. Vectors are computed on
+    first request (or all at once by `warm`) and kept until a new connection touches
+    their owner or one of the users they contain; those are dropped and recomputed on
+    next use. A new edge between two users outside a vector shifts it only by mass
+    below its truncation, so that vector is kept.
+    """
+
+    def __init__(
+        self,
+        graph: SocialGraphCache,
+        session_factory: Callable[[], Session],
+        alpha: float = 0.3,
+        epsilon: float = 1e-4,
+        top_n: int = 200,
+    ):
+        self._graph = graph
+        self._session_factory = session_factory
+        self._alpha = alpha
+        self._epsilon = epsilon
+        self._top_n = top_n
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._vectors: dict[str, dict[str, float]] = {}
+        # user id -> owners of the vectors it appears in, for invalidation.
+        self._holders: dict[str, set[str]] = {}
+        graph.add_listener(self._on_connections_added)
+
+    def get_scores(self, user_id: str) -> dict[str, float]:
+        self._ensure_graph()
+        with self._lock:
+            vector = self._vectors.get(user_id)
+        if vector is not None:
+            return vector
+        return self._compute(user_id)
+
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        self._ensure_graph()
+        return self._graph.relate(user_id, other_ids)
+
+    def warm(self, user_ids: Optional[Iterable[str]] = None) -> int:
+        """Compute vectors that are not cached yet (all graph members by default)."""
+        self._ensure_graph()
+        if user_ids is None:
+            user_ids = self._graph.user_ids()
+        computed = 0
+        for user_id in user_ids:
+            if user_id not in self._vectors:
+                self._compute(user_id)
+                computed += 1
+        return computed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"vectors": len(self._vectors)}
+
+    def _ensure_graph(self) -> None:
+        if self._graph.needs_refresh():
+            session = self._session_factory()
+            try:
+                self._graph.refresh(session)
+            finally:
+                session.close()
+        with self._lock:
+            if self._generation != self._graph.generation:
+                self._generation = self._graph.generation
+                self._vectors.clear()
+                self._holders.clear()
+
+    def _compute(self, user_id: str) -> dict[str, float]:
+        generation = self._graph.generation
+        raw = self._graph.personalized_pagerank(user_id, self._alpha, self._epsilon, self._top_n)
+        top = max(raw.values(), default=0.0)
+        vector = {uid: score / top for uid, score in raw.items()} if top > 0 else {}
+        with self._lock:
+            if generation == self._generation:
+                self._drop(user_id)
+                self._vectors[user_id] = vector
+                for uid in vector:
+                    self._holders.setdefault(uid, set()).add(user_id)
+        return vector
+
+    def _on_connections_added(self, connections: list[Connection]) -> None:
+        with self._lock:
+            touched = {uid for c in connections for uid in (c.user_a, c.user_b)}
+            stale = set(touched)
+            for uid in touched:
+                stale |= self._holders.get(uid, set())
+            for owner in stale:
+                self._drop(owner)
+
+    def _drop(self, owner: str) -> None:
+        vector = self._vectors.pop(owner, None)
+        for uid in vector or ():
+            holders = self._holders.get(uid)
+            if holders is not None:
+                holders.discard(owner)
+                if not holders:
+                    del self._holders[uid]
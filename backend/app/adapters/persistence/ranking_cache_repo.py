@@ -0,0 +1,101 @@
+import json
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.models import RankingCacheMemberModel, RankingCacheModel
+from app.core.entities import RankedMatch
+from app.ports.repositories import RankingCacheRepository
+
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+class SqlRankingCacheRepository(RankingCacheRepository):
+    """Phase 2 results persisted in SQLite with a TTL and an LRU size bound.
+
+    Hit/miss counters are process-wide, like the impression cache in ReputationService.
+    """
+
+    def __init__(self, session: Session, ttl_seconds: int, max_entries: int):
+        self._session = session
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> Optional[list[RankedMatch]]:
+        now = datetime.now(timezone.utc)
+        model = (
+            self._session.query(RankingCacheModel)
+            .filter(
+                RankingCacheModel.key == key,
+                RankingCacheModel.created_at >= now - self._ttl,
+            )
+            .first()
+        )
+        if not model:
+            _stats["misses"] += 1
+            return None
+        model.last_used_at = now
+        self._session.commit()
+        _stats["hits"] += 1
+        return [RankedMatch(**item) for item in json.loads(model.payload)]
+
+    def put(self, key: str, user_ids: list[str], ranked: list[RankedMatch]) -> None:
+        self._delete(
+            self._session.query(RankingCacheModel.key).filter(RankingCacheModel.key == key)
+        )
+        self._session.add(
+            RankingCacheModel(key=key, payload=json.dumps([asdict(r) for r in ranked]))
+        )
+        self._session.add_all(
+            RankingCacheMemberModel(key=key, user_id=uid) for uid in dict.fromkeys(user_ids)
+        )
+        self._session.flush()
+        self._evict()
+        self._session.commit()
+
+    def invalidate_user(self, user_id: str) -> int:
+        removed = self._delete(
+            self._session.query(RankingCacheMemberModel.key).filter(
+                RankingCacheMemberModel.user_id == user_id
+            )
+        )
+        self._session.commit()
+        return removed
+
+    def stats(self) -> dict:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries": self._session.query(RankingCacheModel).count(),
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def _evict(self) -> None:
+        now = datetime.now(timezone.utc)
+        expired = self._session.query(RankingCacheModel.key).filter(
+            RankingCacheModel.created_at < now - self._ttl
+        )
+        evicted = self._delete(expired)
+        excess = self._session.query(RankingCacheModel).count() - self._max_entries
+        if excess > 0:
+            evicted += self._delete(
+                self._session.query(RankingCacheModel.key)
+                .order_by(RankingCacheModel.last_used_at)
+                .limit(excess)
+            )
+        _stats["evictions"] += evicted
+
+    def _delete(self, keys_query) -> int:
+        keys = [k for (k,) in keys_query.all()]
+        if not keys:
+            return 0
+        self._session.query(RankingCacheMemberModel).filter(
+            RankingCacheMemberModel.key.in_(keys)
+        ).delete(synchronize_session=False)
+        return (
+            self._session.query(RankingCacheModel)
+            .filter(RankingCacheModel.key.in_(keys))
+            .delete(synchronize_session=False)
+        )
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.models import ResourceVersionModel
+from app.ports.repositories import ResourceVersionRepository
+
+
+class SqlResourceVersionRepository(ResourceVersionRepository):
+    """Reads the counters kept by the resource version triggers; nothing here writes them."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[int, datetime]]:
+        if not keys:
+            return {}
+        rows = (
+            self._session.query(
+                ResourceVersionModel.key,
+                ResourceVersionModel.version,
+                ResourceVersionModel.updated_at,
+            )
+            .filter(ResourceVersionModel.key.in_(set(keys)))
+            .all()
+        )
+        return {key: (version, updated_at) for key, version, updated_at in rows}
+
+    def get_version(self, key: str) -> int:
+        version = (
+            self._session.query(ResourceVersionModel.version)
+            .filter(ResourceVersionModel.key == key)
+            .scalar()
+        )
+        return version or 0
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.models import RevokedTokenModel
+from app.ports.repositories import RevokedTokenRepository
+
+
+class SqlRevokedTokenRepository(RevokedTokenRepository):
+    def __init__(self, session: Session):
+        self._session = session
+
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._session.query(RevokedTokenModel).filter(RevokedTokenModel.expires_at <= now).delete()
+        self._session.merge(RevokedTokenModel(token_id=token_id, expires_at=expires_at))
+        self._session.commit()
+
+    def get_active(self, now: datetime) -> dict[str, datetime]:
+        rows = (
+            self._session.query(RevokedTokenModel.token_id, RevokedTokenModel.expires_at)
+            .filter(RevokedTokenModel.expires_at > now)
+            .all()
+        )
+        return {token_id: expires_at for token_id, expires_at in rows}
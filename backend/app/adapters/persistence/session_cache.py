@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.core.entities import User
+
+# resource_versions key bumped (by trigger) on every logout and email change.
+AUTH_VERSION_KEY = "auth"
+
+
+class SessionCache:
+    """Bounded LRU of session token -> User, so authenticating is a dict lookup.
+
+    Entries live for `ttl_seconds`, or until their token expires if that is sooner. All
+    entries are dropped when the cache is bound to a different token scope (signing
+    keys), so a retired key stops authenticating at once. This process evicts
+    explicitly on logout and profile writes. Logouts and email changes made by other
+    processes are picked up through the `auth` counter in resource_versions, which
+    `sync` re-reads at most every `poll_seconds` and which clears the whole cache when
+    it moved. A token revoked elsewhere therefore stays usable here for at most
+    `poll_seconds`; other profile edits made elsewhere show once the entry expires.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        poll_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._poll = poll_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp: Optional[int] = None
+        self._scope: Optional[str] = None
+        self._next_poll = float("-inf")
+        self._stats = {"hits": 0, "misses": 0, "flushes": 0}
+
+    def sync(self, read_stamp: Callable[[], int]) -> None:
+        """Clear the cache if the cross-process stamp moved; reads it only when a poll is due."""
+        now = self._clock()
+        if now < self._next_poll:
+            return
+        stamp = read_stamp()
+        with self._lock:
+            self._next_poll = now + self._poll
+            if stamp != self._stamp:
+                if self._stamp is not None:
+                    self._entries.clear()
+                    self._stats["flushes"] += 1
+                self._stamp = stamp
+
+    def bind(self, scope: str) -> None:
+        """Clear the cache if tokens are now verified differently than when it was filled."""
+        if scope == self._scope:
+            return
+        with self._lock:
+            if scope != self._scope:
+                if self._scope is not None:
+                    self._entries.clear()
+                    self._stats["flushes"] += 1
+                self._scope = scope
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[token]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(token)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, token: str, user: User, max_age_seconds: Optional[float] = None) -> None:
+        """Cache `user` for `token`; `max_age_seconds` is how long the token stays valid."""
+        ttl = self._ttl if max_age_seconds is None else min(self._ttl, max_age_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (self._clock() + ttl, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for token in [t for t, (_, u) in self._entries.items() if u.id == user_id]:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stamp = None
+            self._next_poll = float("-inf")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -1,14 +1,22 @@
+import uuid
 from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from app.adapters.persistence.models import SessionModel
+from app.adapters.persistence.session_cache import SessionCache
 from app.ports.repositories import SessionRepository
 
 
 class SqlSessionRepository(SessionRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache: Optional[SessionCache] = None):
         self._session = session
+        self._cache = cache
+
+    def issue(self, user_id: str) -> str:
+        token = str(uuid.uuid4())
+        self.create(token, user_id)
+        return token
 
     def create(self, session_id: str, user_id: str) -> None:
         model = SessionModel(id=session_id, user_id=user_id)
@@ -26,3 +34,5 @@ class SqlSessionRepository(SessionRepository):
     def delete(self, session_id: str) -> None:
         self._session.query(SessionModel).filter(SessionModel.id == session_id).delete()
         self._session.commit()
+        if self._cache:
+            self._cache.invalidate_token(session_id)
@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.adapters.auth.token_signer import TokenSigner
+from app.adapters.persistence.resource_version_repo import SqlResourceVersionRepository
+from app.adapters.persistence.revoked_token_repo import SqlRevokedTokenRepository
+from app.adapters.persistence.session_cache import AUTH_VERSION_KEY, SessionCache
+from app.ports.repositories import SessionRepository
+
+
+def _utc(timestamp: float) -> datetime:
+    # Naive UTC, as SQLite stores and returns datetimes.
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class TokenDenylist:
+    """In-memory copy of `revoked_tokens`: token id -> expiry.
+
+    Revocations in this process are added directly. Those made elsewhere bump the `auth`
+    stamp in resource_versions; `sync` re-reads the stamp at most every `poll_seconds`
+    and reloads the table when it moved. Expired ids are dropped on reload, so the set
+    only ever holds tokens that would otherwise still verify.
+    """
+
+    def __init__(self, poll_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._poll = poll_seconds
+        self._clock = clock
+        self._revoked: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stamp: Optional[int] = None
+        self._next_poll = float("-inf")
+
+    def sync(self, read_stamp: Callable[[], int], load: Callable[[], dict[str, datetime]]) -> None:
+        now = self._clock()
+        if now < self._next_poll:
+            return
+        stamp = read_stamp()
+        revoked = load() if stamp != self._stamp else None
+        with self._lock:
+            self._next_poll = now + self._poll
+            if revoked is not None:
+                self._revoked = revoked
+                self._stamp = stamp
+
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._revoked[token_id] = expires_at
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+class SignedSessionRepository(SessionRepository):
+    """Sessions as HMAC-signed tokens: nothing is stored until a logout.
+
+    Resolving a token is a signature check plus a denylist lookup; the database is only
+    read when the denylist is due for a poll.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        signer: TokenSigner,
+        denylist: TokenDenylist,
+        cache: Optional[SessionCache] = None,
+    ):
+        self._session = session
+        self._signer = signer
+        self._denylist = denylist
+        self._cache = cache
+        self._revoked = SqlRevokedTokenRepository(session)
+
+    def issue(self, user_id: str) -> str:
+        return self._signer.issue(user_id)
+
+    def get_user_id(self, session_id: str) -> Optional[str]:
+        claims = self._signer.verify(session_id)
+        if claims is None:
+            return None
+        self._denylist.sync(self._read_stamp, lambda: self._revoked.get_active(_utc(time.time())))
+        return None if claims.token_id in self._denylist else claims.user_id
+
+    def get_expiry(self, session_id: str) -> Optional[float]:
+        claims = self._signer.verify(session_id)
+        return None if claims is None else claims.issued_at + self._signer.ttl_seconds
+
+    def delete(self, session_id: str) -> None:
+        claims = self._signer.verify(session_id)
+        if claims is None:
+            return
+        expires_at = _utc(claims.issued_at + self._signer.ttl_seconds)
+        self._revoked.add(claims.token_id, expires_at)
+        self._denylist.add(claims.token_id, expires_at)
+        if self._cache:
+            self._cache.invalidate_token(session_id)
+
+    def _read_stamp(self) -> int:
+        return SqlResourceVersionRepository(self._session).get_version(AUTH_VERSION_KEY)
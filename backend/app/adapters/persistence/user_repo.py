@@ -1,11 +1,31 @@
 import json
+import re
 from typing import Optional
 
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.adapters.persistence.keyset import keyset_page
 from app.adapters.persistence.models import UserModel
 from app.core.entities import User
-from app.ports.repositories import UserRepository
+from app.ports.repositories import PageKey, UserRepository
+
+# bm25 column weights for users_fts(name, bio, skills, interests): a hit in the name
+# counts most, then skills and interests, then free-text bio.
+_SEARCH_SQL = text(
+    "SELECT users.* FROM users_fts "
+    "JOIN users_fts_keys ON users_fts_keys.rowid = users_fts.rowid "
+    "JOIN users ON users.id = users_fts_keys.user_id "
+    "WHERE users_fts MATCH :match "
+    "ORDER BY bm25(users_fts, 10.0, 1.0, 4.0, 2.0), users_fts.rowid LIMIT :limit"
+)
+_WORD = re.compile(r"\w+")
+
+
+def _match_expression(query: str) -> str:
+    """Every word of the query as a quoted prefix term, so user input cannot inject
+    FTS5 operators and a half-typed last word still matches."""
+    return " ".join(f'"{word}"*' for word in _WORD.findall(query))
 
 
 class SqlUserRepository(UserRepository):
@@ -42,17 +62,44 @@ class SqlUserRepository(UserRepository):
         models = self._session.query(UserModel).order_by(UserModel.created_at).all()
         return [self._to_entity(m) for m in models]
 
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[User]:
+        models = keyset_page(self._session.query(UserModel), UserModel, limit, after).all()
+        return [self._to_entity(m) for m in models]
+
     def get_by_id(self, user_id: str) -> Optional[User]:
         model = self._session.query(UserModel).filter(UserModel.id == user_id).first()
         return self._to_entity(model) if model else None
 
+    def get_by_ids(self, user_ids: list[str]) -> list[User]:
+        if not user_ids:
+            return []
+        models = self._session.query(UserModel).filter(UserModel.id.in_(set(user_ids))).all()
+        return [self._to_entity(m) for m in models]
+
     def get_by_email(self, email: str) -> Optional[User]:
         model = self._session.query(UserModel).filter(UserModel.email == email).first()
         return self._to_entity(model) if model else None
 
+    def search(self, query: str, limit: int) -> list[User]:
+        match = _match_expression(query)
+        if not match:
+            return []
+        statement = (
+            self._session.query(UserModel)
+            .from_statement(_SEARCH_SQL)
+            .params(match=match, limit=limit)
+        )
+        return [self._to_entity(m) for m in statement.all()]
+
     def create(self, user: User) -> User:
         model = self._to_model(user)
         self._session.add(model)
         self._session.commit()
         self._session.refresh(model)
         return self._to_entity(model)
+
+    def update_password_hash(self, user_id: str, password_hash: str) -> None:
+        self._session.query(UserModel).filter(UserModel.id == user_id).update(
+            {UserModel.password_hash: password_hash}
+        )
+        self._session.commit()
@@ -1,16 +1,40 @@
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.adapters.persistence.database import Base, engine
-from app.api.routes import auth, connection_requests, feedback, opportunities, users
+from app.adapters.persistence.database import engine
+from app.adapters.persistence.migrations import migrate
+from app.api.dependencies import (
+    get_password_hasher,
+    get_proximity_index,
+    get_token_signer,
+)
+from app.api.routes import admin, auth, connection_requests, feedback, opportunities, users
+from app.config import settings
+from app.services.match_job_service import MatchJobService
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    get_token_signer()  # signed session tokens without valid keys fail here, not on login
+    app.state.match_jobs = MatchJobService(
+        workers=settings.match_job_workers,
+        queue_size=settings.match_job_queue_size,
+        retention=settings.match_job_retention,
+        batch_concurrency=settings.match_batch_concurrency,
+    )
+    app.state.match_jobs.start()
+    proximity = get_proximity_index()
+    if proximity and settings.proximity_warm_on_startup:
+        threading.Thread(target=proximity.warm, name="proximity-warm", daemon=True).start()
     yield
+    await app.state.match_jobs.stop()
+    if get_password_hasher.cache_info().currsize:
+        get_password_hasher().shutdown()
+        get_password_hasher.cache_clear()
 
 
 def create_app() -> FastAPI:
@@ -34,6 +58,7 @@ def create_app() -> FastAPI:
     app.include_router(opportunities.router)
     app.include_router(feedback.router)
     app.include_router(connection_requests.router)
+    app.include_router(admin.router)
 
     @app.get("/api/health")
     def health():
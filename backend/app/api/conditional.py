@@ -0,0 +1,70 @@
+"""Conditional GET: ETag / Last-Modified validators from per-resource change counters.
+
+A handler names the version keys its response is built from (see
+RESOURCE_VERSION_TRIGGERS) and calls `check` before loading anything else. The
+validators come from one indexed read of `resource_versions`; when the client's copy is
+still current, the handler returns the 304 that `check` hands back and skips building
+the body altogether.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.ports.repositories import ResourceVersionRepository
+
+# Responses are per-user, and polling clients should always revalidate.
+_CACHE_CONTROL = "private, no-cache"
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag.removeprefix("W/") in (t.removeprefix("W/") for t in tags)
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+class ConditionalGet:
+    def __init__(self, request: Request, response: Response, versions: ResourceVersionRepository):
+        self._request = request
+        self._response = response
+        self._versions = versions
+
+    def check(self, *keys: str) -> Optional[Response]:
+        """Set ETag and Last-Modified for a response built from `keys`; return a 304 if
+        the request's If-None-Match (or, without one, If-Modified-Since) still holds."""
+        found = self._versions.get_many(list(keys))
+        state = ";".join(f"{key}={found[key][0] if key in found else 0}" for key in keys)
+        etag = f'W/"{hashlib.blake2b(state.encode(), digest_size=8).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL, "Vary": "Authorization"}
+        last_modified = max((changed for _, changed in found.values()), default=None)
+        if last_modified is not None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        self._response.headers.update(headers)
+
+        if_none_match = self._request.headers.get("if-none-match")
+        if if_none_match is not None:
+            fresh = _matches(if_none_match, etag)
+        else:
+            if_modified_since = self._request.headers.get("if-modified-since")
+            fresh = bool(
+                if_modified_since
+                and last_modified
+                and _not_modified_since(if_modified_since, last_modified)
+            )
+        return Response(status_code=304, headers=headers) if fresh else None
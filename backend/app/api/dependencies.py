@@ -1,28 +1,56 @@
+import hmac
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import lru_cache
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.adapters.ai.anthropic_adapter import AnthropicAdapter
+from app.adapters.auth.password_hasher import PasswordHasher
+from app.adapters.auth.token_signer import TokenSigner, parse_signing_keys
 from app.adapters.embeddings.chroma_adapter import ChromaEmbeddingAdapter
+from app.adapters.embeddings.numpy_adapter import NumpyEmbeddingAdapter
 from app.adapters.persistence.connection_repo import SqlConnectionRepository
-from app.adapters.persistence.database import get_session
+from app.adapters.persistence.database import SessionLocal, get_session
 from app.adapters.persistence.feedback_repo import SqlFeedbackRepository
+from app.adapters.persistence.graph_cache import CachedConnectionRepository, SocialGraphCache
 from app.adapters.persistence.match_repo import SqlMatchRepository
+from app.adapters.persistence.opportunity_embedding_repo import SqlOpportunityEmbeddingRepository
 from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.proximity_index import ProximityIndex
+from app.adapters.persistence.ranking_cache_repo import SqlRankingCacheRepository
+from app.adapters.persistence.resource_version_repo import SqlResourceVersionRepository
+from app.adapters.persistence.session_cache import AUTH_VERSION_KEY, SessionCache
 from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.signed_session_repo import SignedSessionRepository, TokenDenylist
 from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.conditional import ConditionalGet
+from app.api.loaders import ResponseLoader
+from app.config import settings
 from app.core.entities import User
 from app.ports.ai_port import AIPort
 from app.ports.embedding_port import EmbeddingPort
+from app.ports.repositories import ConnectionRepository, SessionRepository
+from app.services.match_job_service import MatchingServiceScope, MatchJobService
 from app.services.matching_service import MatchingService
 from app.services.opportunity_service import OpportunityService
+from app.services.reverse_matching_service import ReverseMatchingService
+from app.services.search_service import SearchService
 from app.services.user_service import UserService
 
 
 @lru_cache
 def get_embedding() -> EmbeddingPort:
+    if settings.embedding_backend == "numpy":
+        return NumpyEmbeddingAdapter(
+            index_dir=settings.numpy_index_dir,
+            storage_dtype=settings.numpy_index_dtype,
+            rescore_factor=settings.numpy_index_rescore_factor,
+            compact_ratio=settings.numpy_index_compact_ratio,
+        )
     return ChromaEmbeddingAdapter()
 
 
@@ -31,43 +59,194 @@ def get_ai() -> AIPort:
     return AnthropicAdapter()
 
 
+@lru_cache
+def get_graph_cache() -> SocialGraphCache:
+    return SocialGraphCache(poll_seconds=settings.graph_cache_poll_seconds)
+
+
+@lru_cache
+def get_proximity_index() -> Optional[ProximityIndex]:
+    if not (settings.graph_cache_enabled and settings.proximity_index_enabled):
+        return None
+    return ProximityIndex(
+        get_graph_cache(),
+        SessionLocal,
+        alpha=settings.proximity_alpha,
+        epsilon=settings.proximity_epsilon,
+        top_n=settings.proximity_top_n,
+    )
+
+
+@lru_cache
+def get_session_cache() -> Optional[SessionCache]:
+    if not settings.session_cache_enabled:
+        return None
+    return SessionCache(
+        max_entries=settings.session_cache_size,
+        ttl_seconds=settings.session_cache_ttl_seconds,
+        poll_seconds=settings.session_cache_poll_seconds,
+    )
+
+
+@lru_cache
+def get_token_signer() -> Optional[TokenSigner]:
+    if settings.session_token_mode != "signed":
+        return None
+    return TokenSigner(
+        parse_signing_keys(settings.session_signing_keys),
+        ttl_seconds=settings.session_token_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_token_denylist() -> TokenDenylist:
+    return TokenDenylist(poll_seconds=settings.session_cache_poll_seconds)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        rounds=settings.password_hash_rounds,
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
+
+
+@lru_cache
+def get_search_executor() -> Executor:
+    """Threads for the vector half of hybrid search, shared by all requests."""
+    return ThreadPoolExecutor(
+        max_workers=settings.search_vector_workers, thread_name_prefix="vector-search"
+    )
+
+
+def _build_connection_repo(session: Session) -> ConnectionRepository:
+    if not settings.graph_cache_enabled:
+        return SqlConnectionRepository(session)
+    return CachedConnectionRepository(session, get_graph_cache())
+
+
+def _build_ranking_cache(session: Session) -> Optional[SqlRankingCacheRepository]:
+    if not settings.ranking_cache_enabled:
+        return None
+    return SqlRankingCacheRepository(
+        session,
+        ttl_seconds=settings.ranking_cache_ttl_seconds,
+        max_entries=settings.ranking_cache_max_entries,
+    )
+
+
+def _build_reverse_matching(session: Session) -> Optional[ReverseMatchingService]:
+    if not settings.reverse_matching_enabled:
+        return None
+    return ReverseMatchingService(
+        SqlOpportunityEmbeddingRepository(session),
+        SqlMatchRepository(session),
+        top_k=settings.reverse_matching_top_k,
+        min_similarity=settings.reverse_matching_min_similarity,
+    )
+
+
+def _build_session_evictor() -> Optional[Callable[[str], None]]:
+    cache = get_session_cache()
+    return cache.invalidate_user if cache else None
+
+
 def get_user_service(
     session: Session = Depends(get_session),
     embedding: EmbeddingPort = Depends(get_embedding),
 ) -> UserService:
-    return UserService(SqlUserRepository(session), embedding)
+    return UserService(
+        SqlUserRepository(session),
+        embedding,
+        _build_ranking_cache(session),
+        _build_reverse_matching(session),
+        _build_session_evictor(),
+    )
 
 
-def get_opportunity_service(
+def get_search_service(
     session: Session = Depends(get_session),
-) -> OpportunityService:
-    return OpportunityService(SqlOpportunityRepository(session))
+    embedding: EmbeddingPort = Depends(get_embedding),
+    executor: Executor = Depends(get_search_executor),
+) -> SearchService:
+    return SearchService(
+        SqlUserRepository(session),
+        embedding,
+        executor,
+        budget_seconds=settings.search_budget_ms / 1000,
+        depth=settings.search_hybrid_depth,
+        rrf_k=settings.search_rrf_k,
+        min_similarity=settings.search_min_similarity,
+    )
 
 
-def get_matching_service(
+def get_opportunity_service(
     session: Session = Depends(get_session),
     embedding: EmbeddingPort = Depends(get_embedding),
-    ai: AIPort = Depends(get_ai),
+) -> OpportunityService:
+    return OpportunityService(
+        SqlOpportunityRepository(session), embedding, SqlOpportunityEmbeddingRepository(session)
+    )
+
+
+def _build_matching_service(
+    session: Session, embedding: EmbeddingPort, ai: AIPort
 ) -> MatchingService:
     return MatchingService(
         user_repo=SqlUserRepository(session),
         match_repo=SqlMatchRepository(session),
-        connection_repo=SqlConnectionRepository(session),
+        connection_repo=_build_connection_repo(session),
         embedding=embedding,
         ai=ai,
+        ranking_cache=_build_ranking_cache(session),
+        proximity=get_proximity_index(),
     )
 
 
+def get_matching_service(
+    session: Session = Depends(get_session),
+    embedding: EmbeddingPort = Depends(get_embedding),
+    ai: AIPort = Depends(get_ai),
+) -> MatchingService:
+    return _build_matching_service(session, embedding, ai)
+
+
+@contextmanager
+def matching_service_scope() -> Iterator[MatchingService]:
+    """A MatchingService with its own DB session, for work that outlives the request."""
+    session = SessionLocal()
+    try:
+        yield _build_matching_service(session, get_embedding(), get_ai())
+    finally:
+        session.close()
+
+
+def get_matching_service_scope() -> MatchingServiceScope:
+    return matching_service_scope
+
+
+def get_match_jobs(request: Request) -> MatchJobService:
+    return request.app.state.match_jobs
+
+
 def get_connection_repo(session: Session = Depends(get_session)):
-    return SqlConnectionRepository(session)
+    return _build_connection_repo(session)
 
 
 def get_user_repo(session: Session = Depends(get_session)):
     return SqlUserRepository(session)
 
 
-def get_session_repo(session: Session = Depends(get_session)):
-    return SqlSessionRepository(session)
+def _build_session_repo(session: Session) -> SessionRepository:
+    signer = get_token_signer()
+    if signer is None:
+        return SqlSessionRepository(session, get_session_cache())
+    return SignedSessionRepository(session, signer, get_token_denylist(), get_session_cache())
+
+
+def get_session_repo(session: Session = Depends(get_session)) -> SessionRepository:
+    return _build_session_repo(session)
 
 
 def get_feedback_repo(session: Session = Depends(get_session)):
@@ -79,6 +258,16 @@ def get_connection_request_repo(session: Session = Depends(get_session)):
     return SqlConnectionRequestRepository(session)
 
 
+def get_loader(session: Session = Depends(get_session)) -> ResponseLoader:
+    return ResponseLoader(SqlUserRepository(session), SqlOpportunityRepository(session))
+
+
+def get_conditional(
+    request: Request, response: Response, session: Session = Depends(get_session)
+) -> ConditionalGet:
+    return ConditionalGet(request, response, SqlResourceVersionRepository(session))
+
+
 def get_current_user(
     authorization: Optional[str] = Header(None),
     session: Session = Depends(get_session),
@@ -86,7 +275,14 @@ def get_current_user(
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
     token = authorization.split(" ", 1)[1]
-    session_repo = SqlSessionRepository(session)
+    cache = get_session_cache()
+    if cache:
+        signer = get_token_signer()
+        cache.bind(signer.fingerprint if signer else "db")
+        cache.sync(lambda: SqlResourceVersionRepository(session).get_version(AUTH_VERSION_KEY))
+        if user := cache.get(token):
+            return user
+    session_repo = _build_session_repo(session)
     user_id = session_repo.get_user_id(token)
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
@@ -94,4 +290,14 @@ def get_current_user(
     user = user_repo.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    if cache:
+        expires_at = session_repo.get_expiry(token)
+        cache.put(token, user, None if expires_at is None else expires_at - time.time())
     return user
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -0,0 +1,56 @@
+"""Request-scoped batching lookups for assembling route responses.
+
+Handlers prime every id a response is going to name, then read entities one at a time.
+The first read fetches everything primed so far with one IN query per entity type, and
+every answer (misses included) is memoized for the rest of the request, so building a
+list response costs a fixed number of queries whatever its length.
+"""
+
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from app.core.entities import Opportunity, User
+from app.ports.repositories import OpportunityRepository, UserRepository
+
+T = TypeVar("T", User, Opportunity)
+
+
+class _Batch(Generic[T]):
+    def __init__(self, fetch: Callable[[list[str]], list[T]]):
+        self._fetch = fetch
+        self._pending: set[str] = set()
+        self._loaded: dict[str, Optional[T]] = {}
+
+    def prime(self, ids: Iterable[str]) -> None:
+        self._pending.update(i for i in ids if i not in self._loaded)
+
+    def get(self, id_: str) -> Optional[T]:
+        if id_ not in self._loaded:
+            self._pending.add(id_)
+            self._flush()
+        return self._loaded[id_]
+
+    def _flush(self) -> None:
+        ids, self._pending = sorted(self._pending), set()
+        found = {e.id: e for e in self._fetch(ids)}
+        for i in ids:
+            self._loaded[i] = found.get(i)
+
+
+class ResponseLoader:
+    """Batched, memoized user and opportunity lookups for one request."""
+
+    def __init__(self, user_repo: UserRepository, opportunity_repo: OpportunityRepository):
+        self._users: _Batch[User] = _Batch(user_repo.get_by_ids)
+        self._opportunities: _Batch[Opportunity] = _Batch(opportunity_repo.get_by_ids)
+
+    def prime_users(self, user_ids: Iterable[str]) -> None:
+        self._users.prime(user_ids)
+
+    def user(self, user_id: str) -> Optional[User]:
+        return self._users.get(user_id)
+
+    def prime_opportunities(self, opportunity_ids: Iterable[str]) -> None:
+        self._opportunities.prime(opportunity_ids)
+
+    def opportunity(self, opportunity_id: str) -> Optional[Opportunity]:
+        return self._opportunities.get(opportunity_id)
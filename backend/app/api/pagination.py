@@ -0,0 +1,55 @@
+"""`limit` / `cursor` query parameters for keyset-paginated list endpoints.
+
+A cursor is the (created_at, id) of the last item on the previous page, base64-encoded
+so clients treat it as opaque. Handlers ask the repository for `limit + 1` rows; the
+extra row only signals that another page exists and is not returned.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, TypeVar
+
+from fastapi import HTTPException, Query
+
+from app.config import settings
+from app.ports.repositories import PageKey
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    after: Optional[PageKey] = None
+
+
+def encode_cursor(created_at: datetime, id_: str) -> str:
+    raw = json.dumps([created_at.isoformat(), id_]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(id_)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_page_params(
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    cursor: Optional[str] = Query(None),
+) -> PageParams:
+    return PageParams(limit=limit, after=decode_cursor(cursor) if cursor else None)
+
+
+def split_page(rows: list[T], page: PageParams) -> tuple[list[T], Optional[str]]:
+    """The rows to return and the cursor of the next page, from a `limit + 1` fetch."""
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
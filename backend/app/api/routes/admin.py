@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.adapters.persistence.database import get_session, sqlite_tuning
+from app.adapters.persistence.engine_config import describe_engine
+from app.api.dependencies import (
+    get_match_jobs,
+    get_matching_service_scope,
+    get_opportunity_service,
+    require_admin,
+)
+from app.api.schemas import BatchMatchJobResponse, DatabaseDiagnosticsResponse, RematchRequest
+from app.config import settings
+from app.core.entities import BatchMatchJob
+from app.services.match_job_service import (
+    MatchingServiceScope,
+    MatchJobQueueFull,
+    MatchJobService,
+)
+from app.services.opportunity_service import OpportunityService
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _batch_job_response(job: BatchMatchJob) -> BatchMatchJobResponse:
+    return BatchMatchJobResponse(
+        job_id=job.id,
+        status=job.status.value,
+        total=len(job.opportunity_ids),
+        completed=job.completed,
+        matches_created=job.matches_created,
+        error=job.error,
+    )
+
+
+@router.post("/rematch", response_model=BatchMatchJobResponse, status_code=202)
+def rematch(
+    body: RematchRequest,
+    svc: OpportunityService = Depends(get_opportunity_service),
+    matching_scope: MatchingServiceScope = Depends(get_matching_service_scope),
+    jobs: MatchJobService = Depends(get_match_jobs),
+):
+    """Re-run matching for the given opportunities (all when omitted) as one background job.
+
+    Existing matches of those opportunities are replaced once the whole batch is ranked.
+    Poll GET /api/admin/rematch/{job_id} for progress.
+    """
+    if body.opportunity_ids is None:
+        opportunities = svc.get_all()
+    else:
+        opportunities = svc.get_by_ids(body.opportunity_ids)
+        missing = set(body.opportunity_ids) - {o.id for o in opportunities}
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"Opportunities not found: {sorted(missing)}"
+            )
+    if len(opportunities) > settings.match_batch_max_opportunities:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.match_batch_max_opportunities} opportunities per batch",
+        )
+
+    try:
+        job = jobs.submit_batch(opportunities, matching_scope)
+    except MatchJobQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pending match jobs, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+    return _batch_job_response(job)
+
+
+@router.get("/rematch/{job_id}", response_model=BatchMatchJobResponse)
+def get_rematch_job(job_id: str, jobs: MatchJobService = Depends(get_match_jobs)):
+    job = jobs.get(job_id)
+    if not isinstance(job, BatchMatchJob):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _batch_job_response(job)
+
+
+@router.get("/database", response_model=DatabaseDiagnosticsResponse)
+def database_diagnostics(session: Session = Depends(get_session)):
+    """The SQLite pragmas the settings ask for, the ones in effect, and the pool's state."""
+    return describe_engine(session.get_bind(), sqlite_tuning)
@@ -1,10 +1,18 @@
+import asyncio
 import uuid
 from typing import Optional
 
-import bcrypt
 from fastapi import APIRouter, Depends, Header, HTTPException
-
-from app.api.dependencies import get_current_user, get_session_repo, get_user_service
+from sqlalchemy.orm import Session
+
+from app.adapters.auth.password_hasher import PasswordHasher, PasswordHasherBusy
+from app.adapters.persistence.database import get_session
+from app.api.dependencies import (
+    get_current_user,
+    get_password_hasher,
+    get_session_repo,
+    get_user_service,
+)
 from app.api.schemas import AuthResponse, LoginRequest, RegisterRequest, UserResponse
 from app.core.entities import User
 from app.services.user_service import UserService
@@ -12,38 +20,54 @@ from app.services.user_service import UserService
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-def _hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
 
 
-def _check_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+def _find_by_email(svc: UserService, session: Session, email: str) -> Optional[User]:
+    with session.begin():  # ends the read, so no connection is held while hashing
+        return svc.get_by_email(email)
 
 
+# register and login are async so that waiting on the hasher's process pool holds no
+# threadpool thread. Their database calls go through asyncio.to_thread: a write waiting
+# on SQLite's lock (busy_timeout) or a lookup waiting on a full connection pool must not
+# stall the event loop. No connection is held while a hash is awaited, or a login storm
+# would exhaust the pool.
 @router.post("/register", response_model=AuthResponse, status_code=201)
-def register(
+async def register(
     body: RegisterRequest,
     svc: UserService = Depends(get_user_service),
     session_repo=Depends(get_session_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+    session: Session = Depends(get_session),
 ):
-    existing = svc._repo.get_by_email(body.email)
+    existing = await asyncio.to_thread(_find_by_email, svc, session, body.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    try:
+        password_hash = await hasher.hash(body.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
     user = User(
         id=str(uuid.uuid4()),
         name=body.name,
         email=body.email,
-        password_hash=_hash_password(body.password),
+        password_hash=password_hash,
         bio=body.bio,
         skills=body.skills,
         interests=body.interests,
         open_to=body.open_to,
     )
-    created = svc.create(user)
+    created = await asyncio.to_thread(svc.create, user)  # embeds the new profile
 
-    token = str(uuid.uuid4())
-    session_repo.create(token, created.id)
+    token = await asyncio.to_thread(session_repo.issue, created.id)
 
     return AuthResponse(
         token=token,
@@ -61,17 +85,32 @@ def register(
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(
+async def login(
     body: LoginRequest,
     svc: UserService = Depends(get_user_service),
     session_repo=Depends(get_session_repo),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+    session: Session = Depends(get_session),
 ):
-    user = svc._repo.get_by_email(body.email)
-    if not user or not _check_password(body.password, user.password_hash):
+    user = await asyncio.to_thread(_find_by_email, svc, session, body.email)
+    try:
+        valid = user is not None and await hasher.verify(body.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    token = str(uuid.uuid4())
-    session_repo.create(token, user.id)
+    if hasher.needs_rehash(user.password_hash):
+        # Upgrade (or downgrade) to the configured cost while we have the plaintext;
+        # if the pool is busy, the next login tries again.
+        try:
+            password_hash = await hasher.hash(body.password)
+        except PasswordHasherBusy:
+            password_hash = None
+        if password_hash:
+            await asyncio.to_thread(svc.rehash_password, user.id, password_hash)
+
+    token = await asyncio.to_thread(session_repo.issue, user.id)
 
     return AuthResponse(
         token=token,
@@ -2,30 +2,40 @@ import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.api.conditional import ConditionalGet
 from app.api.dependencies import (
+    get_conditional,
     get_connection_repo,
     get_connection_request_repo,
     get_current_user,
-    get_opportunity_service,
-    get_user_service,
+    get_loader,
+)
+from app.api.loaders import ResponseLoader
+from app.api.pagination import PageParams, get_page_params, split_page
+from app.api.schemas import (
+    ConnectionRequestCreate,
+    ConnectionRequestPageResponse,
+    ConnectionRequestResponse,
 )
-from app.api.schemas import ConnectionRequestCreate, ConnectionRequestResponse
 from app.core.entities import Connection, ConnectionRequest, User
 from app.core.enums import ConnectionSource
-from app.services.opportunity_service import OpportunityService
-from app.services.user_service import UserService
 
 router = APIRouter(prefix="/api/connection-requests", tags=["connection-requests"])
 
 
-def _to_response(
-    req: ConnectionRequest,
-    user_svc: UserService,
-    opp_svc: OpportunityService,
-) -> ConnectionRequestResponse:
-    from_user = user_svc.get_by_id(req.from_user_id)
-    to_user = user_svc.get_by_id(req.to_user_id)
-    opp = opp_svc.get_by_id(req.opportunity_id)
+def _to_responses(
+    reqs: list[ConnectionRequest], loader: ResponseLoader
+) -> list[ConnectionRequestResponse]:
+    loader.prime_users(r.from_user_id for r in reqs)
+    loader.prime_users(r.to_user_id for r in reqs)
+    loader.prime_opportunities(r.opportunity_id for r in reqs)
+    return [_to_response(r, loader) for r in reqs]
+
+
+def _to_response(req: ConnectionRequest, loader: ResponseLoader) -> ConnectionRequestResponse:
+    from_user = loader.user(req.from_user_id)
+    to_user = loader.user(req.to_user_id)
+    opp = loader.opportunity(req.opportunity_id)
     return ConnectionRequestResponse(
         id=req.id,
         from_user_id=req.from_user_id,
@@ -45,13 +55,14 @@ def create_request(
     body: ConnectionRequestCreate,
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
     if current_user.id == body.to_user_id:
         raise HTTPException(status_code=400, detail="Cannot send request to yourself")
 
-    target = user_svc.get_by_id(body.to_user_id)
+    loader.prime_users([current_user.id])
+    loader.prime_opportunities([body.opportunity_id])
+    target = loader.user(body.to_user_id)
     if not target:
         raise HTTPException(status_code=404, detail="Target user not found")
 
@@ -66,29 +77,48 @@ def create_request(
         match_id=body.match_id,
     )
     created = req_repo.create(req)
-    return _to_response(created, user_svc, opp_svc)
+    return _to_response(created, loader)
 
 
-@router.get("/incoming", response_model=list[ConnectionRequestResponse])
+@router.get("/incoming", response_model=ConnectionRequestPageResponse)
 def get_incoming(
+    page: PageParams = Depends(get_page_params),
+    current_user: User = Depends(get_current_user),
+    req_repo=Depends(get_connection_request_repo),
+    loader: ResponseLoader = Depends(get_loader),
+    conditional: ConditionalGet = Depends(get_conditional),
+):
+    if not_modified := conditional.check(f"requests:{current_user.id}"):
+        return not_modified
+    reqs = req_repo.get_incoming_page(current_user.id, page.limit + 1, page.after)
+    reqs, next_cursor = split_page(reqs, page)
+    return ConnectionRequestPageResponse(items=_to_responses(reqs, loader), next_cursor=next_cursor)
+
+
+@router.get("/incoming/count")
+def count_incoming(
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
-    reqs = req_repo.get_incoming(current_user.id)
-    return [_to_response(r, user_svc, opp_svc) for r in reqs]
+    if not_modified := conditional.check(f"requests:{current_user.id}"):
+        return not_modified
+    return {"count": req_repo.count_incoming(current_user.id)}
 
 
-@router.get("/outgoing", response_model=list[ConnectionRequestResponse])
+@router.get("/outgoing", response_model=ConnectionRequestPageResponse)
 def get_outgoing(
+    page: PageParams = Depends(get_page_params),
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
-    reqs = req_repo.get_outgoing(current_user.id)
-    return [_to_response(r, user_svc, opp_svc) for r in reqs]
+    if not_modified := conditional.check(f"requests:{current_user.id}"):
+        return not_modified
+    reqs = req_repo.get_outgoing_page(current_user.id, page.limit + 1, page.after)
+    reqs, next_cursor = split_page(reqs, page)
+    return ConnectionRequestPageResponse(items=_to_responses(reqs, loader), next_cursor=next_cursor)
 
 
 @router.get("/check")
@@ -106,16 +136,14 @@ def get_by_opportunity(
     opportunity_id: str,
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
-    opp = opp_svc.get_by_id(opportunity_id)
+    opp = loader.opportunity(opportunity_id)
     if not opp:
         raise HTTPException(status_code=404, detail="Opportunity not found")
     if opp.posted_by != current_user.id:
         raise HTTPException(status_code=403, detail="Only the poster can view these requests")
-    reqs = req_repo.get_by_opportunity(opportunity_id)
-    return [_to_response(r, user_svc, opp_svc) for r in reqs]
+    return _to_responses(req_repo.get_by_opportunity(opportunity_id), loader)
 
 
 @router.post("/{request_id}/accept", response_model=ConnectionRequestResponse)
@@ -124,8 +152,7 @@ def accept_request(
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
     conn_repo=Depends(get_connection_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
     req = req_repo.get_by_id(request_id)
     if not req:
@@ -145,7 +172,7 @@ def accept_request(
     )
     conn_repo.create(conn)
 
-    return _to_response(updated, user_svc, opp_svc)
+    return _to_responses([updated], loader)[0]
 
 
 @router.post("/{request_id}/decline", response_model=ConnectionRequestResponse)
@@ -153,8 +180,7 @@ def decline_request(
     request_id: str,
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
-    user_svc: UserService = Depends(get_user_service),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
     req = req_repo.get_by_id(request_id)
     if not req:
@@ -165,4 +191,4 @@ def decline_request(
         raise HTTPException(status_code=400, detail="Request is no longer pending")
 
     updated = req_repo.update_status(request_id, "declined")
-    return _to_response(updated, user_svc, opp_svc)
+    return _to_responses([updated], loader)[0]
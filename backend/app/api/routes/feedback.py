@@ -7,9 +7,10 @@ from app.api.dependencies import (
     get_connection_request_repo,
     get_current_user,
     get_feedback_repo,
-    get_opportunity_service,
+    get_loader,
     get_user_service,
 )
+from app.api.loaders import ResponseLoader
 from app.api.schemas import (
     ExperienceResponse,
     ExperiencesResponse,
@@ -18,7 +19,6 @@ from app.api.schemas import (
     ImpressionResponse,
 )
 from app.core.entities import Feedback, User
-from app.services.opportunity_service import OpportunityService
 from app.services.reputation_service import ReputationService
 from app.services.user_service import UserService
 
@@ -31,24 +31,28 @@ def get_experiences(
     current_user: User = Depends(get_current_user),
     req_repo=Depends(get_connection_request_repo),
     feedback_repo=Depends(get_feedback_repo),
-    opp_svc: OpportunityService = Depends(get_opportunity_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
     if current_user.id == to_user_id:
         return ExperiencesResponse(experiences=[])
 
     reqs = req_repo.get_accepted_between(current_user.id, to_user_id)
+    loader.prime_opportunities(r.opportunity_id for r in reqs)
     seen_opp_ids: set[str] = set()
+    given: dict[str, bool] = {}  # opportunity type -> feedback already left
     experiences: list[ExperienceResponse] = []
 
     for req in reqs:
         if req.opportunity_id in seen_opp_ids:
             continue
         seen_opp_ids.add(req.opportunity_id)
-        opp = opp_svc.get_by_id(req.opportunity_id)
+        opp = loader.opportunity(req.opportunity_id)
         if not opp:
             continue
         opp_type = opp.type.value
-        if feedback_repo.has_feedback(current_user.id, to_user_id, opp_type):
+        if opp_type not in given:
+            given[opp_type] = feedback_repo.has_feedback(current_user.id, to_user_id, opp_type)
+        if given[opp_type]:
             continue
         experiences.append(
             ExperienceResponse(
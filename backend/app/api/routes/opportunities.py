@@ -1,44 +1,125 @@
+import asyncio
+import json
 import uuid
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from app.api.dependencies import get_matching_service, get_opportunity_service, get_user_service
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.api.conditional import ConditionalGet
+from app.api.dependencies import (
+    get_conditional,
+    get_loader,
+    get_match_jobs,
+    get_matching_service,
+    get_matching_service_scope,
+    get_opportunity_service,
+)
+from app.api.loaders import ResponseLoader
+from app.api.pagination import PageParams, get_page_params, split_page
 from app.api.schemas import (
+    MatchCandidateResponse,
+    MatchJobResponse,
     MatchResponse,
     OpportunityCreate,
     OpportunityDetailResponse,
+    OpportunityPageResponse,
     OpportunityResponse,
 )
-from app.core.entities import Opportunity
+from app.core.entities import CandidateScore, Match, MatchJob, Opportunity, User
 from app.core.enums import OpportunityType
+from app.services.match_job_service import (
+    MatchingServiceScope,
+    MatchJobQueueFull,
+    MatchJobService,
+)
 from app.services.matching_service import MatchingService
 from app.services.opportunity_service import OpportunityService
-from app.services.user_service import UserService
 
 router = APIRouter(prefix="/api/opportunities", tags=["opportunities"])
 
 
-@router.get("", response_model=list[OpportunityResponse])
+def _jobs_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many pending match jobs, try again shortly",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _match_response(m: Match, user: Optional[User]) -> MatchResponse:
+    return MatchResponse(
+        id=m.id,
+        opportunity_id=m.opportunity_id,
+        user_id=m.user_id,
+        user_name=user.name if user else "Unknown",
+        user_bio=user.bio if user else "",
+        user_skills=user.skills if user else [],
+        score=m.score,
+        embedding_score=m.embedding_score,
+        network_score=m.network_score,
+        explanation=m.explanation,
+        rank=m.rank,
+        created_at=m.created_at,
+        source=m.source.value,
+    )
+
+
+def _match_responses(matches: list[Match], loader: ResponseLoader) -> list[MatchResponse]:
+    loader.prime_users(m.user_id for m in matches)
+    return [_match_response(m, loader.user(m.user_id)) for m in matches]
+
+
+def _opportunity_response(o: Opportunity, poster: Optional[User]) -> OpportunityResponse:
+    return OpportunityResponse(
+        id=o.id,
+        title=o.title,
+        description=o.description,
+        type=o.type.value,
+        posted_by=o.posted_by,
+        poster_name=poster.name if poster else "Unknown",
+        created_at=o.created_at,
+    )
+
+
+def _candidate_response(c: CandidateScore) -> MatchCandidateResponse:
+    return MatchCandidateResponse(
+        user_id=c.user.id,
+        user_name=c.user.name,
+        embedding_score=c.embedding_score,
+        network_score=c.network_score,
+        combined_score=c.combined_score,
+        shared_connections=c.shared_connections,
+    )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _job_response(job: MatchJob, loader: ResponseLoader) -> MatchJobResponse:
+    return MatchJobResponse(
+        job_id=job.id,
+        opportunity_id=job.opportunity_id,
+        status=job.status.value,
+        candidates=[_candidate_response(c) for c in job.candidates],
+        matches=_match_responses(job.matches, loader),
+        error=job.error,
+    )
+
+
+@router.get("", response_model=OpportunityPageResponse)
 def list_opportunities(
+    page: PageParams = Depends(get_page_params),
     svc: OpportunityService = Depends(get_opportunity_service),
-    user_svc: UserService = Depends(get_user_service),
+    loader: ResponseLoader = Depends(get_loader),
 ):
-    opps = svc.get_all()
-    result = []
-    for o in opps:
-        poster = user_svc.get_by_id(o.posted_by)
-        result.append(
-            OpportunityResponse(
-                id=o.id,
-                title=o.title,
-                description=o.description,
-                type=o.type.value,
-                posted_by=o.posted_by,
-                poster_name=poster.name if poster else "Unknown",
-                created_at=o.created_at,
-            )
-        )
-    return result
+    opps, next_cursor = split_page(svc.get_page(page.limit + 1, page.after), page)
+    loader.prime_users(o.posted_by for o in opps)
+    return OpportunityPageResponse(
+        items=[_opportunity_response(o, loader.user(o.posted_by)) for o in opps],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{opportunity_id}", response_model=OpportunityDetailResponse)
@@ -46,55 +127,86 @@ def get_opportunity(
     opportunity_id: str,
     svc: OpportunityService = Depends(get_opportunity_service),
     matching_svc: MatchingService = Depends(get_matching_service),
-    user_svc: UserService = Depends(get_user_service),
+    loader: ResponseLoader = Depends(get_loader),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
+    if not_modified := conditional.check(f"opportunity:{opportunity_id}"):
+        return not_modified
     opp = svc.get_by_id(opportunity_id)
     if not opp:
         raise HTTPException(status_code=404, detail="Opportunity not found")
 
-    poster = user_svc.get_by_id(opp.posted_by)
     matches = matching_svc.get_matches(opportunity_id)
-
-    match_responses = []
-    for m in matches:
-        user = user_svc.get_by_id(m.user_id)
-        match_responses.append(
-            MatchResponse(
-                id=m.id,
-                opportunity_id=m.opportunity_id,
-                user_id=m.user_id,
-                user_name=user.name if user else "Unknown",
-                user_bio=user.bio if user else "",
-                user_skills=user.skills if user else [],
-                score=m.score,
-                embedding_score=m.embedding_score,
-                network_score=m.network_score,
-                explanation=m.explanation,
-                rank=m.rank,
-                created_at=m.created_at,
-            )
-        )
+    loader.prime_users([opp.posted_by])
+    match_responses = _match_responses(matches, loader)
 
     return OpportunityDetailResponse(
-        opportunity=OpportunityResponse(
-            id=opp.id,
-            title=opp.title,
-            description=opp.description,
-            type=opp.type.value,
-            posted_by=opp.posted_by,
-            poster_name=poster.name if poster else "Unknown",
-            created_at=opp.created_at,
-        ),
+        opportunity=_opportunity_response(opp, loader.user(opp.posted_by)),
         matches=match_responses,
     )
 
 
-@router.post("", response_model=OpportunityDetailResponse, status_code=201)
+@router.get("/{opportunity_id}/matches/stream")
+async def stream_matches(
+    opportunity_id: str,
+    svc: OpportunityService = Depends(get_opportunity_service),
+    matching_scope: MatchingServiceScope = Depends(get_matching_service_scope),
+    jobs: MatchJobService = Depends(get_match_jobs),
+):
+    """Server-sent events: `candidates` (Phase 1), one `match` per ranked result, `done`.
+
+    Matches already stored for the opportunity are replayed instead of re-ranked. The
+    events come from MatchJobService.stream, which ranks on its own DB session under
+    the same per-opportunity lock as match jobs.
+    """
+    opp = await asyncio.to_thread(svc.get_by_id, opportunity_id)
+    if not opp:
+        raise HTTPException(status_code=404, detail="Opportunity not found")
+
+    async def events():
+        count = 0
+        async for kind, payload in jobs.stream(opp, matching_scope):
+            if kind == "candidates":
+                yield _sse("candidates", [_candidate_response(c).model_dump() for c in payload])
+            else:
+                match, user = payload
+                count += 1
+                yield _sse("match", _match_response(match, user).model_dump(mode="json"))
+        yield _sse("done", {"count": count})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=MatchJobResponse)
+def get_match_job(
+    job_id: str,
+    jobs: MatchJobService = Depends(get_match_jobs),
+    loader: ResponseLoader = Depends(get_loader),
+):
+    job = jobs.get(job_id)
+    if not isinstance(job, MatchJob):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job, loader)
+
+
+@router.post(
+    "",
+    response_model=OpportunityDetailResponse,
+    status_code=201,
+    responses={202: {"model": MatchJobResponse}},
+)
 async def create_opportunity(
     body: OpportunityCreate,
+    mode: Literal["sync", "job"] = Query("sync"),
     svc: OpportunityService = Depends(get_opportunity_service),
     matching_svc: MatchingService = Depends(get_matching_service),
-    user_svc: UserService = Depends(get_user_service),
+    matching_scope: MatchingServiceScope = Depends(get_matching_service_scope),
+    jobs: MatchJobService = Depends(get_match_jobs),
+    loader: ResponseLoader = Depends(get_loader),
 ):
     try:
         opp_type = OpportunityType(body.type)
@@ -104,10 +216,13 @@ async def create_opportunity(
             detail=f"Invalid type. Must be one of: {[t.value for t in OpportunityType]}",
         )
 
-    poster = user_svc.get_by_id(body.posted_by)
+    poster = loader.user(body.posted_by)
     if not poster:
         raise HTTPException(status_code=400, detail="User not found")
 
+    if mode == "job" and jobs.is_full():
+        raise _jobs_busy()
+
     opportunity = Opportunity(
         id=str(uuid.uuid4()),
         title=body.title,
@@ -117,37 +232,19 @@ async def create_opportunity(
     )
     created = svc.create(opportunity)
 
-    matches = await matching_svc.find_matches(created)
-
-    match_responses = []
-    for m in matches:
-        user = user_svc.get_by_id(m.user_id)
-        match_responses.append(
-            MatchResponse(
-                id=m.id,
-                opportunity_id=m.opportunity_id,
-                user_id=m.user_id,
-                user_name=user.name if user else "Unknown",
-                user_bio=user.bio if user else "",
-                user_skills=user.skills if user else [],
-                score=m.score,
-                embedding_score=m.embedding_score,
-                network_score=m.network_score,
-                explanation=m.explanation,
-                rank=m.rank,
-                created_at=m.created_at,
-            )
+    if mode == "job":
+        try:
+            job = jobs.submit(created, matching_scope)
+        except MatchJobQueueFull:
+            raise _jobs_busy()
+        return JSONResponse(
+            status_code=202,
+            content=_job_response(job, loader).model_dump(mode="json"),
         )
 
+    matches = await matching_svc.find_matches(created)
+
     return OpportunityDetailResponse(
-        opportunity=OpportunityResponse(
-            id=created.id,
-            title=created.title,
-            description=created.description,
-            type=created.type.value,
-            posted_by=created.posted_by,
-            poster_name=poster.name,
-            created_at=created.created_at,
-        ),
-        matches=match_responses,
+        opportunity=_opportunity_response(created, poster),
+        matches=_match_responses(matches, loader),
     )
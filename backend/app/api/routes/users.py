@@ -1,28 +1,35 @@
-import json
 import uuid
-from typing import Optional
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from app.api.conditional import ConditionalGet
 from app.api.dependencies import (
+    get_conditional,
     get_connection_repo,
     get_connection_request_repo,
     get_current_user,
+    get_loader,
+    get_search_service,
     get_user_service,
 )
+from app.api.loaders import ResponseLoader
+from app.api.pagination import PageParams, get_page_params, split_page
 from app.api.schemas import (
+    ConnectionPathResponse,
     ConnectionResponse,
     LayeredNetworkResponse,
     NetworkMemberResponse,
     NetworkResponse,
+    PathStepResponse,
     SearchResultResponse,
     UserCreate,
+    UserPageResponse,
     UserResponse,
 )
-from app.adapters.persistence.database import get_session
-from app.adapters.persistence.models import UserModel
+from app.config import settings
 from app.core.entities import User
+from app.services.search_service import SearchService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/api/users", tags=["users"])
@@ -44,68 +51,63 @@ def _user_response(user: User, conn_count: int = 0) -> UserResponse:
 
 @router.get("/search", response_model=list[SearchResultResponse])
 def search_users(
+    response: Response,
     q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=settings.page_size_max),
+    mode: Literal["lexical", "hybrid"] = Query(settings.search_default_mode),
     current_user: User = Depends(get_current_user),
-    svc: UserService = Depends(get_user_service),
+    search: SearchService = Depends(get_search_service),
     conn_repo=Depends(get_connection_repo),
-    session: Session = Depends(get_session),
 ):
-    term = f"%{q.lower()}%"
-    models = (
-        session.query(UserModel)
-        .filter(
-            (UserModel.name.ilike(term))
-            | (UserModel.skills.ilike(term))
-            | (UserModel.interests.ilike(term))
-            | (UserModel.bio.ilike(term))
-        )
-        .limit(20)
-        .all()
-    )
-
-    first_degree_ids = set()
-    conns = conn_repo.get_connections(current_user.id)
-    for c in conns:
-        other = c.user_b if c.user_a == current_user.id else c.user_a
-        first_degree_ids.add(other)
+    """Full-text search over name, skills, interests and bio, best match first.
 
-    second_degree = conn_repo.get_second_degree(current_user.id)
+    `mode=hybrid` also ranks by profile similarity; the X-Search-Mode response header
+    says which ranking was served, as hybrid degrades to lexical under load."""
+    outcome = search.search(q, limit, mode, exclude_id=current_user.id)
+    response.headers["X-Search-Mode"] = outcome.mode
+    ids = [u.id for u in outcome.users]
+    related = conn_repo.relate(current_user.id, ids)
+    counts = conn_repo.count_connections(ids)
 
     results = []
-    for m in models:
-        if m.id == current_user.id:
-            continue
-        user_conns = conn_repo.get_connections(m.id)
-        user = User(
-            id=m.id, name=m.name, bio=m.bio,
-            skills=json.loads(m.skills), interests=json.loads(m.interests),
-            open_to=json.loads(m.open_to), email=m.email or "",
-            password_hash="", created_at=m.created_at,
+    for user in outcome.users:
+        degree, shared = related.get(user.id, (0, []))
+        results.append(
+            SearchResultResponse(
+                user=_user_response(user, counts[user.id]),
+                degree={1: "1st", 2: "2nd"}.get(degree, "other"),
+                shared_connections=shared,
+            )
         )
-        degree = "other"
-        shared: list[str] = []
-        if m.id in first_degree_ids:
-            degree = "1st"
-        elif m.id in second_degree:
-            degree = "2nd"
-            shared = second_degree[m.id]
-
-        results.append(SearchResultResponse(
-            user=_user_response(user, len(user_conns)),
-            degree=degree,
-            shared_connections=shared,
-        ))
     return results
 
 
 @router.get("/network/me", response_model=LayeredNetworkResponse)
 def get_my_network(
+    page: PageParams = Depends(get_page_params),
     current_user: User = Depends(get_current_user),
-    svc: UserService = Depends(get_user_service),
     conn_repo=Depends(get_connection_repo),
     req_repo=Depends(get_connection_request_repo),
+    loader: ResponseLoader = Depends(get_loader),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
-    conns = conn_repo.get_connections(current_user.id)
+    """Direct connections one page at a time, oldest first; on the first page only, up to
+    `limit` 2nd-degree members, those sharing the most connections first."""
+    if not_modified := conditional.check("graph", f"requests:{current_user.id}"):
+        return not_modified
+    conns = conn_repo.get_connections_page(current_user.id, page.limit + 1, page.after)
+    conns, next_cursor = split_page(conns, page)
+    second_degree_map: dict[str, list[str]] = {}
+    if page.after is None:
+        ranked = sorted(
+            conn_repo.get_second_degree(current_user.id).items(),
+            key=lambda item: (-len(item[1]), item[0]),
+        )
+        second_degree_map = dict(ranked[: page.limit])
+    member_ids = [c.user_b if c.user_a == current_user.id else c.user_a for c in conns]
+    member_ids += list(second_degree_map)
+    counts = conn_repo.count_connections(member_ids)
+    loader.prime_users(member_ids)
     first_degree: list[NetworkMemberResponse] = []
     first_degree_ids: set[str] = set()
 
@@ -114,46 +116,47 @@ def get_my_network(
         if other_id in first_degree_ids:
             continue
         first_degree_ids.add(other_id)
-        other = svc.get_by_id(other_id)
+        other = loader.user(other_id)
         if other:
-            other_conns = conn_repo.get_connections(other_id)
-            first_degree.append(NetworkMemberResponse(
-                user=_user_response(other, len(other_conns)),
-                degree=1,
-                connection_source=c.source.value,
-            ))
-
-    second_degree_map = conn_repo.get_second_degree(current_user.id)
+            first_degree.append(
+                NetworkMemberResponse(
+                    user=_user_response(other, counts[other_id]),
+                    degree=1,
+                    connection_source=c.source.value,
+                )
+            )
+
     second_degree: list[NetworkMemberResponse] = []
     for uid, shared in second_degree_map.items():
-        other = svc.get_by_id(uid)
+        other = loader.user(uid)
         if other:
-            other_conns = conn_repo.get_connections(uid)
-            second_degree.append(NetworkMemberResponse(
-                user=_user_response(other, len(other_conns)),
-                degree=2,
-                shared_connections=shared,
-            ))
-
-    pending = len(req_repo.get_incoming(current_user.id))
+            second_degree.append(
+                NetworkMemberResponse(
+                    user=_user_response(other, counts[uid]),
+                    degree=2,
+                    shared_connections=shared,
+                )
+            )
 
     return LayeredNetworkResponse(
         first_degree=first_degree,
         second_degree=second_degree,
-        pending_incoming=pending,
+        pending_incoming=req_repo.count_incoming(current_user.id),
+        next_cursor=next_cursor,
     )
 
 
-@router.get("", response_model=list[UserResponse])
+@router.get("", response_model=UserPageResponse)
 def list_users(
-    svc: UserService = Depends(get_user_service), conn_repo=Depends(get_connection_repo)
+    page: PageParams = Depends(get_page_params),
+    svc: UserService = Depends(get_user_service),
+    conn_repo=Depends(get_connection_repo),
 ):
-    users = svc.get_all()
-    result = []
-    for u in users:
-        conns = conn_repo.get_connections(u.id)
-        result.append(_user_response(u, len(conns)))
-    return result
+    users, next_cursor = split_page(svc.get_page(page.limit + 1, page.after), page)
+    counts = conn_repo.count_connections([u.id for u in users])
+    return UserPageResponse(
+        items=[_user_response(u, counts[u.id]) for u in users], next_cursor=next_cursor
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -161,12 +164,14 @@ def get_user(
     user_id: str,
     svc: UserService = Depends(get_user_service),
     conn_repo=Depends(get_connection_repo),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
+    if not_modified := conditional.check(f"user:{user_id}"):
+        return not_modified
     user = svc.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    conns = conn_repo.get_connections(user.id)
-    return _user_response(user, len(conns))
+    return _user_response(user, conn_repo.count_connections([user.id])[user.id])
 
 
 @router.post("", response_model=UserResponse, status_code=201)
@@ -186,18 +191,24 @@ def create_user(body: UserCreate, svc: UserService = Depends(get_user_service)):
 @router.get("/{user_id}/network", response_model=NetworkResponse)
 def get_network(
     user_id: str,
-    svc: UserService = Depends(get_user_service),
+    page: PageParams = Depends(get_page_params),
     conn_repo=Depends(get_connection_repo),
+    loader: ResponseLoader = Depends(get_loader),
+    conditional: ConditionalGet = Depends(get_conditional),
 ):
-    user = svc.get_by_id(user_id)
+    if not_modified := conditional.check(f"user:{user_id}"):
+        return not_modified
+    user = loader.user(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    conns = conn_repo.get_connections(user_id)
+    conns = conn_repo.get_connections_page(user_id, page.limit + 1, page.after)
+    conns, next_cursor = split_page(conns, page)
+    loader.prime_users(c.user_b if c.user_a == user_id else c.user_a for c in conns)
     connections = []
     for c in conns:
         other_id = c.user_b if c.user_a == user_id else c.user_a
-        other = svc.get_by_id(other_id)
+        other = loader.user(other_id)
         if other:
             connections.append(
                 ConnectionResponse(
@@ -210,6 +221,33 @@ def get_network(
             )
 
     return NetworkResponse(
-        user=_user_response(user, len(conns)),
+        user=_user_response(user, conn_repo.count_connections([user_id])[user_id]),
         connections=connections,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{user_id}/path/{other_id}", response_model=ConnectionPathResponse)
+def get_connection_path(
+    user_id: str,
+    other_id: str,
+    conn_repo=Depends(get_connection_repo),
+    loader: ResponseLoader = Depends(get_loader),
+):
+    """A shortest chain of connections between two members, searched from both ends."""
+    loader.prime_users([user_id, other_id])
+    if not loader.user(user_id) or not loader.user(other_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    path = conn_repo.shortest_path(
+        user_id, other_id, settings.path_max_depth, settings.path_max_visited
     )
+    if path is None:
+        raise HTTPException(status_code=404, detail="No connection path found")
+
+    loader.prime_users(path)
+    steps = []
+    for uid in path:
+        user = loader.user(uid)
+        steps.append(PathStepResponse(user_id=uid, name=user.name if user else ""))
+    return ConnectionPathResponse(degree=len(path) - 1, path=steps)
@@ -47,6 +47,11 @@ class UserResponse(BaseModel):
     connection_count: int = 0
 
 
+class UserPageResponse(BaseModel):
+    items: list[UserResponse]
+    next_cursor: str | None = None  # pass as `cursor` for the next page; None on the last
+
+
 # --- Opportunities ---
 
 class OpportunityCreate(BaseModel):
@@ -66,6 +71,11 @@ class OpportunityResponse(BaseModel):
     created_at: datetime
 
 
+class OpportunityPageResponse(BaseModel):
+    items: list[OpportunityResponse]
+    next_cursor: str | None = None
+
+
 class MatchResponse(BaseModel):
     id: str
     opportunity_id: str
@@ -79,6 +89,7 @@ class MatchResponse(BaseModel):
     explanation: str
     rank: int
     created_at: datetime
+    source: str = "ranked"  # "reverse": added by similarity at signup, `score` is unset (0)
 
 
 class OpportunityDetailResponse(BaseModel):
@@ -86,6 +97,24 @@ class OpportunityDetailResponse(BaseModel):
     matches: list[MatchResponse]
 
 
+class MatchCandidateResponse(BaseModel):
+    user_id: str
+    user_name: str = ""
+    embedding_score: float
+    network_score: float
+    combined_score: float
+    shared_connections: list[str] = []
+
+
+class MatchJobResponse(BaseModel):
+    job_id: str
+    opportunity_id: str
+    status: str
+    candidates: list[MatchCandidateResponse] = []
+    matches: list[MatchResponse] = []
+    error: str = ""
+
+
 # --- Network ---
 
 class ConnectionResponse(BaseModel):
@@ -106,12 +135,14 @@ class NetworkMemberResponse(BaseModel):
 class NetworkResponse(BaseModel):
     user: UserResponse
     connections: list[ConnectionResponse]
+    next_cursor: str | None = None
 
 
 class LayeredNetworkResponse(BaseModel):
     first_degree: list[NetworkMemberResponse]
-    second_degree: list[NetworkMemberResponse]
+    second_degree: list[NetworkMemberResponse]  # first page only
     pending_incoming: int = 0
+    next_cursor: str | None = None  # pages through first_degree
 
 
 class SearchResultResponse(BaseModel):
@@ -120,6 +151,16 @@ class SearchResultResponse(BaseModel):
     shared_connections: list[str] = []
 
 
+class PathStepResponse(BaseModel):
+    user_id: str
+    name: str
+
+
+class ConnectionPathResponse(BaseModel):
+    degree: int  # hops between the two members; 1 for a direct connection
+    path: list[PathStepResponse]  # from user_id to other_id, both included
+
+
 # --- Connection Requests ---
 
 class ConnectionRequestCreate(BaseModel):
@@ -141,6 +182,11 @@ class ConnectionRequestResponse(BaseModel):
     created_at: datetime
 
 
+class ConnectionRequestPageResponse(BaseModel):
+    items: list[ConnectionRequestResponse]
+    next_cursor: str | None = None
+
+
 # --- Feedback ---
 
 class FeedbackCreate(BaseModel):
@@ -170,3 +216,25 @@ class ExperienceResponse(BaseModel):
 
 class ExperiencesResponse(BaseModel):
     experiences: list[ExperienceResponse]
+
+
+# --- Admin ---
+
+class RematchRequest(BaseModel):
+    opportunity_ids: list[str] | None = None  # None re-matches every opportunity
+
+
+class DatabaseDiagnosticsResponse(BaseModel):
+    dialect: str
+    configured: dict[str, str | int]  # pragmas from settings
+    effective: dict[str, str | int]  # as read back from a pooled connection
+    pool: dict[str, str | int | float]
+
+
+class BatchMatchJobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    completed: int
+    matches_created: int
+    error: str = ""
@@ -8,10 +8,104 @@ _env_files = [f for f in (".env", "../.env") if os.path.isfile(f)]
 class Settings(BaseSettings):
     anthropic_api_key: str = ""
     database_url: str = "sqlite:///./data/serendip.db"
+    # SQLite pragmas set on every connection. WAL lets reads run alongside the one writer,
+    # and with it synchronous=normal only fsyncs at checkpoints (a power cut can lose the
+    # last commits, never corrupt the file). Writers wait busy_timeout for the lock.
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65_536
+    sqlite_mmap_size_mb: int = 256
+    sqlite_temp_store: str = "memory"
+    # Connection pool per process (file databases): at most size + max_overflow at once.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
     chroma_persist_dir: str = "./data/chroma"
+    # Query-embedding LRU; set a path (e.g. ./data/query_embeddings.db) to persist it.
+    embedding_cache_size: int = 2048
+    embedding_cache_path: str = ""
+    embedding_cache_disk_max_rows: int = 50_000  # least recently used rows are dropped past this
+
+    # Vector index: "chroma", or "numpy" for the in-process brute-force index in numpy_index_dir.
+    embedding_backend: str = "chroma"
+    numpy_index_dir: str = "./data/vectors"
+    numpy_index_dtype: str = "float32"  # float16 / int8 scan a quantized copy, rescored exactly
+    numpy_index_rescore_factor: int = 4
+    numpy_index_compact_ratio: float = 0.25
+
+    # In-memory CSR copy of the connections graph, filled on first use, updated on writes.
+    graph_cache_enabled: bool = True
+    graph_cache_poll_seconds: float = 1.0  # how stale writes from other processes may be
+    # Network score from personalized PageRank over connection strengths (needs the graph
+    # cache); higher alpha decays faster with distance. Off: fixed 1st/2nd-degree boosts.
+    proximity_index_enabled: bool = True
+    proximity_alpha: float = 0.3
+    proximity_epsilon: float = 1e-4
+    proximity_top_n: int = 200
+    proximity_warm_on_startup: bool = True  # compute every user's vector in the background
+    # "How are we connected": bidirectional BFS limits for /api/users/{id}/path/{other_id}.
+    path_max_depth: int = 6
+    path_max_visited: int = 200_000
+    # Keyset pagination of list endpoints (`limit` / `cursor` query parameters).
+    page_size_default: int = 50
+    page_size_max: int = 200
+    # People search: "lexical" (FTS5 only) or "hybrid" (FTS5 fused with profile vectors by
+    # reciprocal rank fusion). Hybrid falls back to lexical when the vector side misses
+    # the per-request budget.
+    search_default_mode: str = "lexical"
+    search_budget_ms: int = 300
+    search_hybrid_depth: int = 50  # candidates fetched from each side before fusion
+    search_rrf_k: int = 60
+    search_min_similarity: float = 0.3  # query/profile cosine similarity for vector hits
+    search_vector_workers: int = 4
+    # get_current_user's token -> user cache. Logouts and email changes in other processes
+    # are noticed within the poll interval (via the resource_versions "auth" stamp).
+    session_cache_enabled: bool = True
+    session_cache_size: int = 10_000
+    session_cache_ttl_seconds: int = 300
+    session_cache_poll_seconds: float = 1.0
+    # Session tokens: "db" (random ids in the sessions table) or "signed" (HMAC-signed,
+    # verified without a lookup; logouts go to a denylist). Signing keys are
+    # "kid:secret,..."; the first signs, the rest still verify, for rotation.
+    session_token_mode: str = "db"
+    session_signing_keys: str = ""
+    session_token_ttl_seconds: int = 30 * 24 * 3600
+    # Password hashing runs bcrypt in its own process pool, with at most max_pending hashes
+    # in flight (more get a 503). Hashes stored with another cost are redone at next login.
+    password_hash_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # LLM client: one pooled async client per process, shared by all requests.
+    llm_connect_timeout: float = 5.0
+    llm_read_timeout: float = 60.0
+    llm_max_connections: int = 20
+    llm_max_concurrency: int = 8
+
+    # Background match jobs (POST /api/opportunities?mode=job).
+    match_job_workers: int = 4
+    match_job_queue_size: int = 100
+    match_job_retention: int = 1000
+    # Reverse matching: new profiles are slotted into existing opportunities' top matches.
+    reverse_matching_enabled: bool = True
+    reverse_matching_top_k: int = 5  # matches kept per opportunity, as in Phase 1
+    reverse_matching_min_similarity: float = 0.4  # profile/opportunity cosine similarity
+
+    # Batch re-matching (POST /api/admin/rematch): concurrent Phase 2 rankings per batch.
+    match_batch_concurrency: int = 4
+    match_batch_max_opportunities: int = 1000
+
+    # Shared secret for /api/admin (sent as X-Admin-Token); the admin API is off when empty.
+    admin_token: str = ""
+
+    # Phase 2 ranking cache (SQLite-backed, keyed by opportunity + candidate fingerprints).
+    ranking_cache_enabled: bool = True
+    ranking_cache_ttl_seconds: int = 7 * 24 * 3600
+    ranking_cache_max_entries: int = 5000
+
     model_config = {"env_file": _env_files, "env_file_encoding": "utf-8"}
 
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from app.core.enums import ConnectionSource, OpportunityType
+from app.core.enums import ConnectionSource, MatchJobStatus, MatchSource, OpportunityType
 
 
 @dataclass
@@ -39,6 +39,7 @@ class Match:
     explanation: str
     rank: int
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    source: MatchSource = MatchSource.RANKED
 
 
 @dataclass
@@ -70,6 +71,7 @@ class RankedMatch:
     rank: int
     score: float
     explanation: str
+    is_fallback: bool = False  # produced without the LLM (e.g. the call failed)
 
 
 @dataclass
@@ -91,3 +93,36 @@ class ConnectionRequest:
     match_id: str = ""
     status: str = "pending"
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class MatchJob:
+    """Background match generation for one opportunity.
+
+    PARTIAL means Phase 1 candidates are available and Phase 2 is still running.
+    """
+
+    id: str
+    opportunity_id: str
+    status: MatchJobStatus = MatchJobStatus.PENDING
+    candidates: list[CandidateScore] = field(default_factory=list)
+    matches: list[Match] = field(default_factory=list)
+    error: str = ""
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+@dataclass
+class BatchMatchJob:
+    """Background re-matching of many opportunities.
+
+    PARTIAL means Phase 1 is done for every opportunity and Phase 2 is running;
+    `completed` counts the opportunities ranked so far.
+    """
+
+    id: str
+    opportunity_ids: list[str]
+    status: MatchJobStatus = MatchJobStatus.PENDING
+    completed: int = 0
+    matches_created: int = 0
+    error: str = ""
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
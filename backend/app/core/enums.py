@@ -23,3 +23,15 @@ class ConnectionSource(str, Enum):
     SEED = "seed"
     MATCH = "match"
     MANUAL = "manual"
+
+
+class MatchSource(str, Enum):
+    RANKED = "ranked"  # Phase 2: ranked and scored by the LLM
+    REVERSE = "reverse"  # slotted in by embedding similarity when the profile was created
+
+
+class MatchJobStatus(str, Enum):
+    PENDING = "pending"
+    PARTIAL = "partial"
+    DONE = "done"
+    FAILED = "failed"
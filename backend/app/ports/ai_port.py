@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from app.core.entities import CandidateScore, Opportunity, RankedMatch
 
@@ -15,3 +16,15 @@ class AIPort(ABC):
         rank them and produce a short explanation for each match.
         """
         ...
+
+    async def stream_rank_and_explain(
+        self,
+        opportunity: Opportunity,
+        candidates: list[CandidateScore],
+    ) -> AsyncIterator[RankedMatch]:
+        """
+        Same as rank_and_explain, but yields each match as soon as it is available.
+        Adapters that cannot stream fall back to yielding the full result at once.
+        """
+        for match in await self.rank_and_explain(opportunity, candidates):
+            yield match
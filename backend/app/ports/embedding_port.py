@@ -1,19 +1,54 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.enums import OpenToCategory
+
+
+def open_to_field(category: str) -> str:
+    """Metadata key holding whether a profile is open to the given category."""
+    return f"open_to_{category}"
+
+
+def open_to_metadata(open_to: list[str]) -> dict[str, bool]:
+    """One boolean field per category, so searches can filter on open_to in the index."""
+    return {open_to_field(c.value): c.value in open_to for c in OpenToCategory}
 
 
 class EmbeddingPort(ABC):
     @abstractmethod
-    def upsert_profile(self, user_id: str, text: str, metadata: dict) -> None:
-        """Embed and store a user profile."""
+    def upsert_profile(self, user_id: str, text: str, metadata: dict) -> list[float]:
+        """Embed and store a user profile; returns the stored vector."""
         ...
 
     @abstractmethod
-    def search_similar(self, query_text: str, n_results: int = 15) -> list[dict]:
+    def search_similar(
+        self,
+        query_text: str,
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[dict]:
         """
         Return the top-n most similar profiles to the query text.
+        `where` restricts the search to profiles whose metadata equals every given
+        key/value pair (e.g. {open_to_field("job"): True}).
         Each result: {"user_id": str, "score": float, "metadata": dict}
         """
         ...
 
+    @abstractmethod
+    def search_similar_batch(
+        self,
+        query_texts: list[str],
+        n_results: int = 15,
+        where: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """`search_similar` for many queries sharing one `where`, in a single index call."""
+        ...
+
     @abstractmethod
     def delete_profile(self, user_id: str) -> None: ...
+
+    @abstractmethod
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts with the same model used for profiles (memoized)."""
+        ...
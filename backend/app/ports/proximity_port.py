@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class ProximityPort(ABC):
+    @abstractmethod
+    def get_scores(self, user_id: str) -> dict[str, float]:
+        """
+        Network proximity of the users closest to `user_id`, scaled to (0, 1] with the
+        closest at 1. Users not in the mapping count as unrelated.
+        """
+        ...
+
+    @abstractmethod
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        """
+        (degree, names of shared connections) of each of `other_ids` within two hops of
+        `user_id`; the others are left out.
+        """
+        ...
@@ -1,51 +1,151 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional
 
-from app.core.entities import Connection, ConnectionRequest, Feedback, Match, Opportunity, User
+from app.core.entities import (
+    Connection,
+    ConnectionRequest,
+    Feedback,
+    Match,
+    Opportunity,
+    RankedMatch,
+    User,
+)
+
+# Keyset pagination position: the (created_at, id) of the last row of the previous page.
+PageKey = tuple[datetime, str]
 
 
 class UserRepository(ABC):
     @abstractmethod
     def get_all(self) -> list[User]: ...
 
+    @abstractmethod
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[User]:
+        """Up to `limit` users in get_all order (oldest first), starting after `after`."""
+        ...
+
     @abstractmethod
     def get_by_id(self, user_id: str) -> Optional[User]: ...
 
+    @abstractmethod
+    def get_by_ids(self, user_ids: list[str]) -> list[User]:
+        """Fetch many users in one round trip. Unknown ids are skipped; order is not preserved."""
+        ...
+
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]: ...
 
+    @abstractmethod
+    def search(self, query: str, limit: int) -> list[User]:
+        """Users matching every word of `query` as a prefix, best full-text match first."""
+        ...
+
     @abstractmethod
     def create(self, user: User) -> User: ...
 
+    @abstractmethod
+    def update_password_hash(self, user_id: str, password_hash: str) -> None: ...
+
 
 class OpportunityRepository(ABC):
     @abstractmethod
     def get_all(self) -> list[Opportunity]: ...
 
+    @abstractmethod
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[Opportunity]:
+        """Up to `limit` opportunities in get_all order (newest first), starting after `after`."""
+        ...
+
     @abstractmethod
     def get_by_id(self, opportunity_id: str) -> Optional[Opportunity]: ...
 
+    @abstractmethod
+    def get_by_ids(self, opportunity_ids: list[str]) -> list[Opportunity]:
+        """Fetch many opportunities in one round trip. Unknown ids are skipped."""
+        ...
+
     @abstractmethod
     def create(self, opportunity: Opportunity) -> Opportunity: ...
 
 
+class OpportunityEmbeddingRepository(ABC):
+    @abstractmethod
+    def upsert(self, opportunity: Opportunity, vector: list[float]) -> None: ...
+
+    @abstractmethod
+    def missing_ids(self, opportunity_ids: list[str]) -> list[str]:
+        """The given opportunities that have no stored embedding yet."""
+        ...
+
+    @abstractmethod
+    def score(self, vector: list[float], types: list[str]) -> dict[str, float]:
+        """Cosine similarity of `vector` to every stored opportunity of the given types."""
+        ...
+
+
 class MatchRepository(ABC):
     @abstractmethod
     def get_by_opportunity(self, opportunity_id: str) -> list[Match]: ...
 
+    @abstractmethod
+    def get_by_opportunities(self, opportunity_ids: list[str]) -> dict[str, list[Match]]:
+        """Stored matches of each opportunity, by rank; [] for those without any."""
+        ...
+
     @abstractmethod
     def create_batch(self, matches: list[Match]) -> list[Match]: ...
 
+    @abstractmethod
+    def update_batch(self, upserts: list[Match], removed_ids: list[str]) -> None:
+        """Insert or update `upserts` and delete `removed_ids` in one transaction."""
+        ...
+
+    @abstractmethod
+    def get_score_floors(self, opportunity_ids: list[str]) -> dict[str, tuple[int, float]]:
+        """Per opportunity with matches: (match count, lowest embedding + network score)."""
+        ...
+
+    @abstractmethod
+    def replace_for_opportunities(self, opportunity_ids: list[str], matches: list[Match]) -> None:
+        """Swap the stored matches of these opportunities for `matches` in one transaction."""
+        ...
+
 
 class ConnectionRepository(ABC):
     @abstractmethod
     def get_connections(self, user_id: str) -> list[Connection]: ...
 
+    @abstractmethod
+    def get_connections_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[Connection]:
+        """Up to `limit` of the user's connections, oldest first, starting after `after`."""
+        ...
+
     @abstractmethod
     def get_second_degree(self, user_id: str) -> dict[str, list[str]]:
         """Returns {user_id: [shared_connection_names]} for 2nd-degree connections."""
         ...
 
+    @abstractmethod
+    def count_connections(self, user_ids: list[str]) -> dict[str, int]:
+        """Number of connections of each user, 0 for users without any."""
+        ...
+
+    @abstractmethod
+    def relate(self, user_id: str, other_ids: list[str]) -> dict[str, tuple[int, list[str]]]:
+        """(degree, names of shared connections) of each of `other_ids` within two hops."""
+        ...
+
+    @abstractmethod
+    def shortest_path(
+        self, source_id: str, target_id: str, max_depth: int, max_visited: int
+    ) -> Optional[list[str]]:
+        """User ids along a shortest path of at most `max_depth` hops, both ends included;
+        None when there is none or more than `max_visited` users were reached first."""
+        ...
+
     @abstractmethod
     def create(self, connection: Connection) -> Connection: ...
 
@@ -55,15 +155,33 @@ class ConnectionRepository(ABC):
 
 class SessionRepository(ABC):
     @abstractmethod
-    def create(self, session_id: str, user_id: str) -> None: ...
+    def issue(self, user_id: str) -> str:
+        """Start a session for the user; returns its bearer token."""
+        ...
 
     @abstractmethod
     def get_user_id(self, session_id: str) -> Optional[str]: ...
 
+    def get_expiry(self, session_id: str) -> Optional[float]:
+        """Unix time at which the token stops resolving, or None if it does not expire."""
+        return None
+
     @abstractmethod
     def delete(self, session_id: str) -> None: ...
 
 
+class RevokedTokenRepository(ABC):
+    @abstractmethod
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        """Revoke a signed token, and drop revocations of tokens that have since expired."""
+        ...
+
+    @abstractmethod
+    def get_active(self, now: datetime) -> dict[str, datetime]:
+        """token_id -> expires_at for every revocation still in force."""
+        ...
+
+
 class FeedbackRepository(ABC):
     @abstractmethod
     def get_by_user(self, to_user_id: str) -> list[Feedback]: ...
@@ -85,9 +203,28 @@ class ConnectionRequestRepository(ABC):
     @abstractmethod
     def get_incoming(self, user_id: str) -> list[ConnectionRequest]: ...
 
+    @abstractmethod
+    def get_incoming_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[ConnectionRequest]:
+        """Up to `limit` pending incoming requests, newest first, starting after `after`."""
+        ...
+
+    @abstractmethod
+    def count_incoming(self, user_id: str) -> int:
+        """Number of pending incoming requests, counted in the database."""
+        ...
+
     @abstractmethod
     def get_outgoing(self, user_id: str) -> list[ConnectionRequest]: ...
 
+    @abstractmethod
+    def get_outgoing_page(
+        self, user_id: str, limit: int, after: Optional[PageKey] = None
+    ) -> list[ConnectionRequest]:
+        """Up to `limit` outgoing requests, newest first, starting after `after`."""
+        ...
+
     @abstractmethod
     def update_status(self, request_id: str, status: str) -> Optional[ConnectionRequest]: ...
 
@@ -102,3 +239,33 @@ class ConnectionRequestRepository(ABC):
 
     @abstractmethod
     def get_accepted_between(self, user_a_id: str, user_b_id: str) -> list[ConnectionRequest]: ...
+
+
+class ResourceVersionRepository(ABC):
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, tuple[int, datetime]]:
+        """(version, last change) per key, in one round trip. Keys never written are absent."""
+        ...
+
+    @abstractmethod
+    def get_version(self, key: str) -> int:
+        """The current version of one key; 0 if it was never written."""
+        ...
+
+
+class RankingCacheRepository(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[list[RankedMatch]]: ...
+
+    @abstractmethod
+    def put(self, key: str, user_ids: list[str], ranked: list[RankedMatch]) -> None:
+        """Store a Phase 2 result; `user_ids` are the candidates it was computed from."""
+        ...
+
+    @abstractmethod
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached ranking that includes this user. Returns entries removed."""
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from contextlib import AbstractContextManager
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
+from weakref import WeakValueDictionary
+
+from app.core.entities import BatchMatchJob, CandidateScore, Match, MatchJob, Opportunity, User
+from app.core.enums import MatchJobStatus
+from app.services.matching_service import MatchingService
+
+logger = logging.getLogger(__name__)
+
+MatchingServiceScope = Callable[[], AbstractContextManager[MatchingService]]
+AnyMatchJob = Union[MatchJob, BatchMatchJob]
+# ("candidates", list[CandidateScore]) or ("match", (Match, User)).
+StreamEvent = tuple[str, Union[list[CandidateScore], tuple[Match, User]]]
+
+
+class MatchJobQueueFull(Exception):
+    """Raised when the pending-job queue is at capacity."""
+
+
+class MatchJobService:
+    """In-process worker pool that runs Phase 1 and Phase 2 outside the request.
+
+    Jobs are queued on a bounded asyncio.Queue and picked up by a fixed number of
+    worker tasks. Each job opens its own MatchingService through `scope`, since the
+    request's DB session is closed once the 202 response is sent. Job state lives in
+    memory and is only visible to the worker process that accepted the job.
+
+    Single-opportunity jobs and match streams hold a per-opportunity lock while they
+    rank, and replay the stored matches if another run stored some first, so the same
+    opportunity is never ranked, or its matches inserted, twice at once.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retention: int, batch_concurrency: int = 4):
+        self._worker_count = workers
+        self._retention = retention
+        self._batch_concurrency = batch_concurrency
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._jobs: OrderedDict[str, AnyMatchJob] = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+        self._streams: set[asyncio.Task] = set()
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"match-job-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+
+    async def stop(self) -> None:
+        tasks = self._workers + list(self._streams)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    def submit(
+        self, opportunity: Opportunity, scope: MatchingServiceScope, top_k: int = 5
+    ) -> MatchJob:
+        job = MatchJob(id=str(uuid.uuid4()), opportunity_id=opportunity.id)
+        self._enqueue(job, lambda: self._run(job, opportunity, scope, top_k))
+        return job
+
+    def submit_batch(
+        self, opportunities: list[Opportunity], scope: MatchingServiceScope, top_k: int = 5
+    ) -> BatchMatchJob:
+        """Queue a re-match of many opportunities; it occupies one worker until done."""
+        job = BatchMatchJob(id=str(uuid.uuid4()), opportunity_ids=[o.id for o in opportunities])
+        self._enqueue(job, lambda: self._run_batch(job, opportunities, scope, top_k))
+        return job
+
+    def get(self, job_id: str) -> Optional[AnyMatchJob]:
+        return self._jobs.get(job_id)
+
+    def stream(
+        self, opportunity: Opportunity, scope: MatchingServiceScope, top_k: int = 5
+    ) -> AsyncIterator[StreamEvent]:
+        """Phase 1 candidates, then each match as it is ranked; stored matches if any.
+
+        The ranking runs in a task of its own with its own MatchingService, so a client
+        that disconnects mid-stream does not throw away a ranking already paid for: the
+        task runs on and stores the matches for the next request to replay.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._run_stream(opportunity, scope, top_k, events))
+        self._streams.add(task)
+        task.add_done_callback(self._streams.discard)
+        return self._drain(events)
+
+    def _lock(self, opportunity_id: str) -> asyncio.Lock:
+        lock = self._locks.get(opportunity_id)
+        if lock is None:
+            lock = self._locks[opportunity_id] = asyncio.Lock()
+        return lock
+
+    async def _run_stream(
+        self,
+        opportunity: Opportunity,
+        scope: MatchingServiceScope,
+        top_k: int,
+        events: asyncio.Queue,
+    ) -> None:
+        try:
+            async with self._lock(opportunity.id):
+                with scope() as svc:
+                    stored = await asyncio.to_thread(svc.get_matches, opportunity.id)
+                    if stored:
+                        users = await asyncio.to_thread(svc.get_users, [m.user_id for m in stored])
+                        by_id = {u.id: u for u in users}
+                        for match in stored:
+                            if match.user_id in by_id:
+                                events.put_nowait(("match", (match, by_id[match.user_id])))
+                        return
+                    candidates = await asyncio.to_thread(
+                        svc.retrieve_candidates, opportunity, top_k
+                    )
+                    events.put_nowait(("candidates", candidates))
+                    if not candidates:
+                        return
+                    users = {c.user.id: c.user for c in candidates}
+                    async for match in svc.stream_rank_candidates(opportunity, candidates):
+                        events.put_nowait(("match", (match, users[match.user_id])))
+        except Exception as e:
+            logger.exception("Match stream for %s failed", opportunity.id)
+            events.put_nowait(("error", e))
+        finally:
+            events.put_nowait(None)
+
+    @staticmethod
+    async def _drain(events: asyncio.Queue) -> AsyncIterator[StreamEvent]:
+        while (event := await events.get()) is not None:
+            if event[0] == "error":
+                raise event[1]
+            yield event
+
+    def _enqueue(self, job: AnyMatchJob, run: Callable[[], Awaitable[None]]) -> None:
+        try:
+            self._queue.put_nowait((job, run))
+        except asyncio.QueueFull:
+            raise MatchJobQueueFull()
+        self._jobs[job.id] = job
+        self._evict_finished()
+
+    async def _worker(self) -> None:
+        while True:
+            job, run = await self._queue.get()
+            try:
+                await run()
+            except Exception as e:
+                logger.exception("Match job %s failed", job.id)
+                job.status = MatchJobStatus.FAILED
+                job.error = str(e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(
+        self, job: MatchJob, opportunity: Opportunity, scope: MatchingServiceScope, top_k: int
+    ) -> None:
+        async with self._lock(opportunity.id):
+            with scope() as svc:
+                stored = await asyncio.to_thread(svc.get_matches, opportunity.id)
+                if stored:  # a match stream got there first
+                    job.matches = stored
+                    job.status = MatchJobStatus.DONE
+                    return
+                # Phase 1 is synchronous (vector search + SQLite); keep it off the event loop.
+                candidates = await asyncio.to_thread(svc.retrieve_candidates, opportunity, top_k)
+                job.candidates = candidates
+                if not candidates:
+                    job.status = MatchJobStatus.DONE
+                    return
+                job.status = MatchJobStatus.PARTIAL
+                job.matches = await svc.rank_candidates(opportunity, candidates)
+                job.status = MatchJobStatus.DONE
+
+    async def _run_batch(
+        self,
+        job: BatchMatchJob,
+        opportunities: list[Opportunity],
+        scope: MatchingServiceScope,
+        top_k: int,
+    ) -> None:
+        def progress(completed: int, matches: list) -> None:
+            job.completed = completed
+            job.matches_created += len(matches)
+
+        with scope() as svc:
+            # Phase 1 for the whole batch is synchronous; keep it off the event loop.
+            candidates = await asyncio.to_thread(
+                svc.retrieve_candidates_batch, opportunities, top_k
+            )
+            job.status = MatchJobStatus.PARTIAL
+            await svc.find_matches_batch(
+                opportunities,
+                top_k,
+                concurrency=self._batch_concurrency,
+                on_progress=progress,
+                candidates=candidates,
+            )
+            job.status = MatchJobStatus.DONE
+
+    def _evict_finished(self) -> None:
+        finished = (MatchJobStatus.DONE, MatchJobStatus.FAILED)
+        excess = len(self._jobs) - self._retention
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.status in finished][:excess]:
+            del self._jobs[job_id]
@@ -1,17 +1,58 @@
+import asyncio
+import hashlib
+import json
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
 
-from app.core.entities import CandidateScore, Match, Opportunity, User
+from app.core.entities import CandidateScore, Match, Opportunity, RankedMatch, User
 from app.ports.ai_port import AIPort
-from app.ports.embedding_port import EmbeddingPort
+from app.ports.embedding_port import EmbeddingPort, open_to_field
+from app.ports.proximity_port import ProximityPort
 from app.ports.repositories import (
     ConnectionRepository,
     MatchRepository,
+    RankingCacheRepository,
     UserRepository,
 )
 
 FIRST_DEGREE_BOOST = 0.15
 SECOND_DEGREE_BOOST = 0.08
+# With a proximity index, the network score is proximity (0..1) times this.
+MAX_PROXIMITY_BOOST = FIRST_DEGREE_BOOST
+
+# (first-degree ids, second-degree {id: shared names}, proximity scores or None)
+Network = tuple[set[str], dict[str, list[str]], Optional[dict[str, float]]]
+
+
+def _profile_hash(user: User) -> str:
+    content = [user.name, user.bio, user.skills, user.interests, user.open_to]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def ranking_fingerprint(opportunity: Opportunity, candidates: list[CandidateScore]) -> str:
+    """Cache key for a Phase 2 result: everything that goes into the ranking prompt.
+
+    Any change to the opportunity text, a candidate's profile or their network position
+    yields a different key, so stale rankings are never served.
+    """
+    h = hashlib.sha256()
+    h.update(
+        json.dumps([opportunity.title, opportunity.description, opportunity.type.value]).encode()
+    )
+    for c in candidates:
+        h.update(
+            json.dumps(
+                [c.user.id, _profile_hash(c.user), round(c.network_score, 6), c.shared_connections]
+            ).encode()
+        )
+    return h.hexdigest()
+
+
+def opportunity_query_text(opportunity: Opportunity) -> str:
+    """Text embedded for an opportunity, both for Phase 1 search and reverse matching."""
+    return f"{opportunity.title}. {opportunity.description}"
 
 
 class MatchingService:
@@ -22,56 +63,200 @@ class MatchingService:
         connection_repo: ConnectionRepository,
         embedding: EmbeddingPort,
         ai: AIPort,
+        ranking_cache: Optional[RankingCacheRepository] = None,
+        proximity: Optional[ProximityPort] = None,
     ):
         self._user_repo = user_repo
         self._match_repo = match_repo
         self._connection_repo = connection_repo
         self._embedding = embedding
         self._ai = ai
+        self._ranking_cache = ranking_cache
+        self._proximity = proximity
 
     async def find_matches(self, opportunity: Opportunity, top_k: int = 5) -> list[Match]:
-        candidates = self._phase1_retrieval(opportunity, top_k)
+        candidates = self.retrieve_candidates(opportunity, top_k)
         if not candidates:
             return []
+        return await self.rank_candidates(opportunity, candidates)
+
+    def retrieve_candidates(self, opportunity: Opportunity, top_k: int = 5) -> list[CandidateScore]:
+        """Phase 1 only: vector search plus network boost, no LLM call."""
+        return self._phase1_retrieval(opportunity, top_k)
+
+    async def rank_candidates(
+        self, opportunity: Opportunity, candidates: list[CandidateScore]
+    ) -> list[Match]:
+        """Phase 2: rank and explain Phase 1 candidates, then persist the matches."""
+        matches = await self._rank(opportunity, candidates)
+        self._match_repo.create_batch(matches)
+        return matches
+
+    async def find_matches_batch(
+        self,
+        opportunities: list[Opportunity],
+        top_k: int = 5,
+        concurrency: int = 4,
+        on_progress: Optional[Callable[[int, list[Match]], None]] = None,
+        candidates: Optional[dict[str, list[CandidateScore]]] = None,
+    ) -> dict[str, list[Match]]:
+        """Re-match many opportunities, replacing their stored matches in one transaction.
+        Opportunities that get no new matches keep the ones they had.
+
+        Phase 1 runs as one vector query per opportunity type and loads each poster's
+        network once (pass `candidates` if it was already run via
+        retrieve_candidates_batch); Phase 2 runs at most `concurrency` rankings at a time.
+        `on_progress(completed, matches)` is called as each opportunity is ranked.
+        """
+        if candidates is None:
+            candidates = self.retrieve_candidates_batch(opportunities, top_k)
+        semaphore = asyncio.Semaphore(concurrency)
+        completed = 0
+
+        async def rank(opportunity: Opportunity) -> list[Match]:
+            nonlocal completed
+            matches: list[Match] = []
+            if candidates[opportunity.id]:
+                async with semaphore:
+                    matches = await self._rank(opportunity, candidates[opportunity.id])
+            completed += 1
+            if on_progress:
+                on_progress(completed, matches)
+            return matches
+
+        results = await asyncio.gather(*(rank(o) for o in opportunities))
+        ranked = [(o, matches) for o, matches in zip(opportunities, results) if matches]
+        if ranked:
+            self._match_repo.replace_for_opportunities(
+                [o.id for o, _ in ranked], [m for _, matches in ranked for m in matches]
+            )
+        return {o.id: matches for o, matches in zip(opportunities, results)}
+
+    def retrieve_candidates_batch(
+        self, opportunities: list[Opportunity], top_k: int = 5
+    ) -> dict[str, list[CandidateScore]]:
+        """Phase 1 for many opportunities, keyed by opportunity id."""
+        by_type: dict[str, list[Opportunity]] = defaultdict(list)
+        for o in opportunities:
+            by_type[o.type.value].append(o)
 
+        raw_results: dict[str, list[dict]] = {}
+        for opp_type, group in by_type.items():
+            hits = self._embedding.search_similar_batch(
+                [opportunity_query_text(o) for o in group],
+                n_results=top_k + 1,
+                where={open_to_field(opp_type): True},
+            )
+            raw_results.update((o.id, h) for o, h in zip(group, hits))
+
+        hits_by_poster: dict[str, set[str]] = defaultdict(set)
+        for o in opportunities:
+            hits_by_poster[o.posted_by].update(
+                r["user_id"] for r in raw_results[o.id] if r["user_id"] != o.posted_by
+            )
+        networks = {p: self._network(p, list(ids)) for p, ids in hits_by_poster.items()}
+        hit_ids = set().union(*hits_by_poster.values())
+        users = {u.id: u for u in self._user_repo.get_by_ids(list(hit_ids))}
+        return {
+            o.id: self._score_candidates(o, raw_results[o.id], networks[o.posted_by], users, top_k)
+            for o in opportunities
+        }
+
+    async def _rank(
+        self, opportunity: Opportunity, candidates: list[CandidateScore]
+    ) -> list[Match]:
         ranked = await self._phase2_explain(opportunity, candidates)
+        by_user = {c.user.id: c for c in candidates}
+        return [
+            self._to_match(opportunity, r, by_user[r.user_id])
+            for r in ranked
+            if r.user_id in by_user
+        ]
 
+    async def stream_rank_candidates(
+        self, opportunity: Opportunity, candidates: list[CandidateScore]
+    ) -> AsyncIterator[Match]:
+        """Phase 2, yielding each match as the model produces it; persisted once complete."""
+        by_user = {c.user.id: c for c in candidates}
+        cached = self._cached_ranking(opportunity, candidates)
+        ranked: list[RankedMatch] = []
         matches = []
-        for r in ranked:
-            candidate = next((c for c in candidates if c.user.id == r.user_id), None)
+
+        async def source():
+            if cached is not None:
+                for r in cached:
+                    yield r
+                return
+            async for r in self._ai.stream_rank_and_explain(opportunity, candidates):
+                ranked.append(r)
+                yield r
+
+        async for r in source():
+            candidate = by_user.get(r.user_id)
             if not candidate:
                 continue
-            matches.append(
-                Match(
-                    id=str(uuid.uuid4()),
-                    opportunity_id=opportunity.id,
-                    user_id=r.user_id,
-                    score=r.score,
-                    embedding_score=candidate.embedding_score,
-                    network_score=candidate.network_score,
-                    explanation=r.explanation,
-                    rank=r.rank,
-                    created_at=datetime.now(timezone.utc),
-                )
-            )
+            match = self._to_match(opportunity, r, candidate)
+            matches.append(match)
+            yield match
 
+        if cached is None:
+            self._store_ranking(opportunity, candidates, ranked)
         self._match_repo.create_batch(matches)
-        return matches
+
+    @staticmethod
+    def _to_match(
+        opportunity: Opportunity, ranked: RankedMatch, candidate: CandidateScore
+    ) -> Match:
+        return Match(
+            id=str(uuid.uuid4()),
+            opportunity_id=opportunity.id,
+            user_id=ranked.user_id,
+            score=ranked.score,
+            embedding_score=candidate.embedding_score,
+            network_score=candidate.network_score,
+            explanation=ranked.explanation,
+            rank=ranked.rank,
+            created_at=datetime.now(timezone.utc),
+        )
 
     def _phase1_retrieval(self, opportunity: Opportunity, top_k: int) -> list[CandidateScore]:
-        query_text = f"{opportunity.title}. {opportunity.description}"
-        raw_results = self._embedding.search_similar(query_text, n_results=top_k * 3)
+        # The index only returns people open to this type; one extra slot covers the poster.
+        raw_results = self._embedding.search_similar(
+            opportunity_query_text(opportunity),
+            n_results=top_k + 1,
+            where={open_to_field(opportunity.type.value): True},
+        )
+        hit_ids = [r["user_id"] for r in raw_results if r["user_id"] != opportunity.posted_by]
+        network = self._network(opportunity.posted_by, hit_ids)
+        users = {u.id: u for u in self._user_repo.get_by_ids(hit_ids)}
+        return self._score_candidates(opportunity, raw_results, network, users, top_k)
 
-        first_degree_ids = set()
-        connections = self._connection_repo.get_connections(opportunity.posted_by)
-        for c in connections:
-            other = c.user_b if c.user_a == opportunity.posted_by else c.user_a
-            first_degree_ids.add(other)
+    def _network(self, user_id: str, candidate_ids: list[str]) -> Network:
+        """The user's neighbourhood; degrees label candidates, proximity (if any) scores them.
 
-        second_degree = self._connection_repo.get_second_degree(opportunity.posted_by)
+        With a proximity index only the candidates are related to the user, from the
+        in-memory graph, instead of walking the whole 2nd-degree network.
+        """
+        if self._proximity:
+            related = self._proximity.relate(user_id, candidate_ids)
+            first_degree_ids = {uid for uid, (degree, _) in related.items() if degree == 1}
+            second_degree = {uid: names for uid, (degree, names) in related.items() if degree == 2}
+            return first_degree_ids, second_degree, self._proximity.get_scores(user_id)
+        first_degree_ids = set()
+        for c in self._connection_repo.get_connections(user_id):
+            first_degree_ids.add(c.user_b if c.user_a == user_id else c.user_a)
+        return first_degree_ids, self._connection_repo.get_second_degree(user_id), None
 
+    @staticmethod
+    def _score_candidates(
+        opportunity: Opportunity,
+        raw_results: list[dict],
+        network: Network,
+        users: dict[str, User],
+        top_k: int,
+    ) -> list[CandidateScore]:
+        first_degree_ids, second_degree, proximity = network
         opp_type = opportunity.type.value
-        users_cache: dict[str, User] = {}
 
         candidates: list[CandidateScore] = []
         for result in raw_results:
@@ -79,10 +264,9 @@ class MatchingService:
             if uid == opportunity.posted_by:
                 continue
 
-            user = self._user_repo.get_by_id(uid)
+            user = users.get(uid)
             if not user:
                 continue
-            users_cache[uid] = user
 
             if opp_type not in user.open_to:
                 continue
@@ -93,16 +277,12 @@ class MatchingService:
             shared_connections: list[str] = []
             if uid in first_degree_ids:
                 network_score = FIRST_DEGREE_BOOST
-                for conn in connections:
-                    other = conn.user_b if conn.user_a == opportunity.posted_by else conn.user_a
-                    if other == uid:
-                        poster = self._user_repo.get_by_id(opportunity.posted_by)
-                        if poster:
-                            shared_connections.append("Direct connection")
-                        break
+                shared_connections.append("Direct connection")
             elif uid in second_degree:
                 network_score = SECOND_DEGREE_BOOST
                 shared_connections = second_degree[uid]
+            if proximity is not None:
+                network_score = MAX_PROXIMITY_BOOST * proximity.get(uid, 0.0)
 
             combined = embedding_score + network_score
 
@@ -120,7 +300,34 @@ class MatchingService:
         return candidates[:top_k]
 
     async def _phase2_explain(self, opportunity: Opportunity, candidates: list[CandidateScore]):
-        return await self._ai.rank_and_explain(opportunity, candidates)
+        cached = self._cached_ranking(opportunity, candidates)
+        if cached is not None:
+            return cached
+        ranked = await self._ai.rank_and_explain(opportunity, candidates)
+        self._store_ranking(opportunity, candidates, ranked)
+        return ranked
+
+    def _cached_ranking(
+        self, opportunity: Opportunity, candidates: list[CandidateScore]
+    ) -> Optional[list[RankedMatch]]:
+        if not self._ranking_cache:
+            return None
+        return self._ranking_cache.get(ranking_fingerprint(opportunity, candidates))
+
+    def _store_ranking(
+        self, opportunity: Opportunity, candidates: list[CandidateScore], ranked: list[RankedMatch]
+    ) -> None:
+        # Fallback rankings are not cached, so a transient LLM failure is retried next time.
+        if not self._ranking_cache or not ranked or any(r.is_fallback for r in ranked):
+            return
+        self._ranking_cache.put(
+            ranking_fingerprint(opportunity, candidates),
+            [c.user.id for c in candidates],
+            ranked,
+        )
 
     def get_matches(self, opportunity_id: str) -> list[Match]:
         return self._match_repo.get_by_opportunity(opportunity_id)
+
+    def get_users(self, user_ids: list[str]) -> list[User]:
+        return self._user_repo.get_by_ids(user_ids)
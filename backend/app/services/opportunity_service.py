@@ -1,16 +1,47 @@
+from typing import Optional
+
 from app.core.entities import Opportunity
-from app.ports.repositories import OpportunityRepository
+from app.ports.embedding_port import EmbeddingPort
+from app.ports.repositories import (
+    OpportunityEmbeddingRepository,
+    OpportunityRepository,
+    PageKey,
+)
+from app.services.matching_service import opportunity_query_text
 
 
 class OpportunityService:
-    def __init__(self, repo: OpportunityRepository):
+    def __init__(
+        self,
+        repo: OpportunityRepository,
+        embedding: Optional[EmbeddingPort] = None,
+        opportunity_embeddings: Optional[OpportunityEmbeddingRepository] = None,
+    ):
         self._repo = repo
+        self._embedding = embedding
+        self._opportunity_embeddings = opportunity_embeddings
 
     def get_all(self) -> list[Opportunity]:
         return self._repo.get_all()
 
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[Opportunity]:
+        return self._repo.get_page(limit, after)
+
     def get_by_id(self, opportunity_id: str) -> Opportunity | None:
         return self._repo.get_by_id(opportunity_id)
 
+    def get_by_ids(self, opportunity_ids: list[str]) -> list[Opportunity]:
+        return self._repo.get_by_ids(opportunity_ids)
+
     def create(self, opportunity: Opportunity) -> Opportunity:
-        return self._repo.create(opportunity)
+        created = self._repo.create(opportunity)
+        self.store_embeddings([created])
+        return created
+
+    def store_embeddings(self, opportunities: list[Opportunity]) -> None:
+        """Persist opportunity vectors so new profiles can be reverse-matched against them."""
+        if not self._embedding or not self._opportunity_embeddings or not opportunities:
+            return
+        vectors = self._embedding.embed_texts([opportunity_query_text(o) for o in opportunities])
+        for opportunity, vector in zip(opportunities, vectors):
+            self._opportunity_embeddings.upsert(opportunity, vector)
@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timezone
+
+from app.core.entities import Match, User
+from app.core.enums import MatchSource
+from app.ports.repositories import MatchRepository, OpportunityEmbeddingRepository
+
+
+def _explanation(similarity: float) -> str:
+    return (
+        "Joined after this opportunity was matched. Added for an embedding similarity of "
+        f"{similarity:.2f} between their profile and the opportunity; not ranked by the AI."
+    )
+
+
+class ReverseMatchingService:
+    """Slots a new profile into the stored matches of existing opportunities.
+
+    The profile vector is scored against every stored opportunity embedding it is open
+    to in one pass. Where it beats the weakest of an opportunity's `top_k` matches on the
+    Phase 1 score (embedding + network), it replaces that match, so the newcomer shows
+    up without re-running Phase 1 or the LLM. A new profile has no connections yet, so
+    its Phase 1 score is the embedding similarity alone, and it must reach
+    `min_similarity` even where slots are free.
+
+    Reverse matches have no LLM score: they are stored with `source=reverse` and
+    `score=0`, and ranked after the LLM-ranked matches, by similarity among themselves.
+    """
+
+    def __init__(
+        self,
+        opportunity_embeddings: OpportunityEmbeddingRepository,
+        match_repo: MatchRepository,
+        top_k: int = 5,
+        min_similarity: float = 0.4,
+    ):
+        self._opportunity_embeddings = opportunity_embeddings
+        self._match_repo = match_repo
+        self._top_k = top_k
+        self._min_similarity = min_similarity
+
+    def match_profile(self, user: User, vector: list[float]) -> list[Match]:
+        """Insert `user` where they make an opportunity's top_k. Returns the new matches."""
+        if not user.open_to:
+            return []
+        scores = {
+            opportunity_id: min(1.0, similarity)
+            for opportunity_id, similarity in self._opportunity_embeddings.score(
+                vector, user.open_to
+            ).items()
+            if similarity >= self._min_similarity
+        }
+        if not scores:
+            return []
+        floors = self._match_repo.get_score_floors(list(scores))
+
+        winners = {}
+        for opportunity_id, similarity in scores.items():
+            count, floor = floors.get(opportunity_id, (0, 0.0))
+            if count < self._top_k or similarity > floor:
+                winners[opportunity_id] = similarity
+        if not winners:
+            return []
+
+        current_matches = self._match_repo.get_by_opportunities(list(winners))
+        added: list[Match] = []
+        updated: list[Match] = []
+        removed: list[str] = []
+        for opportunity_id, similarity in winners.items():
+            current = current_matches[opportunity_id]
+            if any(m.user_id == user.id for m in current):
+                continue
+            if len(current) >= self._top_k:
+                weakest = min(current, key=lambda m: m.embedding_score + m.network_score)
+                current.remove(weakest)
+                removed.append(weakest.id)
+            match = Match(
+                id=str(uuid.uuid4()),
+                opportunity_id=opportunity_id,
+                user_id=user.id,
+                score=0.0,
+                embedding_score=similarity,
+                network_score=0.0,
+                explanation=_explanation(similarity),
+                rank=0,
+                created_at=datetime.now(timezone.utc),
+                source=MatchSource.REVERSE,
+            )
+            ranked = [m for m in current if m.source == MatchSource.RANKED]
+            reverse = sorted(
+                [m for m in current if m.source == MatchSource.REVERSE] + [match],
+                key=lambda m: -m.embedding_score,
+            )
+            for rank, m in enumerate(ranked + reverse, start=1):
+                m.rank = rank
+            added.append(match)
+            updated.extend(ranked + reverse)
+
+        if added:
+            self._match_repo.update_batch(updated, removed)
+        return added
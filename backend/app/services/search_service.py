@@ -0,0 +1,103 @@
+import logging
+import time
+from concurrent.futures import Executor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.entities import User
+from app.ports.embedding_port import EmbeddingPort
+from app.ports.repositories import UserRepository
+
+logger = logging.getLogger(__name__)
+
+LEXICAL = "lexical"
+HYBRID = "hybrid"
+
+
+@dataclass
+class SearchOutcome:
+    users: list[User]
+    mode: str  # the mode that produced the results; "lexical" when hybrid fell back
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int) -> list[str]:
+    """Ids ordered by sum(1 / (k + rank)) over every ranking they appear in (rank from 1).
+
+    Ties keep the order in which ids were first seen, so the first ranking wins them."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking, start=1):
+            scores[id_] = scores.get(id_, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda id_: -scores[id_])
+
+
+class SearchService:
+    """People search: the FTS index alone, or fused with nearest profile vectors.
+
+    In hybrid mode the vector query runs on `executor` while the lexical query runs on
+    the calling thread (it shares the request's DB session). Both fetch `depth`
+    candidates and are merged with reciprocal rank fusion. Vector hits below
+    `min_similarity` are dropped before fusion: nearest neighbours always exist, so
+    without a floor a query nobody matches would still fill the page. The whole search
+    gets `budget_seconds`; if the vector side has not answered by then, or fails, the
+    lexical ranking is returned on its own.
+    """
+
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        embedding: EmbeddingPort,
+        executor: Executor,
+        budget_seconds: float,
+        depth: int = 50,
+        rrf_k: int = 60,
+        min_similarity: float = 0.3,
+    ):
+        self._repo = user_repo
+        self._embedding = embedding
+        self._executor = executor
+        self._budget = budget_seconds
+        self._depth = depth
+        self._rrf_k = rrf_k
+        self._min_similarity = min_similarity
+
+    def search(
+        self, query: str, limit: int, mode: str = LEXICAL, exclude_id: Optional[str] = None
+    ) -> SearchOutcome:
+        """Up to `limit` users best matching `query`, leaving out `exclude_id`."""
+        if mode != HYBRID:
+            users = self._repo.search(query, limit + 1)
+            return SearchOutcome(_without(users, exclude_id)[:limit], LEXICAL)
+
+        deadline = time.monotonic() + self._budget
+        depth = max(self._depth, limit + 1)
+        vector = self._executor.submit(self._embedding.search_similar, query, depth)
+        lexical = _without(self._repo.search(query, depth), exclude_id)
+        try:
+            hits = vector.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            vector.cancel()
+            logger.warning("Vector search exceeded the %.0f ms budget", self._budget * 1000)
+            return SearchOutcome(lexical[:limit], LEXICAL)
+        except Exception as e:
+            logger.error("Vector search failed: %s", e)
+            return SearchOutcome(lexical[:limit], LEXICAL)
+
+        semantic = [
+            h["user_id"]
+            for h in hits
+            if h["user_id"] != exclude_id and h["score"] >= self._min_similarity
+        ]
+        fused = reciprocal_rank_fusion([[u.id for u in lexical], semantic], self._rrf_k)
+        # Lexical hits are already loaded; fetch only the vector-only users on the page.
+        by_id = {u.id: u for u in lexical}
+        page_ids = fused[:limit]
+        by_id.update(
+            (u.id, u) for u in self._repo.get_by_ids([i for i in page_ids if i not in by_id])
+        )
+        return SearchOutcome([by_id[i] for i in page_ids if i in by_id], HYBRID)
+
+
+def _without(users: list[User], user_id: Optional[str]) -> list[User]:
+    return [u for u in users if u.id != user_id]
@@ -1,31 +1,66 @@
+from typing import Callable, Optional
+
 from app.core.entities import User
-from app.ports.embedding_port import EmbeddingPort
-from app.ports.repositories import UserRepository
+from app.ports.embedding_port import EmbeddingPort, open_to_metadata
+from app.ports.repositories import PageKey, RankingCacheRepository, UserRepository
+from app.services.reverse_matching_service import ReverseMatchingService
 
 
 class UserService:
-    def __init__(self, user_repo: UserRepository, embedding: EmbeddingPort):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        embedding: EmbeddingPort,
+        ranking_cache: Optional[RankingCacheRepository] = None,
+        reverse_matching: Optional[ReverseMatchingService] = None,
+        evict_sessions: Optional[Callable[[str], None]] = None,
+    ):
         self._repo = user_repo
         self._embedding = embedding
+        self._ranking_cache = ranking_cache
+        self._reverse_matching = reverse_matching
+        self._evict_sessions = evict_sessions  # drops cached logins of a user id
 
     def get_all(self) -> list[User]:
         return self._repo.get_all()
 
+    def get_page(self, limit: int, after: Optional[PageKey] = None) -> list[User]:
+        return self._repo.get_page(limit, after)
+
     def get_by_id(self, user_id: str) -> User | None:
         return self._repo.get_by_id(user_id)
 
+    def get_by_email(self, email: str) -> User | None:
+        return self._repo.get_by_email(email)
+
+    def rehash_password(self, user_id: str, password_hash: str) -> None:
+        """Store a new hash of the same password, e.g. at a different bcrypt cost."""
+        self._repo.update_password_hash(user_id, password_hash)
+
     def create(self, user: User) -> User:
         created = self._repo.create(user)
-        self._sync_embedding(created)
+        vector = self._on_profile_changed(created)
+        if self._reverse_matching:
+            self._reverse_matching.match_profile(created, vector)
         return created
 
-    def _sync_embedding(self, user: User) -> None:
+    def _on_profile_changed(self, user: User) -> list[float]:
+        """Keep derived state in step with a profile write; returns the profile's vector."""
+        vector = self._sync_embedding(user)
+        if self._ranking_cache:
+            self._ranking_cache.invalidate_user(user.id)
+        if self._evict_sessions:
+            self._evict_sessions(user.id)
+        return vector
+
+    def _sync_embedding(self, user: User) -> list[float]:
         text = self._build_embedding_text(user)
         metadata = {
             "name": user.name,
             "open_to": ",".join(user.open_to),
+            **open_to_metadata(user.open_to),
         }
-        self._embedding.upsert_profile(user.id, text, metadata)
+        return self._embedding.upsert_profile(user.id, text, metadata)
 
     @staticmethod
     def _build_embedding_text(user: User) -> str:
@@ -0,0 +1,47 @@
+"""Backfill script: brings stored profile embeddings up to date with the current metadata schema."""
+
+from app.adapters.embeddings.chroma_adapter import ChromaEmbeddingAdapter
+from app.adapters.persistence.database import SessionLocal, engine
+from app.adapters.persistence.migrations import migrate
+from app.adapters.persistence.opportunity_embedding_repo import SqlOpportunityEmbeddingRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.api.dependencies import get_embedding
+from app.config import settings
+from app.services.opportunity_service import OpportunityService
+
+
+def backfill():
+    chroma = ChromaEmbeddingAdapter()
+
+    print("Adding open_to flags to stored profiles...")
+    updated = chroma.backfill_open_to_fields()
+    print(f"Updated {updated} profiles.")
+
+    print("Embedding opportunities for reverse matching...")
+    migrate(engine)
+    session = SessionLocal()
+    try:
+        opp_embeddings = SqlOpportunityEmbeddingRepository(session)
+        svc = OpportunityService(SqlOpportunityRepository(session), get_embedding(), opp_embeddings)
+        opportunities = svc.get_all()
+        missing = set(opp_embeddings.missing_ids([o.id for o in opportunities]))
+        svc.store_embeddings([o for o in opportunities if o.id in missing])
+        print(f"Embedded {len(missing)} opportunities.")
+    finally:
+        session.close()
+
+    if settings.embedding_backend == "numpy":
+        index = get_embedding()
+        if index.stats()["profiles"]:
+            print("NumPy index already populated, skipping copy from Chroma.")
+            return
+        print("Copying Chroma embeddings into the NumPy index...")
+        copied = 0
+        for ids, embeddings, metadatas in chroma.iter_embeddings():
+            index.upsert_vectors(ids, embeddings, metadatas)
+            copied += len(ids)
+        print(f"Copied {copied} profiles.")
+
+
+if __name__ == "__main__":
+    backfill()
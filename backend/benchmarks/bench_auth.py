@@ -0,0 +1,126 @@
+"""Benchmark: resolving a bearer token with database sessions vs signed tokens.
+
+Builds a SQLite database with N users, each holding a few session rows (the sessions
+table only grows until logouts delete rows), and a denylist of revoked signed tokens.
+It then times the token-to-user step of get_current_user on the same sample of users:
+an indexed `sessions` lookup, an HMAC check plus denylist probe, and a session cache
+hit for reference. The user row is loaded after the token lookup in every case, as
+get_current_user does.
+
+    cd backend && uv run python -m benchmarks.bench_auth [users]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.auth.token_signer import TokenSigner
+from app.adapters.persistence import models
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.session_cache import SessionCache
+from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.signed_session_repo import SignedSessionRepository, TokenDenylist
+from app.adapters.persistence.user_repo import SqlUserRepository
+
+DEFAULT_USERS = 100_000
+SESSIONS_PER_USER = 5
+REVOKED = 10_000
+SAMPLES = 5000
+BATCH = 50_000
+
+
+def _populate(session, n_users: int) -> None:
+    now = datetime.now(timezone.utc)
+    users = [
+        {"id": f"u{i}", "name": f"User {i}", "email": f"u{i}@example.com"} for i in range(n_users)
+    ]
+    for i in range(0, n_users, BATCH):
+        session.execute(insert(models.UserModel), users[i : i + BATCH])
+    sessions = [
+        {"id": str(uuid.uuid4()), "user_id": f"u{i}", "created_at": now}
+        for i in range(n_users)
+        for _ in range(SESSIONS_PER_USER)
+    ]
+    for i in range(0, len(sessions), BATCH):
+        session.execute(insert(models.SessionModel), sessions[i : i + BATCH])
+    expires = now.replace(tzinfo=None) + timedelta(days=30)
+    session.execute(
+        insert(models.RevokedTokenModel),
+        [{"token_id": uuid.uuid4().hex, "expires_at": expires} for _ in range(REVOKED)],
+    )
+    session.commit()
+
+
+def _time(resolve, tokens: list[str]) -> list[float]:
+    latencies = []
+    for token in tokens:
+        start = time.perf_counter()
+        resolve(token)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"  {label:<32} p50={statistics.median(latencies):9.3f} ms  p99={p99:9.3f} ms")
+
+
+def main() -> None:
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        print(
+            f"Populating {n_users:,} users, {n_users * SESSIONS_PER_USER:,} sessions, "
+            f"{REVOKED:,} revoked tokens..."
+        )
+        _populate(session, n_users)
+
+        rng = np.random.default_rng(0)
+        sample = [f"u{i}" for i in rng.integers(0, n_users, SAMPLES).tolist()]
+        users = SqlUserRepository(session)
+
+        db_repo = SqlSessionRepository(session)
+        db_tokens = [db_repo.issue(uid) for uid in sample]
+        signed_repo = SignedSessionRepository(
+            session,
+            TokenSigner({"k1": os.urandom(32)}, ttl_seconds=3600),
+            TokenDenylist(poll_seconds=1.0),
+        )
+        signed_tokens = [signed_repo.issue(uid) for uid in sample]
+        signed_repo.get_user_id(signed_tokens[0])  # initial denylist load
+
+        cache = SessionCache(max_entries=SAMPLES, ttl_seconds=300, poll_seconds=1.0)
+        for token, uid in zip(db_tokens, sample):
+            cache.put(token, users.get_by_id(uid))
+        session.expunge_all()
+
+        print("token -> user")
+        _report("db sessions", _time(lambda t: users.get_by_id(db_repo.get_user_id(t)), db_tokens))
+        session.expunge_all()
+        _report(
+            "signed", _time(lambda t: users.get_by_id(signed_repo.get_user_id(t)), signed_tokens)
+        )
+        _report("session cache hit", _time(cache.get, db_tokens))
+        print("token only")
+        _report("db sessions", _time(db_repo.get_user_id, db_tokens))
+        _report("signed", _time(signed_repo.get_user_id, signed_tokens))
+        session.close()
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
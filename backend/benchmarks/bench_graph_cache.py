@@ -0,0 +1,125 @@
+"""Benchmark: SocialGraphCache vs SqlConnectionRepository on a large synthetic graph.
+
+Builds a SQLite database with N users and E random connections (power-law-ish degrees,
+so a few hubs exist as in real networks), then times get_connections and
+get_second_degree for the same sample of users through the SQL repository and through
+the CSR cache. Also reports how long the cache takes to load and the RSS it adds. The
+SQL path is sampled on fewer users because each call scans the table.
+
+    cd backend && uv run python -m benchmarks.bench_graph_cache [users] [edges]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence import models
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.graph_cache import CachedConnectionRepository, SocialGraphCache
+
+DEFAULT_USERS = 100_000
+DEFAULT_EDGES = 1_000_000
+SQL_SAMPLES = 20
+CACHE_SAMPLES = 2000
+BATCH = 50_000
+
+
+def _populate(session, n_users: int, n_edges: int) -> None:
+    rng = np.random.default_rng(0)
+    now = datetime.now(timezone.utc)
+    users = [
+        {"id": f"u{i}", "name": f"User {i}", "email": f"u{i}@example.com"} for i in range(n_users)
+    ]
+    session.execute(insert(models.UserModel), users)
+    # Zipf-weighted endpoints give a long-tailed degree distribution.
+    weights = 1.0 / np.arange(1, n_users + 1) ** 0.8
+    weights /= weights.sum()
+    for start in range(0, n_edges, BATCH):
+        size = min(BATCH, n_edges - start)
+        a = rng.choice(n_users, size, p=weights)
+        b = rng.integers(0, n_users, size)
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_a": f"u{x}",
+                "user_b": f"u{y}",
+                "source": "seed",
+                "strength": 1.0,
+                "created_at": now,
+            }
+            for x, y in zip(a.tolist(), b.tolist())
+            if x != y
+        ]
+        session.execute(insert(models.ConnectionModel), rows)
+    session.commit()
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _time(fn, user_ids: list[str]) -> list[float]:
+    latencies = []
+    for uid in user_ids:
+        start = time.perf_counter()
+        fn(uid)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"  {label:<32} p50={statistics.median(latencies):9.3f} ms  p99={p99:9.3f} ms")
+
+
+def main() -> None:
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    n_edges = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_EDGES
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        print(f"Populating {n_users:,} users, {n_edges:,} connections...")
+        _populate(session, n_users, n_edges)
+
+        rng = np.random.default_rng(1)
+        sample = [f"u{i}" for i in rng.integers(0, n_users, CACHE_SAMPLES).tolist()]
+
+        cache = SocialGraphCache()
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        cache.load(session)
+        load_s = time.perf_counter() - start
+        print(f"Cache load: {load_s:.1f} s, rss=+{_rss_mb() - rss_before:.0f} MB")
+
+        sql = SqlConnectionRepository(session)
+        cached = CachedConnectionRepository(session, cache)
+        print("get_connections")
+        _report("sql", _time(sql.get_connections, sample[:SQL_SAMPLES]))
+        _report("cache", _time(cached.get_connections, sample))
+        print("get_second_degree")
+        _report("sql", _time(sql.get_second_degree, sample[:SQL_SAMPLES]))
+        _report("cache", _time(cached.get_second_degree, sample))
+        session.close()
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: /api/health latency while phase-2 LLM calls are in flight.
+
+Compares the pooled async AnthropicAdapter against the previous behaviour (a sync
+client called from inside the async method). The Anthropic API is replaced by an
+in-process transport that answers after a fixed delay, so no key or network is needed.
+
+    cd backend && uv run python -m benchmarks.bench_llm_event_loop
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+import anthropic
+import httpx
+
+from app.adapters.ai.anthropic_adapter import AnthropicAdapter
+from app.api.app import create_app
+from app.core.entities import CandidateScore, Opportunity, User
+from app.core.enums import OpportunityType
+
+LLM_DELAY_S = 0.5
+CONCURRENT_MATCHES = 8
+HEALTH_PROBES = 40
+
+_RESPONSE = {
+    "id": "msg_bench",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-20250514",
+    "content": [{"type": "text", "text": json.dumps([])}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+}
+
+
+class _SlowAsyncTransport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(LLM_DELAY_S)
+        return httpx.Response(200, json=_RESPONSE)
+
+
+class _SlowSyncTransport(httpx.BaseTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(LLM_DELAY_S)
+        return httpx.Response(200, json=_RESPONSE)
+
+
+class _BlockingAdapter(AnthropicAdapter):
+    """The pre-async behaviour: a synchronous client awaited from an async method."""
+
+    def __init__(self):
+        super().__init__()
+        self._sync_client = anthropic.Anthropic(
+            api_key="bench", http_client=httpx.Client(transport=_SlowSyncTransport())
+        )
+
+    async def rank_and_explain(self, opportunity, candidates):
+        self._sync_client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=1024,
+            messages=[{"role": "user", "content": "rank"}],
+        )
+        return []
+
+
+def _pooled_adapter() -> AnthropicAdapter:
+    client = anthropic.AsyncAnthropic(
+        api_key="bench", http_client=httpx.AsyncClient(transport=_SlowAsyncTransport())
+    )
+    return AnthropicAdapter(client=client)
+
+
+def _workload() -> tuple[Opportunity, list[CandidateScore]]:
+    opp = Opportunity(
+        id="opp", title="Role", description="Desc", type=OpportunityType.JOB, posted_by="p"
+    )
+    user = User(id="u", name="U", bio="", skills=[], interests=[], open_to=["job"])
+    return opp, [
+        CandidateScore(user=user, embedding_score=0.5, network_score=0, combined_score=0.5)
+    ]
+
+
+async def _measure(adapter: AnthropicAdapter) -> list[float]:
+    app = create_app()
+    opp, candidates = _workload()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies: list[float] = []
+
+        async def probe():
+            for _ in range(HEALTH_PROBES):
+                start = time.perf_counter()
+                await client.get("/api/health")
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            probe(),
+            *(adapter.rank_and_explain(opp, candidates) for _ in range(CONCURRENT_MATCHES)),
+        )
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<22} p50={p50:8.2f} ms  p99={p99:8.2f} ms  max={latencies[-1]:8.2f} ms")
+
+
+def main() -> None:
+    print(
+        f"{CONCURRENT_MATCHES} concurrent rankings, {LLM_DELAY_S * 1000:.0f} ms simulated LLM latency"
+    )
+    _report("blocking sync client", asyncio.run(_measure(_BlockingAdapter())))
+    _report("pooled async client", asyncio.run(_measure(_pooled_adapter())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark: login storms with bcrypt in the request thread vs in the hashing pool.
+
+Serves the app in-process (httpx over ASGI, so sync routes share anyio's threadpool as
+they do under uvicorn) and, for each mode, runs C concurrent clients logging in as fast
+as they can for a few seconds while a probe client calls GET /api/auth/me, a cheap sync
+endpoint, in a loop. Reports login throughput and the probe's latency. "inline" is the
+pre-pool login: a sync route calling bcrypt.checkpw directly.
+
+    cd backend && uv run python -m benchmarks.bench_password_hashing [clients] [rounds]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import bcrypt
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.auth.password_hasher import PasswordHasher
+from app.adapters.persistence.database import Base, get_session
+from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.app import create_app
+from app.api.dependencies import get_password_hasher
+from app.api.schemas import LoginRequest
+from app.config import settings
+from app.core.entities import User
+
+DEFAULT_CLIENTS = 64
+DEFAULT_ROUNDS = 12
+DURATION_S = 5.0
+WORKERS = os.cpu_count() or 1
+
+
+def _app(path: str, hasher: PasswordHasher):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def session_override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_password_hasher] = lambda: hasher
+
+    @app.post("/bench/login-inline")
+    def login_inline(body: LoginRequest):
+        with session_factory() as db:
+            user = SqlUserRepository(db).get_by_email(body.email)
+            if not user or not bcrypt.checkpw(body.password.encode(), user.password_hash.encode()):
+                raise HTTPException(status_code=401)
+            return {"token": SqlSessionRepository(db).issue(user.id)}
+
+    with session_factory() as db:
+        hashed = bcrypt.hashpw(b"pw", bcrypt.gensalt(hasher.rounds)).decode()
+        SqlUserRepository(db).create(
+            User(
+                id="me",
+                name="Me",
+                email="me@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+                password_hash=hashed,
+            )
+        )
+        SqlSessionRepository(db).create("probe", "me")
+    return app
+
+
+async def _storm(app, login_path: str, clients: int) -> tuple[float, list[int], list[float]]:
+    transport = httpx.ASGITransport(app=app)
+    started = time.perf_counter()
+    deadline = started + DURATION_S
+    statuses: list[int] = []
+    probe: list[float] = []
+    body = {"email": "me@example.com", "password": "pw"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                response = await http.post(login_path, json=body)
+                statuses.append(response.status_code)
+                if response.status_code == 503:
+                    await asyncio.sleep(float(response.headers["Retry-After"]))
+
+        async def probe_loop():
+            headers = {"Authorization": "Bearer probe"}
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                (await http.get("/api/auth/me", headers=headers)).raise_for_status()
+                probe.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(clients)))
+    return time.perf_counter() - started, statuses, probe
+
+
+def _report(label: str, elapsed: float, statuses: list[int], probe: list[float]) -> None:
+    # In-flight logins finish after the deadline, so rates use the real elapsed time.
+    probe = sorted(probe)
+    p99 = probe[max(0, int(len(probe) * 0.99) - 1)]
+    print(
+        f"  {label:<8} logins/s={statuses.count(200) / elapsed:7.1f}  "
+        f"503s={statuses.count(503):5d}  "
+        f"/me p50={statistics.median(probe):8.1f} ms  p99={p99:8.1f} ms  n={len(probe)}"
+    )
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CLIENTS
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROUNDS
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    hasher = PasswordHasher(
+        rounds=rounds, workers=WORKERS, max_pending=settings.password_hash_max_pending
+    )
+    try:
+        app = _app(path, hasher)
+        print(
+            f"{clients} login clients, bcrypt cost {rounds}, {WORKERS} hashing processes, "
+            f"{settings.password_hash_max_pending} pending at most, {DURATION_S:.0f} s each"
+        )
+        asyncio.run(_storm(app, "/api/auth/login", 1))  # spawn the pool before timing
+        _report("inline", *asyncio.run(_storm(app, "/bench/login-inline", clients)))
+        _report("pool", *asyncio.run(_storm(app, "/api/auth/login", clients)))
+    finally:
+        hasher.shutdown()
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
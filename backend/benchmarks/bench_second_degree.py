@@ -0,0 +1,116 @@
+"""Benchmark: single-query get_second_degree vs the per-friend lookup it replaced.
+
+Builds a SQLite graph where hub users have D friends, each of whom has 20 connections
+of their own, then times SqlConnectionRepository.get_second_degree against the old
+per-friend version (one name query plus one connections query per friend) and counts
+the statements each issues.
+
+    cd backend && uv run python -m benchmarks.bench_second_degree [10,100,1000]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence import models
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.database import Base
+
+DEFAULT_DEGREES = (10, 100, 1000)
+N_USERS = 50_000
+FRIEND_DEGREE = 20
+REPEATS = 5
+
+
+def _per_friend(session, repo: SqlConnectionRepository, user_id: str) -> dict[str, list[str]]:
+    first_degree_ids = set()
+    for c in repo.get_connections(user_id):
+        first_degree_ids.add(c.user_b if c.user_a == user_id else c.user_a)
+    second_degree: dict[str, list[str]] = {}
+    for fid in first_degree_ids:
+        name = session.query(models.UserModel.name).filter(models.UserModel.id == fid).scalar()
+        for c in repo.get_connections(fid):
+            other = c.user_b if c.user_a == fid else c.user_a
+            if other == user_id or other in first_degree_ids:
+                continue
+            second_degree.setdefault(other, [])
+            if name and name not in second_degree[other]:
+                second_degree[other].append(name)
+    return second_degree
+
+
+def _populate(session, degrees: list[int]) -> list[str]:
+    rng = random.Random(0)
+    users = [
+        {"id": f"u{i}", "name": f"User {i}", "email": f"u{i}@example.com"} for i in range(N_USERS)
+    ]
+    session.execute(insert(models.UserModel), users)
+    rows = []
+    hubs = []
+    for h, degree in enumerate(degrees):
+        hub = f"u{h}"
+        hubs.append(hub)
+        for friend in rng.sample(range(len(degrees), N_USERS), degree):
+            rows.append((hub, f"u{friend}"))
+    for i in range(len(degrees), N_USERS):
+        for _ in range(FRIEND_DEGREE // 2):
+            rows.append((f"u{i}", f"u{rng.randrange(len(degrees), N_USERS)}"))
+    session.execute(
+        insert(models.ConnectionModel),
+        [{"id": str(uuid.uuid4()), "user_a": a, "user_b": b, "source": "seed"} for a, b in rows],
+    )
+    session.commit()
+    return hubs
+
+
+def _measure(session, fn, user_id: str) -> tuple[float, int]:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(session.get_bind(), "before_cursor_execute", count)
+    try:
+        latencies = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            fn(user_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", count)
+    return statistics.median(latencies), statements // REPEATS
+
+
+def main() -> None:
+    degrees = [int(d) for d in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_DEGREES
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        hubs = _populate(session, degrees)
+        repo = SqlConnectionRepository(session)
+        print(f"{N_USERS:,} users, friends have ~{FRIEND_DEGREE} connections each")
+        for degree, hub in zip(degrees, hubs):
+            old_ms, old_n = _measure(session, lambda u: _per_friend(session, repo, u), hub)
+            new_ms, new_n = _measure(session, repo.get_second_degree, hub)
+            print(
+                f"degree {degree:>5}: per-friend {old_ms:9.1f} ms ({old_n:>5} statements)  "
+                f"single query {new_ms:8.1f} ms ({new_n} statement)"
+            )
+        session.close()
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
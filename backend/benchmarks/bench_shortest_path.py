@@ -0,0 +1,100 @@
+"""Benchmark: "how are we connected" path search on a large synthetic graph.
+
+Loads the same power-law graph as bench_graph_cache into SocialGraphCache, then times
+shortest_path between random pairs of users with the configured depth cap and visited
+budget. A one-directional, level-at-a-time BFS over the same CSR arrays is timed on
+the same pairs for comparison; it has no visited budget, so its worst case is a sweep
+of the whole graph.
+
+    cd backend && uv run python -m benchmarks.bench_shortest_path [users] [edges] [pairs]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.graph_cache import SocialGraphCache
+from app.config import settings
+from benchmarks.bench_graph_cache import _populate, _report, _rss_mb
+
+DEFAULT_USERS = 100_000
+DEFAULT_EDGES = 1_000_000
+DEFAULT_PAIRS = 500
+
+
+def _one_sided_hops(cache: SocialGraphCache, source_id: str, target_id: str, max_depth: int):
+    source, target = cache._index.get(source_id), cache._index.get(target_id)
+    if source is None or target is None:
+        return None
+    seen = np.zeros(len(cache._user_ids), dtype=bool)
+    seen[source] = True
+    frontier = np.array([source], dtype=np.int32)
+    for depth in range(max_depth + 1):
+        if seen[target]:
+            return depth
+        _, others = cache._gather_neighbors(frontier)
+        frontier = np.unique(others[~seen[others]])
+        if not len(frontier):
+            return None
+        seen[frontier] = True
+    return None
+
+
+def main() -> None:
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    n_edges = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_EDGES
+    n_pairs = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_PAIRS
+    depth, budget = settings.path_max_depth, settings.path_max_visited
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        print(f"Populating {n_users:,} users, {n_edges:,} connections...")
+        _populate(session, n_users, n_edges)
+
+        cache = SocialGraphCache()
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        cache.load(session)
+        print(
+            f"Cache load: {time.perf_counter() - start:.1f} s, rss=+{_rss_mb() - rss_before:.0f} MB"
+        )
+        session.close()
+
+        rng = np.random.default_rng(2)
+        pairs = rng.integers(0, n_users, (n_pairs, 2)).tolist()
+        pairs = [(f"u{a}", f"u{b}") for a, b in pairs]
+
+        print(
+            f"shortest_path over {n_pairs} random pairs (max_depth={depth}, max_visited={budget:,})"
+        )
+        latencies, hops, found = [], {}, 0
+        for a, b in pairs:
+            start = time.perf_counter()
+            result = cache.shortest_path(a, b, depth, budget)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result is not None:
+                found += 1
+                hops[len(result) - 1] = hops.get(len(result) - 1, 0) + 1
+        _report("bidirectional", latencies)
+        one_sided = []
+        for a, b in pairs:
+            start = time.perf_counter()
+            _one_sided_hops(cache, a, b, depth)
+            one_sided.append((time.perf_counter() - start) * 1000)
+        _report("one-sided", one_sided)
+        print(f"  found {found}/{n_pairs}, hops: {dict(sorted(hops.items()))}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
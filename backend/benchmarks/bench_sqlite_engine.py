@@ -0,0 +1,132 @@
+"""Benchmark: concurrent writes with SQLAlchemy's default SQLite engine vs the tuned one.
+
+Runs W writer threads issuing session tokens (one INSERT and commit each, as login does)
+alongside R reader threads loading users, against an on-disk database, for a few
+seconds per engine. "default" is the engine the app used to create: rollback journal,
+synchronous=FULL, pysqlite's 5 s busy timeout and SQLAlchemy's default pool. "tuned" is
+build_engine with the Settings defaults (WAL, synchronous=NORMAL, ...). Reports commit
+throughput and latency, reads served, and how many operations failed with
+"database is locked" or a pool timeout.
+
+    cd backend && uv run python -m benchmarks.bench_sqlite_engine [writers] [readers]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence import models
+from app.adapters.persistence.database import Base, sqlite_tuning
+from app.adapters.persistence.engine_config import PoolConfig, build_engine
+from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.config import settings
+
+DEFAULT_WRITERS = 8
+DEFAULT_READERS = 8
+USERS = 10_000
+DURATION_S = 5.0
+
+
+def _run(engine, writers: int, readers: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as session:
+        session.execute(
+            insert(models.UserModel),
+            [
+                {"id": f"u{i}", "name": f"User {i}", "email": f"u{i}@example.com"}
+                for i in range(USERS)
+            ],
+        )
+        session.commit()
+
+    commits: list[float] = []
+    reads = [0]
+    errors = {"locked": 0, "pool timeout": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + DURATION_S
+
+    def write(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            start = time.perf_counter()
+            try:
+                with factory() as session:
+                    SqlSessionRepository(session).issue(f"u{(n * 7919 + i) % USERS}")
+                with lock:
+                    commits.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                with lock:
+                    errors["locked"] += 1
+            except PoolTimeout:
+                with lock:
+                    errors["pool timeout"] += 1
+
+    def read(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            try:
+                with factory() as session:
+                    SqlUserRepository(session).get_by_id(f"u{(n * 104729 + i) % USERS}")
+                with lock:
+                    reads[0] += 1
+            except OperationalError:
+                with lock:
+                    errors["locked"] += 1
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=read, args=(n,)) for n in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    commits.sort()
+    p99 = commits[max(0, int(len(commits) * 0.99) - 1)] if commits else 0.0
+    print(
+        f"  commits/s={len(commits) / elapsed:8.1f}  p50={statistics.median(commits):7.2f} ms"
+        f"  p99={p99:8.2f} ms  reads/s={reads[0] / elapsed:8.1f}  errors={errors}"
+    )
+
+
+def main() -> None:
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WRITERS
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_READERS
+    print(f"{writers} writers, {readers} readers, {DURATION_S:.0f} s each")
+    pool = PoolConfig(
+        size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        timeout_seconds=settings.db_pool_timeout_seconds,
+    )
+    for label in ("default", "tuned"):
+        directory = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        if label == "default":
+            engine = create_engine(url, connect_args={"check_same_thread": False})
+        else:
+            engine = build_engine(url, sqlite_tuning, pool)
+        print(label)
+        try:
+            _run(engine, writers, readers)
+        finally:
+            engine.dispose()
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
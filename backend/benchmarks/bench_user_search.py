@@ -0,0 +1,197 @@
+"""Benchmark: FTS5 user search vs the previous ILIKE scan.
+
+Builds a migrated SQLite database with N synthetic users (names, skills, interests and
+a short bio drawn from small vocabularies) and times the same queries both ways: the
+old `ILIKE '%term%'` filter over name, bio, skills and interests with LIMIT 20, and
+SqlUserRepository.search, which ranks by bm25. Type-ahead prefixes, whole words, two
+word queries and a term that matches nothing (the ILIKE worst case) are included.
+
+    cd backend && uv run python -m benchmarks.bench_user_search [users]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence.migrations import migrate
+from app.adapters.persistence.models import UserModel
+from app.adapters.persistence.user_repo import SqlUserRepository
+from benchmarks.bench_graph_cache import _rss_mb
+
+DEFAULT_USERS = 100_000
+BATCH = 20_000
+REPEATS = 20
+LIMIT = 20
+FIRST = [
+    "Ada",
+    "Grace",
+    "Alan",
+    "Linus",
+    "Margaret",
+    "Ken",
+    "Barbara",
+    "Dennis",
+    "Frances",
+    "Edsger",
+    "Radia",
+    "Tim",
+    "Sophie",
+    "John",
+    "Hedy",
+    "Donald",
+]
+LAST = [
+    "Lovelace",
+    "Hopper",
+    "Turing",
+    "Torvalds",
+    "Hamilton",
+    "Thompson",
+    "Liskov",
+    "Ritchie",
+    "Allen",
+    "Dijkstra",
+    "Perlman",
+    "Berners-Lee",
+    "Wilson",
+    "McCarthy",
+]
+SKILLS = [
+    "Python",
+    "Rust",
+    "Go",
+    "TypeScript",
+    "Kubernetes",
+    "PostgreSQL",
+    "React",
+    "Machine Learning",
+    "Data Engineering",
+    "Product Design",
+    "Figma",
+    "Swift",
+    "Kotlin",
+    "Terraform",
+    "Sales",
+    "Marketing",
+    "Fundraising",
+    "Recruiting",
+]
+INTERESTS = [
+    "climate",
+    "fintech",
+    "healthcare",
+    "education",
+    "open source",
+    "robotics",
+    "music",
+    "chess",
+    "hiking",
+    "photography",
+    "startups",
+    "biotech",
+]
+BIO_WORDS = [
+    "building",
+    "scaling",
+    "teams",
+    "products",
+    "platforms",
+    "research",
+    "infrastructure",
+    "mentoring",
+    "founder",
+    "engineer",
+    "designer",
+    "writer",
+    "previously",
+    "currently",
+    "exploring",
+    "passionate",
+    "about",
+    "systems",
+]
+QUERIES = ["gr", "pyth", "kubernetes", "rust climate", "machine learning", "zzzz"]
+
+
+def _populate(session, n_users: int) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, n_users, BATCH):
+        rows = []
+        for i in range(start, min(n_users, start + BATCH)):
+            skills = rng.choice(SKILLS, 3, replace=False).tolist()
+            interests = rng.choice(INTERESTS, 2, replace=False).tolist()
+            rows.append(
+                {
+                    "id": f"u{i}",
+                    "name": f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}",
+                    "email": f"u{i}@example.com",
+                    "bio": " ".join(rng.choice(BIO_WORDS, 12).tolist()),
+                    "skills": str(skills).replace("'", '"'),
+                    "interests": str(interests).replace("'", '"'),
+                }
+            )
+        session.execute(insert(UserModel), rows)
+    session.commit()
+
+
+def _ilike(session, q: str) -> list:
+    term = f"%{q.lower()}%"
+    return (
+        session.query(UserModel)
+        .filter(
+            (UserModel.name.ilike(term))
+            | (UserModel.skills.ilike(term))
+            | (UserModel.interests.ilike(term))
+            | (UserModel.bio.ilike(term))
+        )
+        .limit(LIMIT)
+        .all()
+    )
+
+
+def _time(fn, q: str) -> float:
+    latencies = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(q)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(f"sqlite:///{path}")
+        migrate(engine)
+        session = sessionmaker(bind=engine)()
+        print(f"Populating {n_users:,} users (index maintained by triggers)...")
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        _populate(session, n_users)
+        print(
+            f"Insert: {time.perf_counter() - start:.1f} s, rss=+{_rss_mb() - rss_before:.0f} MB, "
+            f"db={os.path.getsize(path) / 2**20:.0f} MB"
+        )
+
+        repo = SqlUserRepository(session)
+        print(f"{'query':<18} {'ilike p50':>12} {'fts p50':>12} {'fts hits':>9}")
+        for q in QUERIES:
+            ilike_ms = _time(lambda term: _ilike(session, term), q)
+            fts_ms = _time(lambda term: repo.search(term, LIMIT), q)
+            hits = len(repo.search(q, LIMIT))
+            print(f"{q!r:<18} {ilike_ms:>9.2f} ms {fts_ms:>9.2f} ms {hits:>9}")
+        session.close()
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
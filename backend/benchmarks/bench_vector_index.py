@@ -0,0 +1,171 @@
+"""Benchmark: NumpyEmbeddingAdapter vs ChromaEmbeddingAdapter's index.
+
+Loads N synthetic 384-d profiles (clustered, like MiniLM embeddings) into each backend
+and runs filtered top-15 queries, as phase 1 does. Reports query latency, recall@15
+against an exact float32 scan, and process RSS growth after imports. Each backend/size
+pair runs in its own subprocess so RSS numbers do not bleed into each other. Queries
+are issued by vector, so the embedding model is not downloaded or timed.
+
+    cd backend && uv run python -m benchmarks.bench_vector_index [10000,100000,1000000]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+from app.adapters.embeddings.numpy_adapter import NumpyEmbeddingAdapter
+
+DIM = 384
+N_RESULTS = 15
+N_QUERIES = 200
+N_CLUSTERS = 256
+BATCH = 5000
+WHERE = {"open_to_job": True}
+BACKENDS = ("chroma", "numpy-float32", "numpy-float16", "numpy-int8")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _batches(n: int):
+    """Deterministic clustered vectors with an open_to_job flag on roughly half of them."""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((N_CLUSTERS, DIM)).astype(np.float32)
+    for start in range(0, n, BATCH):
+        size = min(BATCH, n - start)
+        vectors = centers[rng.integers(0, N_CLUSTERS, size)]
+        vectors = vectors + 0.5 * rng.standard_normal((size, DIM)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        flags = rng.random(size) < 0.5
+        ids = [f"u{start + i}" for i in range(size)]
+        yield ids, vectors, [{"open_to_job": bool(f)} for f in flags]
+
+
+def _queries() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((N_QUERIES, DIM)).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+class _ExactTopK:
+    """Streaming exact top-k per query over the filtered rows, for recall."""
+
+    def __init__(self, queries: np.ndarray):
+        self._queries = queries
+        self._scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        self._ids = np.empty((len(queries), 0), dtype=object)
+
+    def add(self, ids: list[str], vectors: np.ndarray, metadatas: list[dict]) -> None:
+        keep = np.array([m["open_to_job"] for m in metadatas])
+        scores = self._queries @ vectors[keep].T
+        all_scores = np.hstack([self._scores, scores])
+        kept_ids = np.array(ids, dtype=object)[keep]
+        all_ids = np.hstack([self._ids, np.tile(kept_ids, (len(scores), 1))])
+        top = np.argsort(-all_scores, axis=1)[:, :N_RESULTS]
+        self._scores = np.take_along_axis(all_scores, top, axis=1)
+        self._ids = np.take_along_axis(all_ids, top, axis=1)
+
+    def ids(self, i: int) -> set[str]:
+        return set(self._ids[i])
+
+
+def _build_chroma(workdir: str):
+    collection = chromadb.PersistentClient(path=workdir).get_or_create_collection(
+        name="profiles", metadata={"hnsw:space": "cosine"}, embedding_function=None
+    )
+
+    def add(ids, vectors, metadatas):
+        collection.add(ids=ids, embeddings=vectors, metadatas=metadatas)
+
+    def search(vector):
+        result = collection.query(query_embeddings=[vector], n_results=N_RESULTS, where=WHERE)
+        return result["ids"][0]
+
+    return add, search
+
+
+def _build_numpy(workdir: str, storage_dtype: str):
+    adapter = NumpyEmbeddingAdapter(
+        index_dir=workdir, storage_dtype=storage_dtype, embedding_fn=lambda texts: []
+    )
+
+    def search(vector):
+        return [r["user_id"] for r in adapter.search_by_vector(vector, N_RESULTS, WHERE)]
+
+    return adapter.upsert_vectors, search
+
+
+def _run_one(backend: str, n: int) -> dict:
+    queries = _queries()
+    exact = _ExactTopK(queries)
+    with tempfile.TemporaryDirectory() as workdir:
+        rss_before = _rss_mb()
+        if backend == "chroma":
+            add, search = _build_chroma(workdir)
+        else:
+            add, search = _build_numpy(workdir, backend.split("-", 1)[1])
+        load_start = time.perf_counter()
+        for ids, vectors, metadatas in _batches(n):
+            add(ids, vectors, metadatas)
+            exact.add(ids, vectors, metadatas)
+        load_s = time.perf_counter() - load_start
+
+        latencies, recalls = [], []
+        search(queries[0])  # warm-up
+        for i, query in enumerate(queries):
+            start = time.perf_counter()
+            found = search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(exact.ids(i) & set(found)) / N_RESULTS)
+        return {
+            "load_s": load_s,
+            "latencies": latencies,
+            "recall": statistics.mean(recalls),
+            "rss_mb": _rss_mb() - rss_before,
+        }
+
+
+def _report(backend: str, n: int, result: dict) -> None:
+    latencies = sorted(result["latencies"])
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{n:>9,} {backend:<14} p50={p50:8.2f} ms  p99={p99:8.2f} ms  "
+        f"recall@{N_RESULTS}={result['recall']:.3f}  rss=+{result['rss_mb']:7.1f} MB  "
+        f"load={result['load_s']:7.1f} s"
+    )
+
+
+def main() -> None:
+    if len(sys.argv) == 4 and sys.argv[1] == "--one":
+        print(json.dumps(_run_one(sys.argv[2], int(sys.argv[3]))))
+        return
+    sizes = [int(s) for s in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_SIZES
+    print(f"{DIM}-d vectors, {N_QUERIES} queries filtered on {WHERE}, top {N_RESULTS}")
+    for n in sizes:
+        for backend in BACKENDS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_vector_index", "--one", backend, str(n)],
+                check=True,
+                capture_output=True,
+                text=True,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            )
+            _report(backend, n, json.loads(out.stdout.strip().splitlines()[-1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ import uuid
 import bcrypt
 
 from app.adapters.embeddings.chroma_adapter import ChromaEmbeddingAdapter
-from app.adapters.persistence.database import Base, SessionLocal, engine
+from app.adapters.persistence.database import SessionLocal, engine
+from app.adapters.persistence.migrations import migrate
 from app.adapters.persistence.models import (
     ConnectionModel,
     FeedbackModel,
@@ -14,8 +15,15 @@ from app.adapters.persistence.models import (
     OpportunityModel,
     UserModel,
 )
+from app.adapters.persistence.opportunity_embedding_repo import SqlOpportunityEmbeddingRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.config import settings
+from app.ports.embedding_port import open_to_metadata
+from app.services.opportunity_service import OpportunityService
 
-DEMO_PASSWORD_HASH = bcrypt.hashpw(b"demo123", bcrypt.gensalt()).decode()
+DEMO_PASSWORD_HASH = bcrypt.hashpw(
+    b"demo123", bcrypt.gensalt(settings.password_hash_rounds)
+).decode()
 
 USERS = [
     {
@@ -291,7 +299,7 @@ DEMO_OPPORTUNITIES = [
 
 def seed():
     print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
 
     session = SessionLocal()
 
@@ -375,7 +383,21 @@ def seed():
             f"Interests: {', '.join(u['interests'])}. "
             f"Open to: {', '.join(u['open_to'])}"
         )
-        chroma.upsert_profile(u["id"], text, {"name": u["name"], "open_to": ",".join(u["open_to"])})
+        chroma.upsert_profile(
+            u["id"],
+            text,
+            {
+                "name": u["name"],
+                "open_to": ",".join(u["open_to"]),
+                **open_to_metadata(u["open_to"]),
+            },
+        )
+
+    print("Embedding opportunities for reverse matching...")
+    opportunities = OpportunityService(
+        SqlOpportunityRepository(session), chroma, SqlOpportunityEmbeddingRepository(session)
+    )
+    opportunities.store_embeddings(opportunities.get_all())
 
     session.close()
     print("Seed complete!")
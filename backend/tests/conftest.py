@@ -1,6 +1,8 @@
 """Pytest configuration and fixtures. Isolated DB per test via session override."""
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -10,11 +12,26 @@ from sqlalchemy.orm import sessionmaker
 
 # Avoid touching real data dir; use a dummy path so app can be imported
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+# Each TestClient runs the lifespan; don't warm the shared proximity index from it.
+os.environ["PROXIMITY_WARM_ON_STARTUP"] = "false"
 
+from app.adapters.auth.password_hasher import PasswordHasher
 from app.adapters.persistence.database import Base, get_session
 from app.adapters.persistence import models  # noqa: F401 - register tables with Base
+from app.adapters.persistence.migrations import migrate
 from app.api.app import create_app
-from app.api.dependencies import get_matching_service
+from app.api.dependencies import (
+    get_graph_cache,
+    get_matching_service,
+    get_matching_service_scope,
+    get_password_hasher,
+    get_session_cache,
+)
+
+# Cheap bcrypt on threads, so tests neither spawn the hashing processes nor wait on cost 12.
+_password_hasher = PasswordHasher(
+    rounds=4, workers=2, max_pending=64, executor=ThreadPoolExecutor(max_workers=2)
+)
 
 
 def _mock_matching_service():
@@ -22,9 +39,44 @@ def _mock_matching_service():
     mock = MagicMock()
     mock.find_matches = AsyncMock(return_value=[])
     mock.get_matches = MagicMock(return_value=[])
+    mock.retrieve_candidates = MagicMock(return_value=[])
+    mock.rank_candidates = AsyncMock(return_value=[])
+    mock.retrieve_candidates_batch = MagicMock(return_value={})
+    mock.find_matches_batch = AsyncMock(return_value={})
     return mock
 
 
+def _mock_matching_service_scope():
+    """Background match jobs open their own MatchingService; hand them the mock too."""
+
+    @contextmanager
+    def scope():
+        yield _mock_matching_service()
+
+    return scope
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """A fresh, fully migrated SQLite file for tests that drive repositories directly."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 @pytest.fixture
 def client():
     """Fresh app and isolated DB per test."""
@@ -45,9 +97,14 @@ def client():
             finally:
                 db.close()
 
+        # The graph cache is process-wide; drop whatever the previous test's DB left in it.
+        get_graph_cache().invalidate()
+        get_session_cache.cache_clear()
         app = create_app()
         app.dependency_overrides[get_session] = _override_get_session
         app.dependency_overrides[get_matching_service] = _mock_matching_service
+        app.dependency_overrides[get_matching_service_scope] = _mock_matching_service_scope
+        app.dependency_overrides[get_password_hasher] = lambda: _password_hasher
         with TestClient(app) as c:
             yield c
     finally:
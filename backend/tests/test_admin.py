@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from app.config import settings
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", TOKEN)
+    return {"X-Admin-Token": TOKEN}
+
+
+def test_rematch_disabled_without_configured_token(client):
+    response = client.post("/api/admin/rematch", json={})
+    assert response.status_code == 403
+
+
+def test_rematch_rejects_wrong_token(client, admin_token):
+    response = client.post("/api/admin/rematch", json={}, headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 401
+
+
+def test_rematch_unknown_opportunity_returns_404(client, admin_token):
+    response = client.post(
+        "/api/admin/rematch", json={"opportunity_ids": ["missing"]}, headers=admin_token
+    )
+    assert response.status_code == 404
+
+
+def test_rematch_all_returns_202_and_job_completes(client, admin_token):
+    response = client.post("/api/admin/rematch", json={}, headers=admin_token)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["total"] == 0
+
+    for _ in range(50):
+        job = client.get(f"/api/admin/rematch/{job['job_id']}", headers=admin_token).json()
+        if job["status"] == "done":
+            break
+        time.sleep(0.02)
+    assert job["status"] == "done"
+
+
+def test_rematch_job_lookup_unknown_returns_404(client, admin_token):
+    response = client.get("/api/admin/rematch/missing", headers=admin_token)
+    assert response.status_code == 404
+
+
+def test_database_diagnostics_reports_pragmas_and_pool(client, admin_token):
+    response = client.get("/api/admin/database", headers=admin_token)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["dialect"] == "sqlite"
+    assert body["configured"]["journal_mode"] == "wal"
+    assert set(body["effective"]) == set(body["configured"])
+    assert "class" in body["pool"]
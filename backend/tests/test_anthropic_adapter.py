@@ -0,0 +1,196 @@
+"""Unit tests for AnthropicAdapter over a fake HTTP transport (no network)."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+
+from app.adapters.ai.anthropic_adapter import AnthropicAdapter, _JsonArrayObjectParser
+from app.config import settings
+from app.core.entities import CandidateScore, Opportunity, User
+from app.core.enums import OpportunityType
+
+
+def _message(text: str) -> dict:
+    return {
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-20250514",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+
+
+def _opportunity() -> Opportunity:
+    return Opportunity(
+        id="opp-1",
+        title="Backend role",
+        description="Python",
+        type=OpportunityType.JOB,
+        posted_by="poster-1",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _candidate(user_id: str) -> CandidateScore:
+    user = User(id=user_id, name=user_id, bio="", skills=[], interests=[], open_to=["job"])
+    return CandidateScore(user=user, embedding_score=0.5, network_score=0.0, combined_score=0.5)
+
+
+def _adapter(handler) -> AnthropicAdapter:
+    client = anthropic.AsyncAnthropic(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_retries=0,
+    )
+    return AnthropicAdapter(client=client)
+
+
+def test_rank_and_explain_parses_ranked_matches():
+    payload = [{"user_id": "u1", "rank": 1, "score": 0.9, "explanation": "Great"}]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_message(json.dumps(payload)))
+
+    ranked = asyncio.run(_adapter(handler).rank_and_explain(_opportunity(), [_candidate("u1")]))
+
+    assert [(r.user_id, r.rank, r.score) for r in ranked] == [("u1", 1, 0.9)]
+
+
+def test_rank_and_explain_falls_back_to_phase1_order_on_error():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"type": "error", "error": {"type": "api_error"}})
+
+    candidates = [_candidate("u1"), _candidate("u2")]
+    ranked = asyncio.run(_adapter(handler).rank_and_explain(_opportunity(), candidates))
+
+    assert [r.user_id for r in ranked] == ["u1", "u2"]
+
+
+def test_in_flight_calls_are_capped(monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_concurrency", 2)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=_message("[]"))
+
+    async def run():
+        adapter = _adapter(handler)
+        await asyncio.gather(
+            *(adapter.rank_and_explain(_opportunity(), [_candidate("u1")]) for _ in range(6))
+        )
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+
+def test_stream_parser_emits_each_object_as_it_completes():
+    text = (
+        "```json\n"
+        + json.dumps(
+            [
+                {
+                    "user_id": "u1",
+                    "rank": 1,
+                    "score": 0.9,
+                    "explanation": 'Knows {braces} and "quotes"',
+                },
+                {"user_id": "u2", "rank": 2, "score": 0.7, "explanation": "Solid"},
+            ]
+        )
+        + "\n```"
+    )
+    parser = _JsonArrayObjectParser()
+
+    emitted_at = []
+    for i in range(0, len(text), 5):
+        for item in parser.feed(text[i : i + 5]):
+            emitted_at.append((i, item["user_id"]))
+
+    assert [uid for _, uid in emitted_at] == ["u1", "u2"]
+    # The first match is available before the rest of the array has arrived.
+    assert emitted_at[0][0] < text.index('"u2"')
+
+
+def test_stream_rank_and_explain_falls_back_on_error():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"type": "error", "error": {"type": "api_error"}})
+
+    async def collect():
+        adapter = _adapter(handler)
+        return [
+            m async for m in adapter.stream_rank_and_explain(_opportunity(), [_candidate("u1")])
+        ]
+
+    assert [m.user_id for m in asyncio.run(collect())] == ["u1"]
+
+
+class _FakeStream:
+    """Stands in for `messages.stream(...)`: yields `chunks`, then raises `error` if set."""
+
+    def __init__(self, chunks: list[str], error: Exception | None = None):
+        self._chunks = chunks
+        self._error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self._chunks:
+            yield chunk
+        if self._error:
+            raise self._error
+
+
+def _streaming_adapter(chunks: list[str], error: Exception | None = None) -> AnthropicAdapter:
+    messages = SimpleNamespace(stream=lambda **kwargs: _FakeStream(chunks, error))
+    return AnthropicAdapter(client=SimpleNamespace(messages=messages))
+
+
+def test_fallback_after_a_mid_stream_failure_continues_the_ranks():
+    first = json.dumps({"user_id": "u2", "rank": 1, "score": 0.9, "explanation": "Great"})
+    adapter = _streaming_adapter(["[" + first + ","], error=httpx.ReadError("dropped"))
+    candidates = [_candidate("u1"), _candidate("u2"), _candidate("u3")]
+
+    async def collect():
+        return [m async for m in adapter.stream_rank_and_explain(_opportunity(), candidates)]
+
+    ranked = asyncio.run(collect())
+
+    assert [(m.user_id, m.rank, m.is_fallback) for m in ranked] == [
+        ("u2", 1, False),
+        ("u1", 2, True),
+        ("u3", 3, True),
+    ]
+
+
+def test_slow_stream_consumer_does_not_hold_the_concurrency_slot(monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_concurrency", 1)
+    items = [{"user_id": f"u{i}", "rank": i, "score": 0.5, "explanation": ""} for i in (1, 2)]
+    adapter = _streaming_adapter([json.dumps(items)])
+
+    async def run():
+        slow = adapter.stream_rank_and_explain(_opportunity(), [_candidate("u1")])
+        await anext(slow)  # take one match, then stall like a slow SSE client
+        other = [m async for m in adapter.stream_rank_and_explain(_opportunity(), [])]
+        await slow.aclose()
+        return other
+
+    assert [m.user_id for m in asyncio.run(asyncio.wait_for(run(), timeout=2))] == ["u1", "u2"]
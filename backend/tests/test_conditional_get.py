@@ -0,0 +1,180 @@
+"""Conditional GET: validators change exactly when the response would, and 304s are cheap."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.connection_request_repo import SqlConnectionRequestRepository
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.match_repo import SqlMatchRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import get_current_user, get_graph_cache
+from app.core.entities import Connection, ConnectionRequest, Match, Opportunity, User
+from app.core.enums import ConnectionSource, OpportunityType
+
+
+def _user(uid: str) -> User:
+    return User(
+        id=uid,
+        name=f"Name {uid}",
+        email=f"{uid}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=[],
+    )
+
+
+@pytest.fixture
+def session(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    users = SqlUserRepository(session)
+    for uid in ["me", "a", "b", "c"]:
+        users.create(_user(uid))
+    SqlOpportunityRepository(session).create(
+        Opportunity(id="o1", title="Role", description="", type=OpportunityType.JOB, posted_by="a")
+    )
+    client.app.dependency_overrides[get_current_user] = lambda: _user("me")
+    yield session
+    session.close()
+
+
+def _connect(session, id_: str, a: str, b: str) -> None:
+    SqlConnectionRepository(session).create(
+        Connection(id=id_, user_a=a, user_b=b, source=ConnectionSource.SEED)
+    )
+    get_graph_cache().invalidate()
+
+
+def _revalidate(client, path: str, etag: str) -> int:
+    return client.get(path, headers={"If-None-Match": etag}).status_code
+
+
+def test_user_etag_follows_its_connections(client, session):
+    first = client.get("/api/users/a")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert _revalidate(client, "/api/users/a", etag) == 304
+
+    _connect(session, "c1", "b", "c")  # someone else's connection
+    assert _revalidate(client, "/api/users/a", etag) == 304
+
+    _connect(session, "c2", "a", "b")
+    changed = client.get("/api/users/a", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["connection_count"] == 1
+    assert changed.headers["ETag"] != etag
+    assert "Last-Modified" in changed.headers
+
+
+def test_network_etag_follows_the_whole_graph_and_requests(client, session):
+    etag = client.get("/api/users/network/me").headers["ETag"]
+    _connect(session, "c1", "b", "c")  # could be a 2nd-degree change, so it counts
+    assert _revalidate(client, "/api/users/network/me", etag) == 200
+
+    etag = client.get("/api/users/network/me").headers["ETag"]
+    SqlConnectionRequestRepository(session).create(
+        ConnectionRequest(id="r1", from_user_id="b", to_user_id="me", opportunity_id="o1")
+    )
+    assert _revalidate(client, "/api/users/network/me", etag) == 200
+
+
+def test_request_list_etags_follow_creates_and_status_changes(client, session):
+    requests = SqlConnectionRequestRepository(session)
+    incoming = client.get("/api/connection-requests/incoming").headers["ETag"]
+    outgoing = client.get("/api/connection-requests/outgoing").headers["ETag"]
+
+    requests.create(
+        ConnectionRequest(id="r1", from_user_id="a", to_user_id="me", opportunity_id="o1")
+    )
+    assert _revalidate(client, "/api/connection-requests/incoming", incoming) == 200
+    assert _revalidate(client, "/api/connection-requests/outgoing", outgoing) == 200
+
+    incoming = client.get("/api/connection-requests/incoming").headers["ETag"]
+    requests.update_status("r1", "declined")
+    assert _revalidate(client, "/api/connection-requests/incoming", incoming) == 200
+
+
+def test_pending_count_counts_only_pending_incoming(client, session):
+    requests = SqlConnectionRequestRepository(session)
+    for id_, from_user in [("r1", "a"), ("r2", "b"), ("r3", "c")]:
+        requests.create(
+            ConnectionRequest(id=id_, from_user_id=from_user, to_user_id="me", opportunity_id="o1")
+        )
+    requests.create(
+        ConnectionRequest(id="r4", from_user_id="me", to_user_id="a", opportunity_id="o1")
+    )
+    requests.update_status("r3", "declined")
+
+    count = client.get("/api/connection-requests/incoming/count")
+    assert count.json() == {"count": 2}
+    assert client.get("/api/users/network/me").json()["pending_incoming"] == 2
+
+    requests.update_status("r2", "accepted")
+    assert (
+        _revalidate(client, "/api/connection-requests/incoming/count", count.headers["ETag"]) == 200
+    )
+    assert client.get("/api/connection-requests/incoming/count").json() == {"count": 1}
+
+
+def test_opportunity_etag_follows_matches(client, session):
+    etag = client.get("/api/opportunities/o1").headers["ETag"]
+    assert _revalidate(client, "/api/opportunities/o1", etag) == 304
+
+    SqlMatchRepository(session).create_batch(
+        [
+            Match(
+                id="m1",
+                opportunity_id="o1",
+                user_id="b",
+                score=0.9,
+                embedding_score=0.8,
+                network_score=0.1,
+                explanation="",
+                rank=1,
+            )
+        ]
+    )
+    assert _revalidate(client, "/api/opportunities/o1", etag) == 200
+
+
+def test_if_modified_since_and_if_none_match_precedence(client, session):
+    _connect(session, "c1", "a", "b")
+    response = client.get("/api/users/a")
+    last_modified = response.headers["Last-Modified"]
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(hours=1), usegmt=True)
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+
+    def status(**headers) -> int:
+        return client.get("/api/users/a", headers=headers).status_code
+
+    assert status(**{"If-Modified-Since": last_modified}) == 304
+    assert status(**{"If-Modified-Since": later}) == 304
+    assert status(**{"If-Modified-Since": earlier}) == 200
+    assert status(**{"If-Modified-Since": "not a date"}) == 200
+    # If-None-Match wins when both are sent.
+    assert status(**{"If-None-Match": 'W/"stale"', "If-Modified-Since": later}) == 200
+    assert status(**{"If-None-Match": f'"x", {response.headers["ETag"]}'}) == 304
+    assert status(**{"If-None-Match": "*"}) == 304
+
+
+def test_not_modified_skips_loading_the_resource(client, session):
+    etag = client.get("/api/opportunities/o1").headers["ETag"]
+    engine = session.get_bind()
+    statements = []
+
+    def listener(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/opportunities/o1", headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert (response.status_code, response.content) == (304, b"")
+    assert len(statements) == 1 and "resource_versions" in statements[0]
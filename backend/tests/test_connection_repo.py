@@ -0,0 +1,104 @@
+"""SqlConnectionRepository.get_second_degree: the single-query version agrees with the
+per-friend lookup it replaced."""
+
+import random
+import uuid
+
+from sqlalchemy import event
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.models import UserModel
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.core.entities import Connection, User
+from app.core.enums import ConnectionSource
+
+
+def _per_friend_second_degree(session, repo: SqlConnectionRepository, user_id: str):
+    """The previous implementation: one name query and one connections query per friend."""
+    first_degree_ids = set()
+    for c in repo.get_connections(user_id):
+        first_degree_ids.add(c.user_b if c.user_a == user_id else c.user_a)
+
+    second_degree: dict[str, list[str]] = {}
+    for fid in first_degree_ids:
+        friend_name = session.query(UserModel.name).filter(UserModel.id == fid).scalar()
+        for c in repo.get_connections(fid):
+            other = c.user_b if c.user_a == fid else c.user_a
+            if other == user_id or other in first_degree_ids:
+                continue
+            second_degree.setdefault(other, [])
+            if friend_name and friend_name not in second_degree[other]:
+                second_degree[other].append(friend_name)
+    return second_degree
+
+
+def _edge(a: str, b: str) -> Connection:
+    return Connection(id=str(uuid.uuid4()), user_a=a, user_b=b, source=ConnectionSource.SEED)
+
+
+def _seed(session, count: int) -> list[str]:
+    users = SqlUserRepository(session)
+    ids = [f"u{i}" for i in range(count)]
+    for i, uid in enumerate(ids):
+        # A shared name and an empty name exercise de-duplication and skipping.
+        name = "Sam" if i % 7 == 0 else ("" if i % 11 == 0 else f"Name {uid}")
+        users.create(
+            User(
+                id=uid,
+                name=name,
+                email=f"{uid}@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+            )
+        )
+    return ids
+
+
+def test_single_query_matches_per_friend_lookup(sqlite_session):
+    ids = _seed(sqlite_session, 40)
+    rng = random.Random(3)
+    edges = [_edge(*rng.sample(ids, 2)) for _ in range(120)]
+    edges.append(_edge("u1", "u2"))
+    edges.append(_edge("u2", "u1"))  # the same pair stored in both directions
+    edges.append(_edge("u1", "ghost"))  # a friend without a users row
+    edges.append(_edge("ghost", "u3"))
+    repo = SqlConnectionRepository(sqlite_session)
+    repo.create_batch(edges)
+
+    for uid in ids + ["ghost", "nobody"]:
+        expected = _per_friend_second_degree(sqlite_session, repo, uid)
+        actual = repo.get_second_degree(uid)
+        assert actual.keys() == expected.keys()
+        for other, names in expected.items():
+            assert sorted(actual[other]) == sorted(names)
+
+
+def test_second_degree_is_one_statement(sqlite_session):
+    ids = _seed(sqlite_session, 12)
+    repo = SqlConnectionRepository(sqlite_session)
+    repo.create_batch([_edge("u0", uid) for uid in ids[1:6]] + [_edge("u1", "u9")])
+    statements = []
+    event.listen(
+        sqlite_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    assert repo.get_second_degree("u0") == {"u9": ["Name u1"]}
+    assert len(statements) == 1
+
+
+def test_count_connections_in_one_grouped_query(sqlite_session):
+    ids = _seed(sqlite_session, 6)
+    repo = SqlConnectionRepository(sqlite_session)
+    repo.create_batch([_edge("u0", "u1"), _edge("u2", "u0"), _edge("u1", "u2"), _edge("u3", "u3")])
+    statements = []
+    event.listen(
+        sqlite_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    counts = repo.count_connections(ids + ["nobody"])
+
+    assert counts == {"u0": 2, "u1": 2, "u2": 2, "u3": 1, "u4": 0, "u5": 0, "nobody": 0}
+    assert len(statements) == 1
+    assert counts == {uid: len(repo.get_connections(uid)) for uid in counts}
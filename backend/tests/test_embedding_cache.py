@@ -0,0 +1,79 @@
+"""Unit tests for the query-embedding LRU used by ChromaEmbeddingAdapter."""
+
+import sqlite3
+
+import numpy as np
+
+from app.adapters.embeddings import embedding_cache
+from app.adapters.embeddings.embedding_cache import EmbeddingCache, normalize_text
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  senior   backend\nengineer ") == "senior backend engineer"
+
+
+def test_get_many_reports_misses_then_hits():
+    cache = EmbeddingCache(max_entries=4)
+    assert cache.get_many(["a"]) == [None]
+    cache.put_many(["a"], [np.array([1.0, 2.0])])
+    (vector,) = cache.get_many(["a"])
+    assert vector.tolist() == [1.0, 2.0]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many(["a", "b"], [np.zeros(2), np.ones(2)])
+    cache.get_many(["a"])
+    cache.put_many(["c"], [np.ones(2)])
+    a, b, c = cache.get_many(["a", "b", "c"])
+    assert a is not None and c is not None
+    assert b is None
+
+
+def test_spills_to_disk_and_survives_restart(tmp_path):
+    path = str(tmp_path / "query_embeddings.db")
+    EmbeddingCache(max_entries=2, path=path).put_many(["a"], [np.array([0.5, 0.25])])
+    reopened = EmbeddingCache(max_entries=2, path=path)
+    (vector,) = reopened.get_many(["a"])
+    assert vector.tolist() == [0.5, 0.25]
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_spill_keeps_the_most_recently_used_rows(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: next(clock))
+    path = str(tmp_path / "query_embeddings.db")
+    cache = EmbeddingCache(max_entries=1, path=path, max_disk_entries=2)
+    cache.put_many(["a"], [np.zeros(2)])
+    cache.put_many(["b"], [np.zeros(2)])
+    cache.get_many(["a"])  # read back from disk, so "b" is now the oldest
+    cache.put_many(["c"], [np.zeros(2)])
+
+    reopened = EmbeddingCache(max_entries=3, path=path, max_disk_entries=2)
+    a, b, c = reopened.get_many(["a", "b", "c"])
+    assert a is not None and c is not None
+    assert b is None
+
+
+def test_adds_recency_to_an_existing_spill_file(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: next(clock))
+    path = str(tmp_path / "query_embeddings.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE query_embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+    db.execute(
+        "INSERT INTO query_embeddings VALUES (?, ?)",
+        ("old", np.array([1.0], dtype=np.float32).tobytes()),
+    )
+    db.commit()
+    db.close()
+
+    cache = EmbeddingCache(max_entries=2, path=path, max_disk_entries=1)
+    (vector,) = cache.get_many(["old"])
+    assert vector.tolist() == [1.0]
+    cache.put_many(["new"], [np.zeros(1)])
+    assert EmbeddingCache(max_entries=2, path=path).get_many(["old"]) == [None]
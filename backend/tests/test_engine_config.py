@@ -0,0 +1,50 @@
+"""SQLite engine tuning: pragmas applied per connection, pool sizing, and validation."""
+
+import pytest
+from sqlalchemy import text
+
+from app.adapters.persistence.engine_config import (
+    PoolConfig,
+    SqliteTuning,
+    build_engine,
+    describe_engine,
+)
+
+
+def test_pragmas_apply_to_every_pooled_connection(tmp_path):
+    tuning = SqliteTuning(busy_timeout_ms=1234, cache_size_kib=2048, mmap_size_bytes=1 << 20)
+    engine = build_engine(
+        f"sqlite:///{tmp_path / 'tuned.db'}", tuning, PoolConfig(size=3, max_overflow=1)
+    )
+    try:
+        with engine.connect() as first, engine.connect() as second:
+            timeouts = [c.execute(text("PRAGMA busy_timeout")).scalar() for c in (first, second)]
+        described = describe_engine(engine, tuning)
+
+        assert timeouts == [1234, 1234]
+        assert described["effective"] == {
+            "journal_mode": "wal",
+            "synchronous": "normal",
+            "busy_timeout": 1234,
+            "cache_size": -2048,
+            "mmap_size": 1 << 20,
+            "temp_store": "memory",
+        }
+        assert described["effective"] == described["configured"]
+        assert described["pool"]["size"] == 3 and described["pool"]["checkedin"] == 2
+    finally:
+        engine.dispose()
+
+
+def test_in_memory_databases_keep_their_default_pool():
+    engine = build_engine("sqlite:///:memory:", SqliteTuning(), PoolConfig(size=3))
+
+    described = describe_engine(engine)
+
+    assert described["effective"]["journal_mode"] == "memory"  # WAL needs a file
+    assert described["pool"]["class"] == "SingletonThreadPool"
+
+
+def test_unknown_pragma_values_are_rejected():
+    with pytest.raises(ValueError):
+        SqliteTuning(journal_mode="wal; DROP TABLE users")
@@ -0,0 +1,225 @@
+"""SocialGraphCache: CSR lookups agree with the SQL repository, before and after writes."""
+
+import random
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence import graph_cache as graph_cache_module
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.graph_cache import CachedConnectionRepository, SocialGraphCache
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.core.entities import Connection, User
+from app.core.enums import ConnectionSource
+
+
+def _seed_users(session, count: int) -> list[str]:
+    users = SqlUserRepository(session)
+    ids = [f"u{i}" for i in range(count)]
+    for uid in ids:
+        users.create(
+            User(
+                id=uid,
+                name=f"Name {uid}",
+                email=f"{uid}@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+            )
+        )
+    return ids
+
+
+def _random_edges(ids: list[str], count: int, rng: random.Random) -> list[Connection]:
+    edges = []
+    for _ in range(count):
+        a, b = rng.sample(ids, 2)
+        edges.append(
+            Connection(
+                id=str(uuid.uuid4()),
+                user_a=a,
+                user_b=b,
+                source=ConnectionSource.MANUAL,
+                strength=rng.random(),
+            )
+        )
+    return edges
+
+
+def _assert_same(cached: CachedConnectionRepository, sql: SqlConnectionRepository, ids):
+    assert cached.count_connections(ids + ["nobody"]) == sql.count_connections(ids + ["nobody"])
+    for uid in ids + ["nobody"]:
+        assert sorted(c.id for c in cached.get_connections(uid)) == sorted(
+            c.id for c in sql.get_connections(uid)
+        )
+        expected = sql.get_second_degree(uid)
+        actual = cached.get_second_degree(uid)
+        assert actual.keys() == expected.keys()
+        for other, names in expected.items():
+            assert sorted(actual[other]) == sorted(names)
+
+
+def test_cache_matches_sql_repository(sqlite_session):
+    ids = _seed_users(sqlite_session, 30)
+    sql = SqlConnectionRepository(sqlite_session)
+    sql.create_batch(_random_edges(ids, 60, random.Random(7)))
+    cached = CachedConnectionRepository(sqlite_session, SocialGraphCache())
+
+    _assert_same(cached, sql, ids)
+
+    edge = cached.get_connections("u0")[0]
+    stored = next(c for c in sql.get_connections("u0") if c.id == edge.id)
+    assert edge == stored
+
+
+def test_writes_update_loaded_cache(sqlite_session, monkeypatch):
+    monkeypatch.setattr(graph_cache_module, "_MIN_DELTA_BEFORE_REBUILD", 5)
+    ids = _seed_users(sqlite_session, 30)
+    rng = random.Random(11)
+    sql = SqlConnectionRepository(sqlite_session)
+    sql.create_batch(_random_edges(ids, 20, rng))
+    cache = SocialGraphCache()
+    cached = CachedConnectionRepository(sqlite_session, cache)
+    cached.get_connections("u0")  # load
+
+    cached.create(_random_edges(ids, 1, rng)[0])
+    assert cache.stats()["delta_edges"] == 1
+    _assert_same(cached, sql, ids)
+
+    cached.create_batch(_random_edges(ids, 10, rng))
+    stats = cache.stats()
+    assert (stats["edges"], stats["delta_edges"]) == (31, 0)
+    _assert_same(cached, sql, ids)
+
+
+def test_new_users_get_their_names(sqlite_session):
+    ids = _seed_users(sqlite_session, 3)
+    cached = CachedConnectionRepository(sqlite_session, SocialGraphCache())
+    assert cached.get_second_degree("u0") == {}  # loads an empty graph
+
+    cached.create_batch(
+        [
+            Connection(id="e1", user_a="u0", user_b="u1", source=ConnectionSource.MANUAL),
+            Connection(id="e2", user_a="u1", user_b="u2", source=ConnectionSource.MANUAL),
+        ]
+    )
+
+    assert cached.get_second_degree(ids[0]) == {"u2": ["Name u1"]}
+
+
+def test_relate_agrees_with_full_network_lookups(sqlite_session):
+    ids = _seed_users(sqlite_session, 30)
+    sql = SqlConnectionRepository(sqlite_session)
+    sql.create_batch(_random_edges(ids, 45, random.Random(11)))
+    cache = SocialGraphCache()
+    cache.load(sqlite_session)
+
+    for uid in ids[:10]:
+        friends = {c.user_b if c.user_a == uid else c.user_a for c in sql.get_connections(uid)}
+        second = sql.get_second_degree(uid)
+        related = cache.relate(uid, ids + ["nobody"])
+        assert {o for o, (d, _) in related.items() if d == 1} == friends - {uid}
+        assert {o for o, (d, _) in related.items() if d == 2} == second.keys()
+        for other, names in second.items():
+            assert sorted(related[other][1]) == sorted(names)
+        from_sql = sql.relate(uid, ids + ["nobody"])
+        assert {o: (d, sorted(n)) for o, (d, n) in from_sql.items()} == {
+            o: (d, sorted(n)) for o, (d, n) in related.items()
+        }
+
+
+def _bfs_hops(edges: list[Connection], source: str, target: str) -> int | None:
+    adjacency: dict[str, set[str]] = {}
+    for e in edges:
+        adjacency.setdefault(e.user_a, set()).add(e.user_b)
+        adjacency.setdefault(e.user_b, set()).add(e.user_a)
+    seen, frontier, hops = {source}, [source], 0
+    while frontier:
+        if target in frontier:
+            return hops
+        nxt = [n for u in frontier for n in adjacency.get(u, ()) if n not in seen]
+        seen.update(nxt)
+        frontier, hops = list(set(nxt)), hops + 1
+    return None
+
+
+def test_shortest_path_matches_plain_bfs(sqlite_session):
+    ids = _seed_users(sqlite_session, 60)
+    edges = _random_edges(ids, 70, random.Random(5))
+    SqlConnectionRepository(sqlite_session).create_batch(edges[:60])
+    cache = SocialGraphCache()
+    cache.load(sqlite_session)
+    cache.add(edges[60:], {})  # some edges only in the delta
+    linked = {(e.user_a, e.user_b) for e in edges} | {(e.user_b, e.user_a) for e in edges}
+
+    for source, target in [(a, b) for a in ids[:10] for b in ids[::3]]:
+        expected = _bfs_hops(edges, source, target)
+        path = cache.shortest_path(source, target, max_depth=60, max_visited=10_000)
+        if expected is None:
+            assert path is None
+            continue
+        assert (path[0], path[-1], len(path) - 1) == (source, target, expected)
+        assert all(pair in linked for pair in zip(path, path[1:]))
+
+
+def test_sql_shortest_path_agrees_with_cache(sqlite_session):
+    ids = _seed_users(sqlite_session, 60)
+    edges = _random_edges(ids, 70, random.Random(5))
+    sql = SqlConnectionRepository(sqlite_session)
+    sql.create_batch(edges)
+    cache = SocialGraphCache()
+    cache.load(sqlite_session)
+    linked = {(e.user_a, e.user_b) for e in edges} | {(e.user_b, e.user_a) for e in edges}
+
+    for source, target in [(a, b) for a in ids[:10] for b in ids[::3]]:
+        expected = cache.shortest_path(source, target, max_depth=60, max_visited=10_000)
+        path = sql.shortest_path(source, target, max_depth=60, max_visited=10_000)
+        if expected is None:
+            assert path is None
+            continue
+        assert (path[0], path[-1], len(path)) == (source, target, len(expected))
+        assert all(pair in linked for pair in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_shortest_path_limits(sqlite_session, cached):
+    ids = _seed_users(sqlite_session, 8)
+    chain = [
+        Connection(id=f"e{i}", user_a=a, user_b=b, source=ConnectionSource.MANUAL)
+        for i, (a, b) in enumerate(zip(ids, ids[1:]))
+    ]
+    SqlConnectionRepository(sqlite_session).create_batch(chain)
+    if cached:
+        graph = SocialGraphCache()
+        graph.load(sqlite_session)
+    else:
+        graph = SqlConnectionRepository(sqlite_session)
+
+    assert graph.shortest_path("u0", "u7", max_depth=7, max_visited=100) == ids
+    assert graph.shortest_path("u0", "u7", max_depth=6, max_visited=100) is None
+    assert graph.shortest_path("u0", "u7", max_depth=7, max_visited=4) is None
+    assert graph.shortest_path("u0", "u0", max_depth=1, max_visited=1) == ["u0"]
+    assert graph.shortest_path("u0", "nobody", max_depth=7, max_visited=100) is None
+
+
+def test_writes_from_elsewhere_are_picked_up(sqlite_session):
+    ids = _seed_users(sqlite_session, 4)
+    graph = SocialGraphCache()
+    cached = CachedConnectionRepository(sqlite_session, graph)
+    cached.create(Connection(id="c1", user_a="u0", user_b="u1", source=ConnectionSource.MANUAL))
+    assert [c.id for c in cached.get_connections("u0")] == ["c1"]  # loads the graph
+    generation = graph.generation
+    cached.create(Connection(id="c2", user_a="u0", user_b="u2", source=ConnectionSource.MANUAL))
+    assert graph.generation == generation  # our own writes are applied, not reloaded
+
+    # Another process (another worker, seed.py) writes straight to the database.
+    other = sessionmaker(bind=sqlite_session.get_bind())()
+    SqlConnectionRepository(other).create(
+        Connection(id="c3", user_a="u0", user_b=ids[3], source=ConnectionSource.MANUAL)
+    )
+    other.close()
+
+    assert sorted(c.id for c in cached.get_connections("u0")) == ["c1", "c2", "c3"]
+    assert graph.generation > generation  # reloaded
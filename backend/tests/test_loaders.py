@@ -0,0 +1,113 @@
+"""ResponseLoader batching, and list endpoints issuing a fixed number of queries."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+
+from app.adapters.persistence.connection_request_repo import SqlConnectionRequestRepository
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.graph_cache import CachedConnectionRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import get_current_user, get_graph_cache
+from app.api.loaders import ResponseLoader
+from app.core.entities import Connection, ConnectionRequest, Opportunity, User
+from app.core.enums import ConnectionSource, OpportunityType
+
+
+def _user(uid: str) -> User:
+    return User(
+        id=uid,
+        name=f"Name {uid}",
+        email=f"{uid}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=[],
+    )
+
+
+def test_primed_ids_resolve_in_one_call_and_are_memoized():
+    user_repo = MagicMock()
+    user_repo.get_by_ids.side_effect = lambda ids: [_user(i) for i in ids if i != "gone"]
+    loader = ResponseLoader(user_repo, MagicMock())
+
+    loader.prime_users(["a", "b", "gone", "a"])
+    assert loader.user("a").name == "Name a"
+    assert loader.user("b").name == "Name b"
+    assert loader.user("gone") is None
+    user_repo.get_by_ids.assert_called_once_with(["a", "b", "gone"])
+
+    loader.prime_users(["a"])  # already loaded, nothing to fetch
+    assert loader.user("c").id == "c"
+    assert user_repo.get_by_ids.call_args.args == (["c"],)
+    assert user_repo.get_by_ids.call_count == 2
+
+
+def _seed(session, start: int, stop: int) -> None:
+    users = SqlUserRepository(session)
+    opps = SqlOpportunityRepository(session)
+    requests = SqlConnectionRequestRepository(session)
+    connections = CachedConnectionRepository(session, get_graph_cache())
+    if not users.get_by_id("me"):
+        users.create(_user("me"))
+    for i in range(start, stop):
+        users.create(_user(f"u{i}"))
+        opps.create(
+            Opportunity(
+                id=f"o{i}",
+                title=f"Role {i}",
+                description="",
+                type=OpportunityType.JOB,
+                posted_by=f"u{i}",
+            )
+        )
+        requests.create(
+            ConnectionRequest(
+                id=f"r{i}", from_user_id=f"u{i}", to_user_id="me", opportunity_id=f"o{i}"
+            )
+        )
+        connections.create(
+            Connection(id=f"c{i}", user_a="me", user_b=f"u{i}", source=ConnectionSource.MATCH)
+        )
+
+
+def _count_statements(client, path: str, key: str, rows: int) -> int:
+    statements = []
+    session = next(client.app.dependency_overrides[get_session]())
+    engine = session.get_bind()
+    session.close()
+
+    def listener(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body[key]) == rows
+    return len(statements)
+
+
+@pytest.mark.parametrize(
+    "path, key",
+    [
+        ("/api/opportunities", "items"),
+        ("/api/connection-requests/incoming", "items"),
+        ("/api/users/me/network", "connections"),
+        ("/api/users/network/me", "first_degree"),
+    ],
+)
+def test_list_endpoints_issue_a_fixed_number_of_queries(client, path, key):
+    client.app.dependency_overrides[get_current_user] = lambda: _user("me")
+    session = next(client.app.dependency_overrides[get_session]())
+    _seed(session, 0, 2)
+    client.get(path)  # the first request also loads the graph cache
+    small = _count_statements(client, path, key, 2)
+    _seed(session, 2, 12)
+    session.close()
+    assert _count_statements(client, path, key, 12) == small
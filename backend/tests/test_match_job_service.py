@@ -0,0 +1,126 @@
+"""MatchJobService streams: one ranking per opportunity at a time, kept if the client leaves."""
+
+import asyncio
+from contextlib import contextmanager
+
+from app.core.entities import CandidateScore, Match, Opportunity, User
+from app.core.enums import MatchJobStatus, OpportunityType
+from app.services.match_job_service import MatchJobService
+
+
+def _user(uid: str) -> User:
+    return User(
+        id=uid, name=f"Name {uid}", email=f"{uid}@x", bio="", skills=[], interests=[], open_to=[]
+    )
+
+
+class _FakeMatching:
+    """Stands in for MatchingService: ranks candidates slowly and stores them at the end."""
+
+    def __init__(self):
+        self.stored: list[Match] = []
+        self.rankings = 0
+        self.sessions_open = 0
+
+    @contextmanager
+    def scope(self):
+        self.sessions_open += 1
+        try:
+            yield self
+        finally:
+            self.sessions_open -= 1
+
+    def get_matches(self, opportunity_id: str) -> list[Match]:
+        return list(self.stored)
+
+    def get_users(self, user_ids: list[str]) -> list[User]:
+        return [_user(uid) for uid in user_ids]
+
+    def retrieve_candidates(self, opportunity: Opportunity, top_k: int) -> list[CandidateScore]:
+        return [CandidateScore(_user(f"u{i}"), 0.5, 0.0, 0.5) for i in range(3)]
+
+    async def rank_candidates(self, opportunity, candidates) -> list[Match]:
+        return [m async for m in self.stream_rank_candidates(opportunity, candidates)]
+
+    async def stream_rank_candidates(self, opportunity, candidates):
+        self.rankings += 1
+        matches = []
+        for rank, c in enumerate(candidates, start=1):
+            await asyncio.sleep(0.01)
+            match = Match(
+                id=f"m{rank}",
+                opportunity_id=opportunity.id,
+                user_id=c.user.id,
+                score=1.0 / rank,
+                embedding_score=c.embedding_score,
+                network_score=c.network_score,
+                explanation="",
+                rank=rank,
+            )
+            matches.append(match)
+            yield match
+        self.stored.extend(matches)
+
+
+_OPPORTUNITY = Opportunity(
+    id="o1", title="t", description="d", type=OpportunityType.JOB, posted_by="poster"
+)
+
+
+async def _collect(jobs: MatchJobService, svc: _FakeMatching) -> list[tuple[str, object]]:
+    return [event async for event in jobs.stream(_OPPORTUNITY, svc.scope)]
+
+
+def test_concurrent_streams_rank_once_and_replay():
+    svc = _FakeMatching()
+
+    async def run():
+        jobs = MatchJobService(workers=1, queue_size=4, retention=10)
+        return await asyncio.gather(_collect(jobs, svc), _collect(jobs, svc))
+
+    first, second = asyncio.run(run())
+
+    assert svc.rankings == 1 and len(svc.stored) == 3
+    assert [kind for kind, _ in first] == ["candidates", "match", "match", "match"]
+    assert [kind for kind, _ in second] == ["match", "match", "match"]
+    assert [m.id for _, (m, _) in second] == [m.id for m in svc.stored]
+    assert svc.sessions_open == 0
+
+
+def test_job_waits_for_a_running_stream_and_replays_it():
+    svc = _FakeMatching()
+
+    async def run():
+        jobs = MatchJobService(workers=1, queue_size=4, retention=10)
+        jobs.start()
+        try:
+            stream = asyncio.create_task(_collect(jobs, svc))
+            await asyncio.sleep(0)
+            job = jobs.submit(_OPPORTUNITY, svc.scope)
+            await stream
+            while job.status != MatchJobStatus.DONE:
+                await asyncio.sleep(0.01)
+            return job
+        finally:
+            await jobs.stop()
+
+    job = asyncio.run(run())
+
+    assert svc.rankings == 1
+    assert [m.id for m in job.matches] == ["m1", "m2", "m3"]
+
+
+def test_disconnected_stream_still_stores_the_ranking():
+    svc = _FakeMatching()
+
+    async def run():
+        jobs = MatchJobService(workers=1, queue_size=4, retention=10)
+        events = jobs.stream(_OPPORTUNITY, svc.scope)
+        assert (await anext(events))[0] == "candidates"
+        await events.aclose()  # the client went away
+        while svc.sessions_open:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert [m.id for m in svc.stored] == ["m1", "m2", "m3"]
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from app.core.entities import (
+    CandidateScore,
     Connection,
     Opportunity,
     RankedMatch,
@@ -14,6 +15,7 @@ from app.core.entities import (
 from app.core.enums import ConnectionSource, OpportunityType
 from app.services.matching_service import (
     FIRST_DEGREE_BOOST,
+    MAX_PROXIMITY_BOOST,
     SECOND_DEGREE_BOOST,
     MatchingService,
 )
@@ -52,7 +54,12 @@ def _make_opportunity(
 
 @pytest.fixture
 def user_repo():
-    return MagicMock()
+    repo = MagicMock()
+    # Phase 1 hydrates hits in bulk; resolve them through whatever get_by_id a test configures.
+    repo.get_by_ids = MagicMock(
+        side_effect=lambda ids: [u for u in (repo.get_by_id(i) for i in ids) if u]
+    )
+    return repo
 
 
 @pytest.fixture
@@ -157,6 +164,20 @@ def test_phase1_excludes_user_when_opp_type_not_in_open_to(
     ai_port.rank_and_explain.assert_not_called()
 
 
+def test_phase1_pushes_open_to_filter_into_vector_search(
+    matching_service, user_repo, connection_repo, embedding_port, ai_port
+):
+    opp = _make_opportunity(posted_by="poster-1", opp_type=OpportunityType.DATE)
+    embedding_port.search_similar = MagicMock(return_value=[])
+
+    _run_async(matching_service.find_matches(opp, top_k=5))
+
+    kwargs = embedding_port.search_similar.call_args.kwargs
+    assert kwargs["where"] == {"open_to_date": True}
+    # Only the poster can be dropped after the search, so no over-fetching is needed.
+    assert kwargs["n_results"] == 6
+
+
 # ----- Phase 1: network boosts -----
 
 
@@ -232,6 +253,42 @@ def test_phase1_second_degree_gets_boost(
 # ----- Phase 1: top_k -----
 
 
+def test_phase1_proximity_index_replaces_fixed_boosts(
+    user_repo, match_repo, connection_repo, embedding_port, ai_port
+):
+    proximity = MagicMock()
+    proximity.get_scores = MagicMock(return_value={"near": 1.0, "far": 0.2})
+    service = MatchingService(
+        user_repo=user_repo,
+        match_repo=match_repo,
+        connection_repo=connection_repo,
+        embedding=embedding_port,
+        ai=ai_port,
+        proximity=proximity,
+    )
+    users = {uid: _make_user(uid, open_to=["job"]) for uid in ["near", "far", "stranger"]}
+    embedding_port.search_similar = MagicMock(
+        return_value=[{"user_id": uid, "score": 0.5} for uid in users]
+    )
+    user_repo.get_by_id = MagicMock(side_effect=users.get)
+    proximity.relate = MagicMock(return_value={"far": (2, ["Friend"])})
+    connection_repo.get_connections = MagicMock()
+    connection_repo.get_second_degree = MagicMock()
+
+    candidates = service.retrieve_candidates(_make_opportunity(posted_by="poster-1"))
+
+    proximity.get_scores.assert_called_once_with("poster-1")
+    proximity.relate.assert_called_once_with("poster-1", ["near", "far", "stranger"])
+    connection_repo.get_connections.assert_not_called()
+    connection_repo.get_second_degree.assert_not_called()
+    scores = {c.user.id: (c.network_score, c.shared_connections) for c in candidates}
+    assert scores == {
+        "near": (pytest.approx(MAX_PROXIMITY_BOOST), []),
+        "far": (pytest.approx(0.2 * MAX_PROXIMITY_BOOST), ["Friend"]),
+        "stranger": (0.0, []),
+    }
+
+
 def test_phase1_returns_only_top_k_candidates_to_ai(
     matching_service, user_repo, connection_repo, embedding_port, ai_port
 ):
@@ -379,7 +436,6 @@ def test_find_matches_integration_real_repos_mocked_embedding_ai():
     from sqlalchemy.orm import sessionmaker
 
     from app.adapters.persistence.database import Base
-    from app.adapters.persistence import models  # noqa: F401
     from app.adapters.persistence.connection_repo import SqlConnectionRepository
     from app.adapters.persistence.match_repo import SqlMatchRepository
     from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
@@ -483,3 +539,275 @@ def test_find_matches_integration_real_repos_mocked_embedding_ai():
             os.unlink(path)
         except OSError:
             pass
+
+
+def test_phase1_issues_fixed_number_of_queries_regardless_of_top_k():
+    """Candidate hydration is one IN query, so SQL round trips don't grow with top_k."""
+    import os
+    import tempfile
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.adapters.persistence.database import Base
+    from app.adapters.persistence.connection_repo import SqlConnectionRepository
+    from app.adapters.persistence.match_repo import SqlMatchRepository
+    from app.adapters.persistence.user_repo import SqlUserRepository
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+        user_repo = SqlUserRepository(session)
+        candidate_ids = [f"candidate-{i}" for i in range(30)]
+        for uid in ["poster-1", *candidate_ids]:
+            user = _make_user(uid, open_to=["job"])
+            user.email = f"{uid}@example.com"
+            user_repo.create(user)
+        SqlConnectionRepository(session).create(
+            Connection(
+                id="conn-1",
+                user_a="poster-1",
+                user_b=candidate_ids[0],
+                source=ConnectionSource.MANUAL,
+            )
+        )
+
+        embedding = MagicMock()
+        embedding.search_similar = MagicMock(
+            side_effect=lambda text, n_results, **kwargs: [
+                {"user_id": uid, "score": 0.9} for uid in ["poster-1", *candidate_ids][:n_results]
+            ]
+        )
+        service = MatchingService(
+            user_repo=user_repo,
+            match_repo=SqlMatchRepository(session),
+            connection_repo=SqlConnectionRepository(session),
+            embedding=embedding,
+            ai=MagicMock(),
+        )
+        opp = _make_opportunity(posted_by="poster-1")
+
+        statements: list[str] = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        counts = {}
+        for top_k in (1, 5, 10):
+            statements.clear()
+            candidates = service._phase1_retrieval(opp, top_k)
+            assert len(candidates) == top_k
+            counts[top_k] = len(statements)
+
+        assert counts[1] == counts[5] == counts[10]
+        session.close()
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+# ----- Phase 2 ranking cache -----
+
+
+@pytest.fixture
+def db_session():
+    import os
+    import tempfile
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.adapters.persistence.database import Base
+    from app.adapters.persistence import models  # noqa: F401
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _cached_service(db_session, ai_port, max_entries=100):
+    from app.adapters.persistence.ranking_cache_repo import SqlRankingCacheRepository
+
+    cache = SqlRankingCacheRepository(db_session, ttl_seconds=3600, max_entries=max_entries)
+    service = MatchingService(
+        user_repo=MagicMock(),
+        match_repo=MagicMock(),
+        connection_repo=MagicMock(),
+        embedding=MagicMock(),
+        ai=ai_port,
+        ranking_cache=cache,
+    )
+    return service, cache
+
+
+def _candidates(*users: User):
+    from app.core.entities import CandidateScore
+
+    return [
+        CandidateScore(user=u, embedding_score=0.5, network_score=0.0, combined_score=0.5)
+        for u in users
+    ]
+
+
+def test_phase2_reuses_cached_ranking_for_unchanged_inputs(db_session, ai_port):
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id="u1", rank=1, score=0.9, explanation="Great")]
+    )
+    service, cache = _cached_service(db_session, ai_port)
+    opp = _make_opportunity()
+    candidates = _candidates(_make_user("u1"))
+
+    first = _run_async(service._phase2_explain(opp, candidates))
+    second = _run_async(service._phase2_explain(opp, candidates))
+
+    assert ai_port.rank_and_explain.call_count == 1
+    assert second == first
+    assert cache.stats()["entries"] == 1
+
+
+def test_phase2_cache_misses_when_candidate_profile_changes(db_session, ai_port):
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id="u1", rank=1, score=0.9, explanation="Great")]
+    )
+    service, _ = _cached_service(db_session, ai_port)
+    opp = _make_opportunity()
+    user = _make_user("u1")
+
+    _run_async(service._phase2_explain(opp, _candidates(user)))
+    user.bio = "Now a Rust developer"
+    _run_async(service._phase2_explain(opp, _candidates(user)))
+
+    assert ai_port.rank_and_explain.call_count == 2
+
+
+def test_ranking_cache_invalidate_user_drops_entries(db_session, ai_port):
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id="u1", rank=1, score=0.9, explanation="Great")]
+    )
+    service, cache = _cached_service(db_session, ai_port)
+    opp = _make_opportunity()
+    candidates = _candidates(_make_user("u1"))
+    _run_async(service._phase2_explain(opp, candidates))
+
+    assert cache.invalidate_user("u1") == 1
+    _run_async(service._phase2_explain(opp, candidates))
+    assert ai_port.rank_and_explain.call_count == 2
+
+
+def test_ranking_cache_skips_fallback_and_respects_size_bound(db_session, ai_port):
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[
+            RankedMatch(user_id="u1", rank=1, score=0.5, explanation="", is_fallback=True)
+        ]
+    )
+    service, cache = _cached_service(db_session, ai_port, max_entries=2)
+    _run_async(service._phase2_explain(_make_opportunity(), _candidates(_make_user("u1"))))
+    assert cache.stats()["entries"] == 0
+
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id="u1", rank=1, score=0.9, explanation="Great")]
+    )
+    for i in range(3):
+        opp = _make_opportunity(opp_id=f"opp-{i}")
+        opp.title = f"Role {i}"
+        _run_async(service._phase2_explain(opp, _candidates(_make_user("u1"))))
+    assert cache.stats()["entries"] == 2
+
+
+# ----- Batch re-matching -----
+
+
+def test_find_matches_batch_one_search_per_type_and_one_write(
+    matching_service, user_repo, match_repo, connection_repo, embedding_port, ai_port
+):
+    opportunities = [
+        _make_opportunity(opp_id="opp-1", posted_by="poster-1"),
+        _make_opportunity(opp_id="opp-2", posted_by="poster-1"),
+        _make_opportunity(opp_id="opp-3", posted_by="poster-2", opp_type=OpportunityType.PROJECT),
+    ]
+    candidate = _make_user("candidate-1", open_to=["job", "project"])
+    embedding_port.search_similar_batch = MagicMock(
+        side_effect=lambda texts, **kwargs: [
+            [{"user_id": candidate.id, "score": 0.7}] for _ in texts
+        ]
+    )
+    user_repo.get_by_id = MagicMock(return_value=candidate)
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id=candidate.id, rank=1, score=0.8, explanation="Ok")]
+    )
+    progress = []
+
+    result = _run_async(
+        matching_service.find_matches_batch(
+            opportunities, concurrency=2, on_progress=lambda done, matches: progress.append(done)
+        )
+    )
+
+    wheres = [c.kwargs["where"] for c in embedding_port.search_similar_batch.call_args_list]
+    assert wheres == [{"open_to_job": True}, {"open_to_project": True}]
+    assert sorted(c.args[0] for c in connection_repo.get_connections.call_args_list) == [
+        "poster-1",
+        "poster-2",
+    ]
+    user_repo.get_by_ids.assert_called_once()
+    assert ai_port.rank_and_explain.await_count == 3
+    assert sorted(progress) == [1, 2, 3]
+    assert {opp_id: len(m) for opp_id, m in result.items()} == {"opp-1": 1, "opp-2": 1, "opp-3": 1}
+    match_repo.replace_for_opportunities.assert_called_once()
+    opp_ids, written = match_repo.replace_for_opportunities.call_args.args
+    assert opp_ids == ["opp-1", "opp-2", "opp-3"]
+    assert len(written) == 3
+    match_repo.create_batch.assert_not_called()
+
+
+def test_find_matches_batch_keeps_matches_of_opportunities_without_new_ones(
+    matching_service, match_repo, ai_port
+):
+    opportunities = [_make_opportunity(opp_id="opp-1"), _make_opportunity(opp_id="opp-2")]
+    candidate = CandidateScore(
+        user=_make_user("candidate-1", open_to=["job"]),
+        embedding_score=0.7,
+        network_score=0.0,
+        combined_score=0.7,
+    )
+    ai_port.rank_and_explain = AsyncMock(
+        return_value=[RankedMatch(user_id="candidate-1", rank=1, score=0.8, explanation="Ok")]
+    )
+
+    result = _run_async(
+        matching_service.find_matches_batch(
+            opportunities, candidates={"opp-1": [candidate], "opp-2": []}
+        )
+    )
+
+    assert result["opp-2"] == []
+    opp_ids, written = match_repo.replace_for_opportunities.call_args.args
+    assert opp_ids == ["opp-1"] and [m.opportunity_id for m in written] == ["opp-1"]
+
+    match_repo.replace_for_opportunities.reset_mock()
+    empty = {"opp-1": [], "opp-2": []}
+    _run_async(matching_service.find_matches_batch(opportunities, candidates=empty))
+    match_repo.replace_for_opportunities.assert_not_called()
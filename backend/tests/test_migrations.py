@@ -0,0 +1,162 @@
+"""Schema migrations: fresh databases, pre-migration databases, and re-runs."""
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.migrations import MIGRATIONS, current_version, migrate
+from app.adapters.persistence.models import (
+    AUTH_VERSION_TRIGGERS,
+    RESOURCE_VERSION_TRIGGERS,
+    REVOKED_TOKENS_TRIGGER,
+)
+
+
+@pytest.fixture
+def make_engine():
+    paths, engines = [], []
+
+    def make():
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        paths.append(path)
+        engines.append(create_engine(f"sqlite:///{path}"))
+        return engines[-1]
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+    for path in paths:
+        os.unlink(path)
+
+
+def _schema(engine) -> set[tuple[str, str, tuple[str, ...]]]:
+    """(type, name, indexed columns) of every table, index and trigger."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT type, name FROM sqlite_master "
+                "WHERE type IN ('table', 'index', 'trigger') AND name NOT LIKE 'sqlite_%'"
+            )
+        ).all()
+        return {
+            (
+                kind,
+                name,
+                tuple(r[2] for r in conn.execute(text(f"PRAGMA index_info({name})")))
+                if kind == "index"
+                else (),
+            )
+            for kind, name in rows
+        }
+
+
+def test_fresh_database_is_migrated_to_latest(make_engine):
+    engine = make_engine()
+
+    assert migrate(engine) == [version for version, _, _ in MIGRATIONS]
+    assert current_version(engine) == MIGRATIONS[-1][0]
+    assert migrate(engine) == []
+
+
+def test_legacy_database_is_upgraded_in_place(make_engine):
+    legacy = make_engine()
+    Base.metadata.create_all(bind=legacy)
+    with legacy.begin() as conn:
+        # A database from before migrations: same tables, no hot-path indexes, some data.
+        for index in [
+            "ix_connections_user_a",
+            "ix_connections_user_b",
+            "ix_feedback_pair",
+            "ix_connections_user_a_created",
+        ]:
+            conn.execute(text(f"DROP INDEX {index}"))
+        # ...and an ordering index in its version 2 shape, without the id tie-breaker.
+        conn.execute(text("DROP INDEX ix_users_created_at"))
+        conn.execute(text("CREATE INDEX ix_users_created_at ON users (created_at)"))
+        # ...and no full-text index yet.
+        for trigger in ["users_fts_insert", "users_fts_delete", "users_fts_update"]:
+            conn.execute(text(f"DROP TRIGGER {trigger}"))
+        conn.execute(text("DROP TABLE users_fts"))
+        conn.execute(text("DROP TABLE users_fts_keys"))
+        # ...and no resource version counters.
+        for statement in RESOURCE_VERSION_TRIGGERS + AUTH_VERSION_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER {statement.split()[5]}"))
+        conn.execute(text("DROP TABLE resource_versions"))
+        # ...and no signed-token denylist.
+        conn.execute(text(f"DROP TRIGGER {REVOKED_TOKENS_TRIGGER.split()[5]}"))
+        conn.execute(text("DROP TABLE revoked_tokens"))
+        # ...and matches that do not record where they came from.
+        conn.execute(text("ALTER TABLE matches DROP COLUMN source"))
+        conn.execute(
+            text(
+                "INSERT INTO users (id, name, email, password_hash, bio, skills, interests, "
+                "open_to) VALUES ('u1', 'Ana', 'a@x', '', '', '[]', '[]', '[]')"
+            )
+        )
+
+    assert migrate(legacy) == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    fresh = make_engine()
+    Base.metadata.create_all(bind=fresh)
+    bookkeeping = {("table", "schema_migrations", ()), ("table", "sqlite_stat1", ())}
+    assert _schema(legacy) - bookkeeping == _schema(fresh)
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT name FROM users")).scalar() == "Ana"
+        # Rows that predate the full-text index are searchable once it is built.
+        assert (
+            conn.execute(text("SELECT rowid FROM users_fts WHERE users_fts MATCH 'ana'")).scalar()
+            == 1
+        )
+        conn.execute(
+            text(
+                "INSERT INTO connections (id, user_a, user_b, source, strength) "
+                "VALUES ('c1', 'u1', 'u1', 'seed', 1.0)"
+            )
+        )
+        assert (
+            conn.execute(text("SELECT version FROM resource_versions WHERE key = 'graph'")).scalar()
+            == 1
+        )
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(matches)"))}
+        assert "source" in columns
+
+
+def test_rowid_keyed_index_is_rebuilt_by_user_id(make_engine):
+    engine = make_engine()
+    migrate(engine)
+    with engine.begin() as conn:
+        # The version 4 index: external content, read back from users by implicit rowid.
+        for trigger in ["users_fts_insert", "users_fts_delete", "users_fts_update"]:
+            conn.execute(text(f"DROP TRIGGER {trigger}"))
+        conn.execute(text("DROP TABLE users_fts"))
+        conn.execute(text("DROP TABLE users_fts_keys"))
+        conn.execute(
+            text(
+                "CREATE VIRTUAL TABLE users_fts USING fts5(name, bio, skills, interests, "
+                "content='users', content_rowid='rowid')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO users (id, name, email, password_hash, bio, skills, interests, "
+                "open_to) VALUES ('u1', 'Ana', 'a@x', '', '', '[]', '[]', '[]')"
+            )
+        )
+        conn.execute(text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')"))
+        conn.execute(text("DELETE FROM schema_migrations WHERE version >= 9"))
+
+    assert migrate(engine) == [9, 10]
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET rowid = rowid + 100"))  # as a rebuild may
+        found = conn.execute(
+            text(
+                "SELECT k.user_id FROM users_fts "
+                "JOIN users_fts_keys k ON k.rowid = users_fts.rowid WHERE users_fts MATCH 'ana'"
+            )
+        )
+        assert found.scalars().all() == ["u1"]
@@ -0,0 +1,135 @@
+"""Unit tests for NumpyEmbeddingAdapter: search, open_to filtering, deletes, persistence."""
+
+import numpy as np
+import pytest
+
+from app.adapters.embeddings import numpy_adapter
+from app.adapters.embeddings.numpy_adapter import NumpyEmbeddingAdapter
+from app.ports.embedding_port import open_to_metadata
+
+_VECTORS = {
+    "python backend": [1.0, 0.0, 0.0],
+    "python data": [0.8, 0.6, 0.0],
+    "design": [0.0, 0.0, 1.0],
+}
+
+
+def _embed(texts):
+    return [np.array(_VECTORS[t], dtype=np.float32) for t in texts]
+
+
+def _adapter(path, **kwargs) -> NumpyEmbeddingAdapter:
+    return NumpyEmbeddingAdapter(index_dir=str(path), embedding_fn=_embed, **kwargs)
+
+
+def _seed(adapter: NumpyEmbeddingAdapter) -> None:
+    adapter.upsert_profile("u-backend", "python backend", open_to_metadata(["job"]))
+    adapter.upsert_profile("u-data", "python data", open_to_metadata(["project"]))
+    adapter.upsert_profile("u-design", "design", open_to_metadata(["job"]))
+
+
+@pytest.mark.parametrize("storage_dtype", ["float32", "float16", "int8"])
+def test_search_ranks_by_cosine_similarity(tmp_path, storage_dtype):
+    adapter = _adapter(tmp_path, storage_dtype=storage_dtype)
+    _seed(adapter)
+
+    results = adapter.search_similar("python backend", n_results=2)
+
+    assert [r["user_id"] for r in results] == ["u-backend", "u-data"]
+    assert results[0]["score"] == pytest.approx(1.0)
+    assert results[1]["score"] == pytest.approx(0.8)
+
+
+def test_search_filters_on_metadata(tmp_path):
+    adapter = _adapter(tmp_path)
+    _seed(adapter)
+
+    results = adapter.search_similar("python data", n_results=5, where={"open_to_job": True})
+
+    assert [r["user_id"] for r in results] == ["u-backend", "u-design"]
+
+
+def test_upsert_profile_embeds_once_and_returns_the_vector(tmp_path):
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return _embed(texts)
+
+    adapter = NumpyEmbeddingAdapter(index_dir=str(tmp_path), embedding_fn=embed)
+
+    vector = adapter.upsert_profile("u-data", "python data", open_to_metadata(["job"]))
+
+    assert vector == pytest.approx([0.8, 0.6, 0.0])
+    assert calls == [["python data"]]
+
+
+def test_upsert_existing_profile_replaces_row(tmp_path):
+    adapter = _adapter(tmp_path)
+    _seed(adapter)
+
+    adapter.upsert_profile("u-design", "python backend", open_to_metadata(["job"]))
+
+    assert adapter.stats()["rows"] == 3
+    top = adapter.search_similar("python backend", n_results=2)
+    assert {r["user_id"] for r in top} == {"u-backend", "u-design"}
+
+
+def test_delete_tombstones_then_compacts(tmp_path):
+    adapter = _adapter(tmp_path, compact_ratio=0.5)
+    _seed(adapter)
+
+    adapter.delete_profile("u-backend")
+    assert adapter.stats()["tombstones"] == 1
+    assert "u-backend" not in [r["user_id"] for r in adapter.search_similar("python backend")]
+
+    adapter.delete_profile("u-data")
+    stats = adapter.stats()
+    assert stats["tombstones"] == 0
+    assert stats["rows"] == 1
+    assert [r["user_id"] for r in adapter.search_similar("design")] == ["u-design"]
+
+
+def test_index_survives_reopen(tmp_path):
+    adapter = _adapter(tmp_path, storage_dtype="int8")
+    _seed(adapter)
+    adapter.delete_profile("u-data")
+
+    reopened = _adapter(tmp_path, storage_dtype="int8")
+
+    results = reopened.search_similar("python data", n_results=5)
+    assert [r["user_id"] for r in results] == ["u-backend", "u-design"]
+    assert results[0]["metadata"]["open_to_job"] is True
+
+
+def test_batch_search_matches_single_searches(tmp_path):
+    adapter = _adapter(tmp_path, storage_dtype="int8")
+    _seed(adapter)
+    queries = ["python backend", "design"]
+
+    batch = adapter.search_similar_batch(queries, n_results=2, where={"open_to_job": True})
+
+    assert batch == [
+        adapter.search_similar(q, n_results=2, where={"open_to_job": True}) for q in queries
+    ]
+
+
+@pytest.mark.parametrize("storage_dtype", ["float32", "int8"])
+def test_chunked_scan_matches_brute_force(tmp_path, monkeypatch, storage_dtype):
+    monkeypatch.setattr(numpy_adapter, "_SCAN_CHUNK_ROWS", 7)
+    monkeypatch.setattr(numpy_adapter, "_SCAN_CHUNK_QUERIES", 3)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    queries = rng.normal(size=(10, 8)).astype(np.float32)
+    adapter = _adapter(tmp_path, storage_dtype=storage_dtype, rescore_factor=50)
+    adapter.upsert_vectors(
+        [f"u{i}" for i in range(50)], vectors, [{"even": i % 2 == 0} for i in range(50)]
+    )
+
+    batch = adapter.search_by_vectors(queries, n_results=5, where={"even": True})
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    for query, hits in zip(queries, batch):
+        scores = unit[::2] @ (query / np.linalg.norm(query))
+        expected = [f"u{2 * i}" for i in np.argsort(-scores)[:5]]
+        assert [h["user_id"] for h in hits] == expected
@@ -1,7 +1,24 @@
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import (
+    get_match_jobs,
+    get_matching_service_scope,
+    get_opportunity_service,
+)
+from app.core.entities import Match, Opportunity, User
+from app.core.enums import OpportunityType
+from app.services.match_job_service import MatchJobQueueFull
+
+
 def test_list_opportunities_empty(client):
     response = client.get("/api/opportunities")
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 def test_create_opportunity_returns_201(client):
@@ -108,3 +125,149 @@ def test_create_opportunity_user_not_found_returns_400(client):
     )
     assert response.status_code == 400
     assert response.json()["detail"] == "User not found"
+
+
+def test_create_opportunity_job_mode_returns_202_and_job_completes(client):
+    user_resp = client.post(
+        "/api/users",
+        json={
+            "name": "Poster",
+            "bio": "",
+            "skills": [],
+            "interests": [],
+            "open_to": [],
+        },
+    )
+    user_id = user_resp.json()["id"]
+
+    response = client.post(
+        "/api/opportunities?mode=job",
+        json={
+            "title": "Async",
+            "description": "Desc",
+            "type": "job",
+            "posted_by": user_id,
+        },
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] in ("pending", "partial", "done")
+
+    for _ in range(50):
+        status = client.get(f"/api/opportunities/jobs/{job['job_id']}").json()
+        if status["status"] == "done":
+            break
+        time.sleep(0.02)
+    assert status["status"] == "done"
+    assert status["opportunity_id"] == job["opportunity_id"]
+    assert client.get(f"/api/opportunities/{job['opportunity_id']}").status_code == 200
+
+
+def test_create_opportunity_job_mode_queue_full_returns_503(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    SqlUserRepository(session).create(
+        User(
+            id="poster",
+            name="Poster",
+            email="poster@example.com",
+            bio="",
+            skills=[],
+            interests=[],
+            open_to=[],
+        )
+    )
+    session.close()
+    jobs = MagicMock()
+    jobs.is_full = MagicMock(return_value=False)  # fills up between the check and submit
+    jobs.submit = MagicMock(side_effect=MatchJobQueueFull())
+    client.app.dependency_overrides[get_match_jobs] = lambda: jobs
+    svc = MagicMock()
+    svc.create = MagicMock(side_effect=lambda opportunity: opportunity)
+    client.app.dependency_overrides[get_opportunity_service] = lambda: svc
+
+    response = client.post(
+        "/api/opportunities?mode=job",
+        json={"title": "Async", "description": "Desc", "type": "job", "posted_by": "poster"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_get_match_job_not_found_returns_404(client):
+    response = client.get("/api/opportunities/jobs/nonexistent-id")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job not found"
+
+
+def test_stream_matches_sends_candidates_then_done(client):
+    user_resp = client.post(
+        "/api/users",
+        json={
+            "name": "Poster",
+            "bio": "",
+            "skills": [],
+            "interests": [],
+            "open_to": [],
+        },
+    )
+    user_id = user_resp.json()["id"]
+    create = client.post(
+        "/api/opportunities",
+        json={
+            "title": "Stream Me",
+            "description": "Desc",
+            "type": "fun",
+            "posted_by": user_id,
+        },
+    )
+    opp_id = create.json()["opportunity"]["id"]
+
+    response = client.get(f"/api/opportunities/{opp_id}/matches/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event:")
+    ]
+    assert events == ["candidates", "done"]
+
+
+def test_stream_matches_replays_stored_matches(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    ana = User(id="u1", name="Ana", email="a@x", bio="", skills=[], interests=[], open_to=[])
+    SqlUserRepository(session).create(ana)
+    SqlOpportunityRepository(session).create(
+        Opportunity(id="o1", title="t", description="d", type=OpportunityType.JOB, posted_by="u1")
+    )
+    session.close()
+    stored = Match(
+        id="m1",
+        opportunity_id="o1",
+        user_id="u1",
+        score=0.9,
+        embedding_score=0.8,
+        network_score=0.1,
+        explanation="",
+        rank=1,
+    )
+    svc = MagicMock()
+    svc.get_matches = MagicMock(return_value=[stored])
+    svc.get_users = MagicMock(return_value=[ana])
+
+    @contextmanager
+    def scope():
+        yield svc
+
+    client.app.dependency_overrides[get_matching_service_scope] = lambda: scope
+
+    response = client.get("/api/opportunities/o1/matches/stream")
+
+    events = [line for line in response.text.splitlines() if line.startswith("event:")]
+    assert events == ["event: match", "event: done"]
+    assert '"user_name": "Ana"' in response.text
+    svc.retrieve_candidates.assert_not_called()
+
+
+def test_stream_matches_not_found_returns_404(client):
+    response = client.get("/api/opportunities/nonexistent-id/matches/stream")
+    assert response.status_code == 404
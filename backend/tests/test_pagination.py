@@ -0,0 +1,161 @@
+"""Keyset pagination: walking every page returns each row once, in list order."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.graph_cache import CachedConnectionRepository, SocialGraphCache
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import get_current_user
+from app.api.pagination import PageParams, decode_cursor, encode_cursor, split_page
+from app.core.entities import Connection, Opportunity, User
+from app.core.enums import ConnectionSource, OpportunityType
+
+_T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _user(uid: str, created_at: datetime) -> User:
+    return User(
+        id=uid,
+        name=f"Name {uid}",
+        email=f"{uid}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=[],
+        created_at=created_at,
+    )
+
+
+def _session(client):
+    return next(client.app.dependency_overrides[get_session]())
+
+
+def _walk(client, path: str, key: str, limit: int) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit} | ({"cursor": cursor} if cursor else {})
+        body = client.get(path, params=params).json()
+        pages.append([item["id"] for item in body[key]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_users_pages_cover_every_user_once_with_ties(client):
+    session = _session(client)
+    # Pairs of users share a created_at, so the id has to break the tie.
+    ids = [f"u{i:02d}" for i in range(11)]
+    for i, uid in enumerate(ids):
+        SqlUserRepository(session).create(_user(uid, _T0 + timedelta(seconds=i // 2)))
+    session.close()
+
+    pages = _walk(client, "/api/users", "items", limit=4)
+
+    assert [len(p) for p in pages] == [4, 4, 3]
+    assert sum(pages, []) == ids
+
+
+def test_opportunities_pages_are_newest_first(client):
+    session = _session(client)
+    SqlUserRepository(session).create(_user("poster", _T0))
+    for i in range(5):
+        SqlOpportunityRepository(session).create(
+            Opportunity(
+                id=f"o{i}",
+                title="t",
+                description="",
+                type=OpportunityType.JOB,
+                posted_by="poster",
+                created_at=_T0 + timedelta(minutes=i % 3),
+            )
+        )
+    session.close()
+
+    pages = _walk(client, "/api/opportunities", "items", limit=2)
+
+    assert sum(pages, []) == ["o2", "o4", "o1", "o3", "o0"]
+    assert pages[-1] == ["o0"]
+
+
+def test_network_pages(client):
+    session = _session(client)
+    for uid in ["me", "a", "b", "c"]:
+        SqlUserRepository(session).create(_user(uid, _T0))
+    SqlConnectionRepository(session).create_batch(
+        [
+            Connection(
+                id=f"c{i}",
+                user_a="me" if i % 2 else other,
+                user_b=other if i % 2 else "me",
+                source=ConnectionSource.SEED,
+                created_at=_T0 + timedelta(seconds=i),
+            )
+            for i, other in enumerate(["a", "b", "c"])
+        ]
+    )
+    session.close()
+    client.app.dependency_overrides[get_current_user] = lambda: _user("me", _T0)
+
+    network = client.get("/api/users/me/network", params={"limit": 2}).json()
+    assert [c["id"] for c in network["connections"]] == ["c0", "c1"]
+    assert network["user"]["connection_count"] == 3
+    rest = client.get(
+        "/api/users/me/network", params={"limit": 2, "cursor": network["next_cursor"]}
+    ).json()
+    assert ([c["id"] for c in rest["connections"]], rest["next_cursor"]) == (["c2"], None)
+
+    layered = client.get("/api/users/network/me", params={"limit": 2}).json()
+    assert [m["user"]["id"] for m in layered["first_degree"]] == ["a", "b"]
+    assert layered["next_cursor"] is not None
+
+
+def test_connection_pages_agree_between_sql_and_cache(client):
+    session = _session(client)
+    for uid in ["me", "a", "b"]:
+        SqlUserRepository(session).create(_user(uid, _T0))
+    edges = [
+        Connection(
+            id=f"c{i}",
+            user_a="me" if i % 3 else "a",
+            user_b="b" if i % 3 else "me",
+            source=ConnectionSource.SEED,
+            created_at=_T0 + timedelta(seconds=i // 2),
+        )
+        for i in range(9)
+    ]
+    edges.append(
+        Connection(
+            id="loop", user_a="me", user_b="me", source=ConnectionSource.SEED, created_at=_T0
+        )
+    )
+    sql = SqlConnectionRepository(session)
+    sql.create_batch(edges)
+    cached = CachedConnectionRepository(session, SocialGraphCache())
+
+    for repo in (sql, cached):
+        seen, after = [], None
+        while page := repo.get_connections_page("me", 3, after):
+            seen += page
+            after = (page[-1].created_at, page[-1].id)
+        assert [c.id for c in seen] == [
+            c.id for c in sorted(sql.get_connections("me"), key=lambda c: (c.created_at, c.id))
+        ]
+    session.close()
+
+
+def test_cursor_round_trip_and_rejects_garbage(client):
+    assert decode_cursor(encode_cursor(_T0, "u1")) == (_T0, "u1")
+    assert client.get("/api/users", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/users", params={"limit": 0}).status_code == 422
+
+
+@pytest.mark.parametrize("rows, expected", [(3, None), (4, "u2")])
+def test_split_page_emits_cursor_only_when_more_rows_exist(rows, expected):
+    users = [_user(f"u{i}", _T0) for i in range(rows)]
+    items, cursor = split_page(users, PageParams(limit=3))
+    assert len(items) == 3
+    assert (decode_cursor(cursor)[1] if cursor else None) == expected
@@ -0,0 +1,146 @@
+"""Password hashing off the request path: the process pool, its pending cap, and rehash."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import pytest
+from sqlalchemy import event
+
+from app.adapters.auth.password_hasher import PasswordHasher, PasswordHasherBusy, cost_of
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import get_password_hasher
+from app.core.entities import User
+
+
+def test_cost_of_and_needs_rehash():
+    hasher = PasswordHasher(rounds=5, workers=1, max_pending=1, executor=ThreadPoolExecutor(1))
+    hashed = bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode()
+
+    assert cost_of(hashed) == 4 and cost_of("") is None
+    assert hasher.needs_rehash(hashed)
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(5)).decode())
+
+
+def test_hashes_in_the_process_pool():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=4)
+
+    async def roundtrip():
+        hashed = await hasher.hash("pw")
+        return hashed, await hasher.verify("pw", hashed), await hasher.verify("no", hashed)
+
+    try:
+        hashed, good, bad = asyncio.run(roundtrip())
+    finally:
+        hasher.shutdown()
+    assert (cost_of(hashed), good, bad) == (4, True, False)
+
+
+def test_pending_hashes_are_capped():
+    release = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(release.wait)  # occupy the only worker
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, executor=executor)
+
+    async def storm():
+        first = asyncio.create_task(hasher.hash("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("b")
+        release.set()
+        await first
+        return await hasher.verify("a", await hasher.hash("a"))  # capacity is back
+
+    assert asyncio.run(storm())
+    executor.shutdown()
+
+
+@pytest.fixture
+def stored_user(client):
+    """A user whose password was hashed at cost 5; the test hasher uses cost 4."""
+    session = next(client.app.dependency_overrides[get_session]())
+    repo = SqlUserRepository(session)
+    repo.create(
+        User(
+            id="me",
+            name="Me",
+            email="me@example.com",
+            bio="",
+            skills=[],
+            interests=[],
+            open_to=[],
+            password_hash=bcrypt.hashpw(b"pw", bcrypt.gensalt(5)).decode(),
+        )
+    )
+    yield repo
+    session.close()
+
+
+def _login(client, password: str = "pw"):
+    return client.post("/api/auth/login", json={"email": "me@example.com", "password": password})
+
+
+def test_login_rehashes_to_the_configured_cost(client, stored_user):
+    assert _login(client).status_code == 200
+    assert cost_of(stored_user.get_by_id("me").password_hash) == 4
+
+    assert _login(client).status_code == 200
+    assert _login(client, "wrong").status_code == 401
+
+
+def test_login_without_a_password_hash_is_rejected(client, stored_user):
+    stored_user.update_password_hash("me", "")
+    assert _login(client).status_code == 401
+
+
+def test_busy_hasher_answers_503(client, stored_user):
+    full = PasswordHasher(rounds=4, workers=1, max_pending=0, executor=ThreadPoolExecutor(1))
+    client.app.dependency_overrides[get_password_hasher] = lambda: full
+
+    response = _login(client)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_runs_no_queries_on_the_event_loop(client, stored_user):
+    on_loop = []
+
+    def record(*args):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(args[2])
+        except RuntimeError:
+            pass  # a worker thread, as intended
+
+    bind = stored_user._session.get_bind()
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        assert _login(client).status_code == 200  # lookup, rehash write and session write
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+
+    assert on_loop == []
+
+
+def test_login_holds_no_connection_while_hashing(client, stored_user):
+    pool = stored_user._session.get_bind().pool
+    held = []
+
+    class Recording(PasswordHasher):
+        async def verify(self, password, hashed):
+            held.append(pool.checkedout())
+            return await super().verify(password, hashed)
+
+        async def hash(self, password):
+            held.append(pool.checkedout())
+            return await super().hash(password)
+
+    recording = Recording(rounds=4, workers=1, max_pending=4, executor=ThreadPoolExecutor(1))
+    client.app.dependency_overrides[get_password_hasher] = lambda: recording
+
+    stored_user._session.commit()  # the fixture's own read
+    assert _login(client).status_code == 200  # verify, then rehash to cost 4
+    assert held == [0, 0]
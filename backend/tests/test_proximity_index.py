@@ -0,0 +1,70 @@
+"""ProximityIndex: weighted personalized PageRank vectors and their invalidation."""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.adapters.persistence.graph_cache import CachedConnectionRepository, SocialGraphCache
+from app.adapters.persistence.proximity_index import ProximityIndex
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.core.entities import Connection, User
+from app.core.enums import ConnectionSource
+
+
+def _edge(a: str, b: str, strength: float = 1.0) -> Connection:
+    return Connection(
+        id=f"{a}-{b}", user_a=a, user_b=b, source=ConnectionSource.SEED, strength=strength
+    )
+
+
+def _setup(engine, edges: list[Connection]):
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = session_factory()
+    users = SqlUserRepository(session)
+    for uid in sorted({u for e in edges for u in (e.user_a, e.user_b)} | {"e"}):
+        users.create(
+            User(
+                id=uid,
+                name=uid,
+                email=f"{uid}@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+            )
+        )
+    graph = SocialGraphCache()
+    repo = CachedConnectionRepository(session, graph)
+    repo.create_batch(edges)
+    return repo, ProximityIndex(graph, session_factory, alpha=0.3, epsilon=1e-6)
+
+
+def test_scores_decay_with_distance_and_follow_strength(sqlite_engine):
+    _, index = _setup(
+        sqlite_engine,
+        [_edge("a", "b"), _edge("b", "c"), _edge("c", "d"), _edge("a", "x", 0.1)],
+    )
+
+    scores = index.get_scores("a")
+
+    assert "a" not in scores
+    assert scores["b"] == pytest.approx(1.0)
+    assert scores["b"] > scores["c"] > scores["d"] > 0
+    assert scores["x"] < scores["c"]  # a weak direct tie ranks below a strong 2-hop path
+
+
+def test_new_connection_drops_only_affected_vectors(sqlite_engine):
+    repo, index = _setup(sqlite_engine, [_edge("a", "b"), _edge("c", "d")])
+    assert index.warm() == 4
+    assert "e" not in index.get_scores("a")
+
+    repo.create(_edge("b", "e"))
+
+    assert index.stats()["vectors"] == 2  # a holds b, b is an endpoint; c and d untouched
+    assert index.get_scores("a")["e"] > 0
+    assert index.get_scores("c") == {"d": pytest.approx(1.0)}
+
+
+def test_relate_labels_only_the_given_users(sqlite_engine):
+    _, index = _setup(sqlite_engine, [_edge("a", "b"), _edge("b", "c"), _edge("c", "d")])
+
+    assert index.relate("a", ["b", "c", "d", "e"]) == {"b": (1, []), "c": (2, ["b"])}
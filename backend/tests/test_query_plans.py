@@ -0,0 +1,214 @@
+"""Query-plan regression harness: every repository method must be served by an index.
+
+Each case runs one repository method against a migrated database, captures the SQL it
+issues and runs EXPLAIN QUERY PLAN on each statement. A plan step that scans a table
+without an index ("SCAN connections") fails the test. Full listings such as get_all
+may scan in index order ("SCAN users USING INDEX ..."), which does not sort in a temp
+B-tree. Add a case here when adding a repository method.
+"""
+
+import re
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.connection_request_repo import SqlConnectionRequestRepository
+from app.adapters.persistence.database import Base
+from app.adapters.persistence.feedback_repo import SqlFeedbackRepository
+from app.adapters.persistence.match_repo import SqlMatchRepository
+from app.adapters.persistence.opportunity_embedding_repo import SqlOpportunityEmbeddingRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.ranking_cache_repo import SqlRankingCacheRepository
+from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.core.entities import (
+    Connection,
+    ConnectionRequest,
+    Feedback,
+    Match,
+    Opportunity,
+    RankedMatch,
+    User,
+)
+from app.core.enums import ConnectionSource, OpportunityType
+
+_TABLES = set(Base.metadata.tables)
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+_QUERY_VERBS = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+def _user(uid: str) -> User:
+    return User(
+        id=uid,
+        name=uid,
+        email=f"{uid}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=["job"],
+    )
+
+
+def _match(mid: str, rank: int) -> Match:
+    return Match(
+        id=mid,
+        opportunity_id="o1",
+        user_id="u2",
+        score=0.9,
+        embedding_score=0.8,
+        network_score=0.1,
+        explanation="",
+        rank=rank,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _ranked() -> list[RankedMatch]:
+    return [RankedMatch(user_id="u2", rank=1, score=0.9, explanation="")]
+
+
+CASES = {
+    "connections.get_connections": lambda s: SqlConnectionRepository(s).get_connections("u1"),
+    "connections.get_connections_page": lambda s: SqlConnectionRepository(s).get_connections_page(
+        "u2", 10, (datetime(2020, 1, 1), "c0")
+    ),
+    "connections.get_second_degree": lambda s: SqlConnectionRepository(s).get_second_degree("u1"),
+    "connections.count_connections": lambda s: SqlConnectionRepository(s).count_connections(
+        ["u1", "u2"]
+    ),
+    "connections.relate": lambda s: SqlConnectionRepository(s).relate("u1", ["u2", "u3"]),
+    "connections.shortest_path": lambda s: SqlConnectionRepository(s).shortest_path(
+        "u1", "u3", 4, 100
+    ),
+    "connections.create": lambda s: SqlConnectionRepository(s).create(
+        Connection(id="c9", user_a="u2", user_b="u3", source=ConnectionSource.MANUAL)
+    ),
+    "requests.get_by_id": lambda s: SqlConnectionRequestRepository(s).get_by_id("r1"),
+    "requests.get_incoming": lambda s: SqlConnectionRequestRepository(s).get_incoming("u2"),
+    "requests.get_outgoing": lambda s: SqlConnectionRequestRepository(s).get_outgoing("u1"),
+    "requests.get_incoming_page": lambda s: SqlConnectionRequestRepository(s).get_incoming_page(
+        "u2", 10, (datetime(2100, 1, 1), "r9")
+    ),
+    "requests.count_incoming": lambda s: SqlConnectionRequestRepository(s).count_incoming("u2"),
+    "requests.get_outgoing_page": lambda s: SqlConnectionRequestRepository(s).get_outgoing_page(
+        "u1", 10, (datetime(2100, 1, 1), "r9")
+    ),
+    "requests.update_status": lambda s: SqlConnectionRequestRepository(s).update_status(
+        "r1", "accepted"
+    ),
+    "requests.get_by_opportunity": lambda s: SqlConnectionRequestRepository(s).get_by_opportunity(
+        "o1"
+    ),
+    "requests.exists": lambda s: SqlConnectionRequestRepository(s).exists("u1", "u2", "o1"),
+    "requests.has_accepted_between": lambda s: SqlConnectionRequestRepository(
+        s
+    ).has_accepted_between("u1", "u2"),
+    "requests.get_accepted_between": lambda s: SqlConnectionRequestRepository(
+        s
+    ).get_accepted_between("u1", "u2"),
+    "feedback.get_by_user": lambda s: SqlFeedbackRepository(s).get_by_user("u2"),
+    "feedback.has_feedback": lambda s: SqlFeedbackRepository(s).has_feedback("u1", "u2", "job"),
+    "matches.get_by_opportunity": lambda s: SqlMatchRepository(s).get_by_opportunity("o1"),
+    "matches.get_by_opportunities": lambda s: SqlMatchRepository(s).get_by_opportunities(
+        ["o1", "o2"]
+    ),
+    "matches.update_batch": lambda s: SqlMatchRepository(s).update_batch([_match("m3", 3)], ["m1"]),
+    "matches.get_score_floors": lambda s: SqlMatchRepository(s).get_score_floors(["o1"]),
+    "matches.replace_for_opportunities": lambda s: SqlMatchRepository(s).replace_for_opportunities(
+        ["o1"], [_match("m4", 1)]
+    ),
+    "opportunity_embeddings.missing_ids": lambda s: SqlOpportunityEmbeddingRepository(
+        s
+    ).missing_ids(["o1", "o2"]),
+    "opportunity_embeddings.score": lambda s: SqlOpportunityEmbeddingRepository(s).score(
+        [1.0, 0.0], ["job"]
+    ),
+    "opportunities.get_all": lambda s: SqlOpportunityRepository(s).get_all(),
+    "opportunities.get_page": lambda s: SqlOpportunityRepository(s).get_page(
+        10, (datetime(2100, 1, 1), "o9")
+    ),
+    "opportunities.get_by_id": lambda s: SqlOpportunityRepository(s).get_by_id("o1"),
+    "opportunities.get_by_ids": lambda s: SqlOpportunityRepository(s).get_by_ids(["o1"]),
+    "ranking_cache.get": lambda s: SqlRankingCacheRepository(s, 3600, 10).get("k1"),
+    "ranking_cache.put": lambda s: SqlRankingCacheRepository(s, 3600, 1).put(
+        "k2", ["u2"], _ranked()
+    ),
+    "ranking_cache.invalidate_user": lambda s: SqlRankingCacheRepository(
+        s, 3600, 10
+    ).invalidate_user("u2"),
+    "ranking_cache.stats": lambda s: SqlRankingCacheRepository(s, 3600, 10).stats(),
+    "sessions.get_user_id": lambda s: SqlSessionRepository(s).get_user_id("s1"),
+    "sessions.delete": lambda s: SqlSessionRepository(s).delete("s1"),
+    "users.get_all": lambda s: SqlUserRepository(s).get_all(),
+    "users.get_page": lambda s: SqlUserRepository(s).get_page(10, (datetime(2020, 1, 1), "u0")),
+    "users.get_by_id": lambda s: SqlUserRepository(s).get_by_id("u1"),
+    "users.get_by_ids": lambda s: SqlUserRepository(s).get_by_ids(["u1", "u2"]),
+    "users.search": lambda s: SqlUserRepository(s).search("u", 10),
+    "users.get_by_email": lambda s: SqlUserRepository(s).get_by_email("u1@example.com"),
+}
+
+
+def _seed(session) -> None:
+    users = SqlUserRepository(session)
+    for uid in ["u1", "u2", "u3"]:
+        users.create(_user(uid))
+    opp = Opportunity(id="o1", title="t", description="d", type=OpportunityType.JOB, posted_by="u1")
+    SqlOpportunityRepository(session).create(opp)
+    SqlOpportunityEmbeddingRepository(session).upsert(opp, [1.0, 0.0])
+    SqlConnectionRepository(session).create_batch(
+        [
+            Connection(id="c1", user_a="u1", user_b="u2", source=ConnectionSource.SEED),
+            Connection(id="c2", user_a="u2", user_b="u3", source=ConnectionSource.SEED),
+        ]
+    )
+    SqlConnectionRequestRepository(session).create(
+        ConnectionRequest(id="r1", from_user_id="u1", to_user_id="u2", opportunity_id="o1")
+    )
+    SqlFeedbackRepository(session).create(
+        Feedback(id="f1", from_user_id="u1", to_user_id="u2", opportunity_type="job", text="x")
+    )
+    SqlMatchRepository(session).create_batch([_match("m1", 1), _match("m2", 2)])
+    SqlRankingCacheRepository(session, 3600, 10).put("k1", ["u2"], _ranked())
+    SqlSessionRepository(session).create("s1", "u1")
+
+
+@pytest.fixture
+def seeded_session(sqlite_session):
+    _seed(sqlite_session)
+    return sqlite_session
+
+
+def _plans(engine, statements) -> list[tuple[str, list[str]]]:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        plans = []
+        for sql, params in statements:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plans.append((sql, [row[3] for row in cursor.fetchall()]))
+        return plans
+    finally:
+        raw.close()
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_repository_queries_use_indexes(sqlite_engine, seeded_session, case):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(_QUERY_VERBS):
+            statements.append((statement, parameters))
+
+    event.listen(sqlite_engine, "before_cursor_execute", capture)
+    try:
+        CASES[case](seeded_session)
+    finally:
+        event.remove(sqlite_engine, "before_cursor_execute", capture)
+    seeded_session.commit()
+
+    assert statements, f"{case} issued no queries to check"
+    for sql, steps in _plans(sqlite_engine, statements):
+        scans = [s for s in steps if (m := _FULL_SCAN.match(s)) and m.group(1) in _TABLES]
+        assert not scans, f"{case}: {scans} in plan of\n{sql}\n" + "\n".join(steps)
@@ -0,0 +1,155 @@
+"""Reverse matching: new profiles scored against stored opportunity embeddings."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.adapters.persistence.match_repo import SqlMatchRepository
+from app.adapters.persistence.opportunity_embedding_repo import SqlOpportunityEmbeddingRepository
+from app.adapters.persistence.opportunity_repo import SqlOpportunityRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.core.entities import Match, Opportunity, User
+from app.core.enums import MatchSource, OpportunityType
+from app.services.reverse_matching_service import ReverseMatchingService
+from app.services.user_service import UserService
+
+
+def _user(user_id: str, open_to: list[str]) -> User:
+    return User(
+        id=user_id,
+        name=user_id,
+        email=f"{user_id}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=open_to,
+    )
+
+
+def _match(match_id: str, opp_id: str, user_id: str, embedding_score: float, rank: int) -> Match:
+    return Match(
+        id=match_id,
+        opportunity_id=opp_id,
+        user_id=user_id,
+        score=0.9,
+        embedding_score=embedding_score,
+        network_score=0.0,
+        explanation="LLM explanation",
+        rank=rank,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _seed(session) -> None:
+    users = SqlUserRepository(session)
+    for u in [_user("poster", []), _user("a", ["job"]), _user("b", ["job"])]:
+        users.create(u)
+    opportunities = SqlOpportunityRepository(session)
+    embeddings = SqlOpportunityEmbeddingRepository(session)
+    for opp_id, opp_type, vector in [
+        ("opp-full", OpportunityType.JOB, [1.0, 0.0]),
+        ("opp-open", OpportunityType.JOB, [0.0, 1.0]),
+        ("opp-date", OpportunityType.DATE, [1.0, 0.0]),
+    ]:
+        opp = Opportunity(
+            id=opp_id, title=opp_id, description="", type=opp_type, posted_by="poster"
+        )
+        opportunities.create(opp)
+        embeddings.upsert(opp, vector)
+    SqlMatchRepository(session).create_batch(
+        [
+            _match("m-a", "opp-full", "a", embedding_score=0.9, rank=1),
+            _match("m-b", "opp-full", "b", embedding_score=0.5, rank=2),
+        ]
+    )
+
+
+def test_opportunity_embeddings_scored_in_one_pass(sqlite_session):
+    _seed(sqlite_session)
+    repo = SqlOpportunityEmbeddingRepository(sqlite_session)
+
+    scores = repo.score([3.0, 4.0], ["job"])
+
+    assert scores == {"opp-full": pytest.approx(0.6), "opp-open": pytest.approx(0.8)}
+    assert repo.missing_ids(["opp-full", "unknown"]) == ["unknown"]
+
+
+def test_newcomer_replaces_weakest_match_and_fills_open_slots(sqlite_session):
+    _seed(sqlite_session)
+    SqlUserRepository(sqlite_session).create(_user("new", ["job", "date"]))
+    match_repo = SqlMatchRepository(sqlite_session)
+    service = ReverseMatchingService(
+        SqlOpportunityEmbeddingRepository(sqlite_session), match_repo, top_k=2
+    )
+
+    added = service.match_profile(_user("new", ["job", "date"]), [0.8, 0.6])
+
+    assert sorted(m.opportunity_id for m in added) == ["opp-date", "opp-full", "opp-open"]
+    full = match_repo.get_by_opportunity("opp-full")
+    assert [(m.user_id, m.rank) for m in full] == [("a", 1), ("new", 2)]
+    assert full[1].embedding_score == pytest.approx(0.8)
+    # No LLM score: the similarity is only in embedding_score, and the row is marked.
+    assert (full[1].score, full[1].source) == (0.0, MatchSource.REVERSE)
+    assert "0.80" in full[1].explanation
+    assert [m.user_id for m in match_repo.get_by_opportunity("opp-open")] == ["new"]
+
+
+def test_reverse_matches_rank_after_llm_ranked_ones(sqlite_session):
+    _seed(sqlite_session)
+    users = SqlUserRepository(sqlite_session)
+    match_repo = SqlMatchRepository(sqlite_session)
+    service = ReverseMatchingService(
+        SqlOpportunityEmbeddingRepository(sqlite_session), match_repo, top_k=4
+    )
+    for user_id, vector in [("close", [0.99, 0.14]), ("closest", [1.0, 0.0])]:
+        users.create(_user(user_id, ["job"]))
+        service.match_profile(_user(user_id, ["job"]), vector)
+
+    full = match_repo.get_by_opportunity("opp-full")
+
+    # Both beat every Phase 1 score, yet stay below the LLM-ranked matches.
+    assert [(m.user_id, m.rank) for m in full] == [("a", 1), ("b", 2), ("closest", 3), ("close", 4)]
+    assert [m.source for m in full] == [MatchSource.RANKED] * 2 + [MatchSource.REVERSE] * 2
+
+
+def test_dissimilar_newcomer_does_not_fill_open_slots(sqlite_session):
+    _seed(sqlite_session)
+    match_repo = SqlMatchRepository(sqlite_session)
+    service = ReverseMatchingService(
+        SqlOpportunityEmbeddingRepository(sqlite_session), match_repo, top_k=5, min_similarity=0.5
+    )
+
+    # Similarity 0.8 to opp-full (two of five slots taken), 0.0 to the empty opp-open.
+    added = service.match_profile(_user("new", ["job"]), [0.0, 0.0])
+    added += service.match_profile(_user("new2", ["job"]), [1.0, 0.0])
+
+    assert [(m.user_id, m.opportunity_id) for m in added] == [("new2", "opp-full")]
+    assert match_repo.get_by_opportunity("opp-open") == []
+
+
+def test_newcomer_below_kth_score_is_not_inserted():
+    embeddings = MagicMock()
+    embeddings.score = MagicMock(return_value={"opp-1": 0.4})
+    match_repo = MagicMock()
+    match_repo.get_score_floors = MagicMock(return_value={"opp-1": (5, 0.6)})
+    service = ReverseMatchingService(embeddings, match_repo, top_k=5)
+
+    assert service.match_profile(_user("new", ["job"]), [1.0, 0.0]) == []
+    embeddings.score.assert_called_once_with([1.0, 0.0], ["job"])
+    match_repo.get_by_opportunities.assert_not_called()
+    match_repo.update_batch.assert_not_called()
+
+
+def test_new_profile_is_matched_with_the_vector_it_was_stored_with():
+    embedding = MagicMock()
+    embedding.upsert_profile = MagicMock(return_value=[0.6, 0.8])
+    users = MagicMock()
+    users.create = MagicMock(side_effect=lambda user: user)
+    reverse_matching = MagicMock()
+    service = UserService(users, embedding, reverse_matching=reverse_matching)
+
+    service.create(_user("new", ["job"]))
+
+    embedding.embed_texts.assert_not_called()
+    assert reverse_matching.match_profile.call_args.args[1] == [0.6, 0.8]
@@ -0,0 +1,205 @@
+"""Session cache: TTL and LRU bounds, explicit eviction, and the cross-process stamp."""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.resource_version_repo import SqlResourceVersionRepository
+from app.adapters.persistence.session_cache import AUTH_VERSION_KEY, SessionCache
+from app.adapters.persistence.session_repo import SqlSessionRepository
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api import dependencies
+from app.core.entities import User
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _user(uid: str) -> User:
+    return User(
+        id=uid,
+        name=f"Name {uid}",
+        email=f"{uid}@example.com",
+        bio="",
+        skills=[],
+        interests=[],
+        open_to=[],
+    )
+
+
+def test_entries_expire_and_are_bounded():
+    clock = _Clock()
+    cache = SessionCache(max_entries=2, ttl_seconds=10, poll_seconds=1, clock=clock)
+    cache.put("t1", _user("a"))
+    cache.put("t2", _user("b"))
+    assert cache.get("t1").id == "a"  # t1 is now the most recently used
+    cache.put("t3", _user("c"))
+
+    assert cache.get("t2") is None
+    clock.now = 10
+    assert cache.get("t1") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_never_outlive_their_token():
+    clock = _Clock()
+    cache = SessionCache(max_entries=10, ttl_seconds=60, poll_seconds=1, clock=clock)
+    cache.put("t1", _user("a"), max_age_seconds=5)
+    cache.put("t2", _user("b"), max_age_seconds=0)
+
+    assert cache.get("t2") is None
+    clock.now = 5
+    assert cache.get("t1") is None
+
+
+def test_binding_a_new_scope_flushes():
+    cache = SessionCache(max_entries=10, ttl_seconds=60, poll_seconds=1)
+    cache.bind("keys-1")
+    cache.put("t1", _user("a"))
+    cache.bind("keys-1")
+    assert cache.get("t1").id == "a"
+
+    cache.bind("keys-2")
+
+    assert cache.get("t1") is None
+    assert cache.stats()["flushes"] == 1
+
+
+def test_sync_polls_when_due_and_flushes_on_a_new_stamp():
+    clock = _Clock()
+    cache = SessionCache(max_entries=10, ttl_seconds=60, poll_seconds=1, clock=clock)
+    stamps = iter([0, 0, 1])
+    reads = []
+
+    def read_stamp() -> int:
+        reads.append(clock.now)
+        return next(stamps)
+
+    cache.sync(read_stamp)
+    cache.put("t1", _user("a"))
+    cache.sync(read_stamp)  # not due yet
+    clock.now = 1
+    cache.sync(read_stamp)
+    assert cache.get("t1").id == "a"
+    clock.now = 2
+    cache.sync(read_stamp)
+
+    assert reads == [0, 1, 2]
+    assert cache.get("t1") is None
+
+
+def test_invalidate_user_drops_every_session_of_that_user():
+    cache = SessionCache(max_entries=10, ttl_seconds=60, poll_seconds=1)
+    cache.put("t1", _user("a"))
+    cache.put("t2", _user("a"))
+    cache.put("t3", _user("b"))
+
+    cache.invalidate_user("a")
+
+    assert (cache.get("t1"), cache.get("t2"), cache.get("t3").id) == (None, None, "b")
+
+
+@pytest.fixture
+def auth(client, monkeypatch):
+    """A stored user with a session token, and a session cache driven by a fake clock."""
+    clock = _Clock()
+    cache = SessionCache(max_entries=10, ttl_seconds=60, poll_seconds=1, clock=clock)
+    monkeypatch.setattr(dependencies, "get_session_cache", lambda: cache)
+    session = next(client.app.dependency_overrides[get_session]())
+    SqlUserRepository(session).create(_user("me"))
+    SqlSessionRepository(session).create("token", "me")
+    yield session, clock, {"Authorization": "Bearer token"}
+    session.close()
+
+
+def _count_statements(session, fn) -> int:
+    statements = []
+
+    def listener(*args):
+        statements.append(args[2])
+
+    event.listen(session.get_bind(), "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", listener)
+    return len(statements)
+
+
+def test_cached_login_costs_no_queries(client, auth):
+    session, _, headers = auth
+    assert client.get("/api/auth/me", headers=headers).json()["id"] == "me"
+
+    def me():
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    assert _count_statements(session, me) == 0
+
+
+def test_logout_evicts_the_token(client, auth):
+    _, _, headers = auth
+    client.get("/api/auth/me", headers=headers)
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 204
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_logout_in_another_process_is_seen_within_the_poll_interval(client, auth):
+    session, clock, headers = auth
+    client.get("/api/auth/me", headers=headers)
+    # Another worker logs the token out: only the database changes.
+    session.execute(text("DELETE FROM sessions WHERE id = 'token'"))
+    session.commit()
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    clock.now = 1
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_email_change_in_another_process_refreshes_the_user(client, auth):
+    session, clock, headers = auth
+    client.get("/api/auth/me", headers=headers)
+    session.execute(text("UPDATE users SET email = 'new@example.com' WHERE id = 'me'"))
+    session.commit()
+    clock.now = 1
+
+    assert client.get("/api/auth/me", headers=headers).json()["email"] == "new@example.com"
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        "UPDATE users SET password_hash = 'rehashed' WHERE id = 'me'",
+        "UPDATE users SET name = 'Renamed' WHERE id = 'me'",
+        "UPDATE users SET email = email WHERE id = 'me'",
+    ],
+)
+def test_rehash_and_profile_edits_keep_cached_sessions(client, auth, update):
+    session, clock, headers = auth
+    client.get("/api/auth/me", headers=headers)
+    versions = SqlResourceVersionRepository(session)
+    before = versions.get_version(AUTH_VERSION_KEY)
+    session.execute(text(update))
+    session.commit()
+    clock.now = 1
+
+    assert versions.get_version(AUTH_VERSION_KEY) == before
+    assert client.get("/api/auth/me", headers=headers).json()["name"] == "Name me"
+
+
+def test_password_rehash_leaves_the_profile_version_alone(auth):
+    session, _, _ = auth
+    versions = SqlResourceVersionRepository(session)
+    before = versions.get_version("user:me")
+
+    SqlUserRepository(session).update_password_hash("me", "rehashed")
+    assert versions.get_version("user:me") == before
+
+    session.execute(text("UPDATE users SET bio = 'New bio' WHERE id = 'me'"))
+    session.commit()
+    assert versions.get_version("user:me") != before
@@ -0,0 +1,155 @@
+"""Signed session tokens: verification, key rotation, and denylist-based logout."""
+
+import bcrypt
+import pytest
+from sqlalchemy import event, text
+
+from app.adapters.auth.token_signer import TokenSigner, parse_signing_keys
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.session_cache import SessionCache
+from app.adapters.persistence.signed_session_repo import SignedSessionRepository, TokenDenylist
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api import dependencies
+from app.core.entities import User
+
+
+class _Clock:
+    def __init__(self, now: float = 1_800_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_tokens_verify_until_they_expire():
+    clock = _Clock()
+    signer = TokenSigner({"k1": b"secret"}, ttl_seconds=60, clock=clock)
+    token = signer.issue("u1")
+
+    claims = signer.verify(token)
+    assert (claims.user_id, claims.key_id, claims.issued_at) == ("u1", "k1", int(clock.now))
+    assert signer.issue("u1") != token  # each login gets its own token id
+    clock.now += 60
+    assert signer.verify(token) is None
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda t: t[:-2] + ("AA" if not t.endswith("AA") else "BB"),  # signature
+        lambda t: "eyJzdWIiOiJ1MiJ9" + t[t.index(".") :],  # payload
+        lambda t: t.replace(".", ""),
+        lambda t: "not-base64!." + t.split(".")[1],
+    ],
+)
+def test_tampered_tokens_are_rejected(tamper):
+    signer = TokenSigner({"k1": b"secret"}, ttl_seconds=60)
+    assert signer.verify(tamper(signer.issue("u1"))) is None
+
+
+def test_key_rotation():
+    old = TokenSigner(parse_signing_keys("k1:old"), ttl_seconds=60)
+    rotated = TokenSigner(parse_signing_keys("k2:new, k1:old"), ttl_seconds=60)
+    retired = TokenSigner(parse_signing_keys("k2:new"), ttl_seconds=60)
+    token = old.issue("u1")
+
+    assert rotated.verify(token).key_id == "k1"
+    assert rotated.verify(rotated.issue("u1")).key_id == "k2"
+    assert retired.verify(token) is None
+    with pytest.raises(ValueError):
+        parse_signing_keys("k1")
+    with pytest.raises(ValueError):
+        TokenSigner({}, ttl_seconds=60)
+
+
+def test_fingerprint_follows_keys_and_ttl():
+    signer = TokenSigner(parse_signing_keys("k1:old"), ttl_seconds=60)
+
+    assert signer.fingerprint == TokenSigner({"k1": b"old"}, ttl_seconds=60).fingerprint
+    assert signer.fingerprint != TokenSigner({"k1": b"new"}, ttl_seconds=60).fingerprint
+    assert signer.fingerprint != TokenSigner({"k1": b"old"}, ttl_seconds=30).fingerprint
+
+
+@pytest.fixture
+def signed(client, monkeypatch):
+    """Signed-token mode with the session cache off, so every request resolves its token."""
+    signer = TokenSigner({"k1": b"secret"}, ttl_seconds=3600)
+    monkeypatch.setattr(dependencies, "get_token_signer", lambda: signer)
+    denylist = TokenDenylist(poll_seconds=60)
+    monkeypatch.setattr(dependencies, "get_token_denylist", lambda: denylist)
+    monkeypatch.setattr(dependencies, "get_session_cache", lambda: None)
+    session = next(client.app.dependency_overrides[get_session]())
+    SqlUserRepository(session).create(
+        User(
+            id="me",
+            name="Me",
+            email="me@example.com",
+            bio="",
+            skills=[],
+            interests=[],
+            open_to=[],
+            password_hash=bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode(),
+        )
+    )
+    token = client.post(
+        "/api/auth/login", json={"email": "me@example.com", "password": "pw"}
+    ).json()["token"]
+    yield session, {"Authorization": f"Bearer {token}"}
+    session.close()
+
+
+def _statements(session, fn) -> list[str]:
+    statements = []
+
+    def listener(*args):
+        statements.append(args[2])
+
+    event.listen(session.get_bind(), "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(session.get_bind(), "before_cursor_execute", listener)
+    return statements
+
+
+def test_login_issues_a_token_that_needs_no_session_row(client, signed):
+    session, headers = signed
+    client.get("/api/auth/me", headers=headers)  # first request loads the denylist
+
+    statements = _statements(
+        session, lambda: client.get("/api/auth/me", headers=headers).raise_for_status()
+    )
+
+    assert len(statements) == 1 and "FROM users" in statements[0]
+    assert session.execute(text("SELECT COUNT(*) FROM sessions")).scalar() == 0
+
+
+def test_logout_revokes_here_and_in_other_processes(client, signed, monkeypatch):
+    _, headers = signed
+    assert client.post("/api/auth/logout", headers=headers).status_code == 204
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    # A process that starts afterwards loads the revocation from the database.
+    fresh = TokenDenylist(poll_seconds=60)
+    monkeypatch.setattr(dependencies, "get_token_denylist", lambda: fresh)
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    forged = {"Authorization": "Bearer forged.x"}
+    assert client.get("/api/auth/me", headers=forged).status_code == 401
+
+
+def test_cached_sessions_expire_with_the_token_and_the_keys(client, signed, monkeypatch):
+    session, headers = signed
+    cache = SessionCache(max_entries=10, ttl_seconds=3600, poll_seconds=60)
+    monkeypatch.setattr(dependencies, "get_session_cache", lambda: cache)
+    token = headers["Authorization"].split(" ", 1)[1]
+    expires_at = SignedSessionRepository(
+        session, dependencies.get_token_signer(), TokenDenylist(poll_seconds=60)
+    ).get_expiry(token)
+    assert expires_at == dependencies.get_token_signer().verify(token).issued_at + 3600
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert cache.stats()["entries"] == 1
+
+    retired = TokenSigner({"k2": b"new"}, ttl_seconds=3600)
+    monkeypatch.setattr(dependencies, "get_token_signer", lambda: retired)
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
@@ -0,0 +1,208 @@
+"""User search: bm25 ranking, prefix matching, the trigger-maintained index and hybrid fusion."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.api.dependencies import get_current_user, get_embedding
+from app.core.entities import Connection, User
+from app.core.enums import ConnectionSource
+from app.services.search_service import SearchService, reciprocal_rank_fusion
+
+
+def _user(uid: str, name: str, bio: str = "", skills=(), interests=()) -> User:
+    return User(
+        id=uid,
+        name=name,
+        email=f"{uid}@example.com",
+        bio=bio,
+        skills=list(skills),
+        interests=list(interests),
+        open_to=[],
+    )
+
+
+@pytest.fixture
+def repo(sqlite_session):
+    repo = SqlUserRepository(sqlite_session)
+    for user in [
+        _user("u1", "Ada Lovelace", bio="Poet of science", skills=["Mathematics"]),
+        _user("u2", "Grace Hopper", bio="Wrote the first compiler", skills=["COBOL"]),
+        _user("u3", "Alan Turing", bio="Broke ciphers; loved mathematics", interests=["Chess"]),
+        _user("u4", "Mathilde Krim", bio="Researcher", interests=["Biology"]),
+    ]:
+        repo.create(user)
+    return repo
+
+
+def _ids(users: list[User]) -> list[str]:
+    return [u.id for u in users]
+
+
+def test_ranked_by_field_weight(repo):
+    # A skill hit outranks the same word in a bio.
+    assert _ids(repo.search("mathematics", 10)) == ["u1", "u3"]
+
+
+def test_prefix_queries_for_type_ahead(repo):
+    assert _ids(repo.search("gra", 10)) == ["u2"]
+    assert set(_ids(repo.search("math", 10))) == {"u1", "u3", "u4"}
+    assert _ids(repo.search("alan tur", 10)) == ["u3"]  # every word must match
+    assert _ids(repo.search("math", 1)) == _ids(repo.search("math", 10))[:1]
+
+
+def test_words_match_from_their_start_only(repo):
+    # Prefix terms, unlike the ILIKE '%q%' search this replaced: no infix matches.
+    repo.create(_user("u5", "Brendan Eich", skills=["JavaScript"]))
+    assert _ids(repo.search("java", 10)) == ["u5"]
+    assert _ids(repo.search("script", 10)) == []
+    assert _ids(repo.search("hopper", 10)) == ["u2"]
+    assert _ids(repo.search("opper", 10)) == []
+
+
+def test_operators_in_input_are_searched_as_words(repo):
+    assert _ids(repo.search('"chess* (', 10)) == ["u3"]
+    assert _ids(repo.search("turing NOT", 10)) == []  # NOT is a word here, not an operator
+    assert repo.search("  ;;  ", 10) == []
+
+
+def test_index_follows_updates_and_deletes(repo):
+    session = repo._session
+    session.execute(text("UPDATE users SET bio = 'Knits sweaters' WHERE id = 'u2'"))
+    session.execute(text("DELETE FROM users WHERE id = 'u4'"))
+    session.commit()
+
+    assert _ids(repo.search("compiler", 10)) == []
+    assert _ids(repo.search("sweaters", 10)) == ["u2"]
+    assert _ids(repo.search("biology", 10)) == []
+
+
+def test_index_does_not_depend_on_users_rowid(repo):
+    session = repo._session
+    session.execute(text("UPDATE users SET rowid = rowid + 100"))  # as VACUUM or a rebuild may
+    session.commit()
+
+    assert _ids(repo.search("mathematics", 10)) == ["u1", "u3"]
+    repo.create(_user("u5", "Barbara Liskov", skills=["Mathematics"]))
+    assert set(_ids(repo.search("mathematics", 10))) == {"u1", "u3", "u5"}
+
+
+def test_search_route_excludes_self_and_annotates_degree(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    users = SqlUserRepository(session)
+    for user in [
+        _user("me", "Rust Fan", skills=["Rust"]),
+        _user("friend", "Bea", skills=["Rust"]),
+        _user("fof", "Cy", skills=["Rust", "Go"]),
+        _user("far", "Di", bio="Learning rust"),
+    ]:
+        users.create(user)
+    SqlConnectionRepository(session).create_batch(
+        [
+            Connection(id="c1", user_a="me", user_b="friend", source=ConnectionSource.SEED),
+            Connection(id="c2", user_a="friend", user_b="fof", source=ConnectionSource.SEED),
+        ]
+    )
+    session.close()
+    client.app.dependency_overrides[get_current_user] = lambda: _user("me", "Rust Fan")
+
+    results = client.get("/api/users/search", params={"q": "rus"}).json()
+
+    assert {r["user"]["id"]: r["degree"] for r in results} == {
+        "friend": "1st",
+        "fof": "2nd",
+        "far": "other",
+    }
+    assert results[-1]["user"]["id"] == "far"  # bio-only hit ranks last
+    assert next(r for r in results if r["degree"] == "2nd")["shared_connections"] == ["Bea"]
+    assert len(client.get("/api/users/search", params={"q": "rust", "limit": 2}).json()) == 2
+
+
+def _embedding(user_ids=(), delay=0.0, error=None, scores=None) -> MagicMock:
+    def search_similar(query_text, n_results=15, where=None):
+        time.sleep(delay)
+        if error:
+            raise error
+        hits = [
+            {"user_id": uid, "score": (scores or {}).get(uid, 0.5), "metadata": {}}
+            for uid in user_ids
+        ]
+        return hits[:n_results]
+
+    embedding = MagicMock()
+    embedding.search_similar.side_effect = search_similar
+    return embedding
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    assert reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60) == ["c", "a", "b", "d"]
+    assert reciprocal_rank_fusion([["a"], ["b"]], k=60) == ["a", "b"]  # ties: first list wins
+
+
+def test_hybrid_fuses_vector_only_matches(repo, executor):
+    # "mathematics" is lexical for u1 and u3; the vector side also finds u4 (Biology).
+    svc = SearchService(repo, _embedding(["u3", "u4", "u1"]), executor, budget_seconds=5)
+
+    outcome = svc.search("mathematics", 10, mode="hybrid", exclude_id="u1")
+
+    assert outcome.mode == "hybrid"
+    assert _ids(outcome.users) == ["u3", "u4"]
+    # u3 is 2nd lexically but 1st by vector, so it overtakes u1 (1st and 3rd).
+    assert _ids(svc.search("mathematics", 1, mode="hybrid").users) == ["u3"]
+
+
+def test_hybrid_drops_vector_hits_below_the_similarity_floor(repo, executor):
+    embedding = _embedding(["u4", "u3"], scores={"u4": 0.1})
+    svc = SearchService(repo, embedding, executor, budget_seconds=5, min_similarity=0.3)
+
+    outcome = svc.search("mathematics", 10, mode="hybrid")
+
+    assert (outcome.mode, _ids(outcome.users)) == ("hybrid", ["u3", "u1"])
+
+
+@pytest.mark.parametrize(
+    "embedding",
+    [
+        _embedding(["u4"], delay=0.5),
+        _embedding(error=RuntimeError("index offline")),
+    ],
+)
+def test_hybrid_degrades_to_lexical(repo, executor, embedding):
+    svc = SearchService(repo, embedding, executor, budget_seconds=0.05)
+
+    start = time.perf_counter()
+    outcome = svc.search("mathematics", 10, mode="hybrid")
+
+    assert time.perf_counter() - start < 0.4
+    assert (outcome.mode, _ids(outcome.users)) == ("lexical", ["u1", "u3"])
+
+
+def test_search_route_hybrid_mode_header(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    users = SqlUserRepository(session)
+    for user in [_user("me", "Me"), _user("a", "Ana", skills=["Rust"]), _user("b", "Bo")]:
+        users.create(user)
+    session.close()
+    client.app.dependency_overrides[get_current_user] = lambda: _user("me", "Me")
+    client.app.dependency_overrides[get_embedding] = lambda: _embedding(["me", "b"])
+
+    lexical = client.get("/api/users/search", params={"q": "rust"})
+    hybrid = client.get("/api/users/search", params={"q": "rust", "mode": "hybrid"})
+
+    assert lexical.headers["X-Search-Mode"] == "lexical"
+    assert [r["user"]["id"] for r in lexical.json()] == ["a"]
+    assert hybrid.headers["X-Search-Mode"] == "hybrid"
+    assert [r["user"]["id"] for r in hybrid.json()] == ["a", "b"]
+    assert client.get("/api/users/search", params={"q": "x", "mode": "fuzzy"}).status_code == 422
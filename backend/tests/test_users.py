@@ -1,7 +1,17 @@
+import pytest
+
+from app.adapters.persistence.connection_repo import SqlConnectionRepository
+from app.adapters.persistence.database import get_session
+from app.adapters.persistence.user_repo import SqlUserRepository
+from app.config import settings
+from app.core.entities import Connection, User
+from app.core.enums import ConnectionSource
+
+
 def test_list_users_empty(client):
     response = client.get("/api/users")
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 def test_create_user_returns_201(client):
@@ -61,5 +71,70 @@ def test_list_users_after_create(client):
     )
     response = client.get("/api/users")
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["name"] == "One"
+    assert len(response.json()["items"]) == 1
+    assert response.json()["items"][0]["name"] == "One"
+
+
+def test_connection_counts_on_list_and_detail(client):
+    session = next(client.app.dependency_overrides[get_session]())
+    for uid in ["a", "b", "c"]:
+        SqlUserRepository(session).create(
+            User(
+                id=uid,
+                name=uid,
+                email=f"{uid}@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+            )
+        )
+    SqlConnectionRepository(session).create_batch(
+        [
+            Connection(id="ab", user_a="a", user_b="b", source=ConnectionSource.SEED),
+            Connection(id="ca", user_a="c", user_b="a", source=ConnectionSource.SEED),
+        ]
+    )
+    session.close()
+
+    listed = client.get("/api/users").json()["items"]
+    assert {u["id"]: u["connection_count"] for u in listed} == {"a": 2, "b": 1, "c": 1}
+    assert client.get("/api/users/b").json()["connection_count"] == 1
+
+
+@pytest.mark.parametrize("graph_cache_enabled", [True, False])
+def test_connection_path_between_members(client, monkeypatch, graph_cache_enabled):
+    monkeypatch.setattr(settings, "graph_cache_enabled", graph_cache_enabled)
+    session = next(client.app.dependency_overrides[get_session]())
+    for uid in ["a", "b", "c", "d"]:
+        SqlUserRepository(session).create(
+            User(
+                id=uid,
+                name=f"Name {uid}",
+                email=f"{uid}@example.com",
+                bio="",
+                skills=[],
+                interests=[],
+                open_to=[],
+            )
+        )
+    SqlConnectionRepository(session).create_batch(
+        [
+            Connection(id="ab", user_a="a", user_b="b", source=ConnectionSource.SEED),
+            Connection(id="cb", user_a="c", user_b="b", source=ConnectionSource.SEED),
+        ]
+    )
+    session.close()
+
+    response = client.get("/api/users/a/path/c")
+    assert response.status_code == 200
+    assert response.json() == {
+        "degree": 2,
+        "path": [
+            {"user_id": "a", "name": "Name a"},
+            {"user_id": "b", "name": "Name b"},
+            {"user_id": "c", "name": "Name c"},
+        ],
+    }
+    assert client.get("/api/users/a/path/d").json()["detail"] == "No connection path found"
+    assert client.get("/api/users/a/path/zz").json()["detail"] == "User not found"
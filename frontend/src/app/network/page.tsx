@@ -5,6 +5,7 @@ import Link from "next/link";
 import { api } from "@/lib/api";
 import type { ConnectionRequest, LayeredNetwork, SearchResult } from "@/lib/types";
 import { Badge } from "@/components/ui/badge";
+import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Separator } from "@/components/ui/separator";
@@ -20,7 +21,9 @@ const DEGREE_BADGE: Record<string, string> = {
 export default function NetworkPage() {
   const [network, setNetwork] = useState<LayeredNetwork | null>(null);
   const [incoming, setIncoming] = useState<ConnectionRequest[]>([]);
+  const [incomingCursor, setIncomingCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState("");
   const [searchResults, setSearchResults] = useState<SearchResult[] | null>(null);
   const [searching, setSearching] = useState(false);
@@ -29,12 +32,42 @@ export default function NetworkPage() {
     Promise.all([api.users.myNetwork(), api.connectionRequests.incoming()])
       .then(([net, reqs]) => {
         setNetwork(net);
-        setIncoming(reqs);
+        setIncoming(reqs.items);
+        setIncomingCursor(reqs.next_cursor);
         setLoading(false);
       })
       .catch(() => setLoading(false));
   }, []);
 
+  const loadMoreConnections = () => {
+    if (!network?.next_cursor) return;
+    setLoadingMore(true);
+    api.users
+      .myNetwork(network.next_cursor)
+      .then((page) =>
+        setNetwork((prev) =>
+          prev && {
+            ...prev,
+            first_degree: [...prev.first_degree, ...page.first_degree],
+            next_cursor: page.next_cursor,
+          }
+        )
+      )
+      .finally(() => setLoadingMore(false));
+  };
+
+  const loadMoreIncoming = () => {
+    if (!incomingCursor) return;
+    setLoadingMore(true);
+    api.connectionRequests
+      .incoming(incomingCursor)
+      .then((page) => {
+        setIncoming((prev) => [...prev, ...page.items]);
+        setIncomingCursor(page.next_cursor);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   useEffect(() => {
     loadData();
   }, [loadData]);
@@ -149,13 +182,20 @@ export default function NetworkPage() {
           {incoming.length > 0 && (
             <div className="space-y-3">
               <h2 className="text-lg font-semibold">
-                Incoming Requests ({incoming.length})
+                Incoming Requests ({network?.pending_incoming ?? incoming.length})
               </h2>
               <div className="space-y-2">
                 {incoming.map((req) => (
                   <RequestCard key={req.id} request={req} type="incoming" onAction={loadData} />
                 ))}
               </div>
+              {incomingCursor && (
+                <div className="flex justify-center">
+                  <Button variant="outline" onClick={loadMoreIncoming} disabled={loadingMore}>
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </Button>
+                </div>
+              )}
               <Separator />
             </div>
           )}
@@ -164,7 +204,8 @@ export default function NetworkPage() {
             <>
               <div className="space-y-4">
                 <h2 className="text-lg font-semibold">
-                  Direct Connections ({network.first_degree.length})
+                  Direct Connections ({network.first_degree.length}
+                  {network.next_cursor ? "+" : ""})
                 </h2>
                 {network.first_degree.length === 0 ? (
                   <p className="text-muted-foreground text-sm">
@@ -177,6 +218,13 @@ export default function NetworkPage() {
                     ))}
                   </div>
                 )}
+                {network.next_cursor && (
+                  <div className="flex justify-center">
+                    <Button variant="outline" onClick={loadMoreConnections} disabled={loadingMore}>
+                      {loadingMore ? "Loading..." : "Load more"}
+                    </Button>
+                  </div>
+                )}
               </div>
 
               {network.second_degree.length > 0 && (
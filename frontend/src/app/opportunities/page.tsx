@@ -11,15 +11,30 @@ import { useCurrentUser } from "@/hooks/use-current-user";
 export default function OpportunitiesPage() {
   const { currentUser } = useCurrentUser();
   const [opps, setOpps] = useState<Opportunity[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    api.opportunities.list().then((data) => {
-      setOpps(data);
+    api.opportunities.list().then((page) => {
+      setOpps(page.items);
+      setNextCursor(page.next_cursor);
       setLoading(false);
     });
   }, []);
 
+  const loadMore = () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    api.opportunities
+      .list(nextCursor)
+      .then((page) => {
+        setOpps((prev) => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   const myOpps = useMemo(
     () => (currentUser ? opps.filter((o) => o.posted_by === currentUser.id) : []),
     [opps, currentUser]
@@ -47,7 +62,10 @@ export default function OpportunitiesPage() {
       <div className="flex items-center justify-between">
         <div>
           <h1 className="text-3xl font-bold">Opportunities</h1>
-          <p className="text-muted-foreground mt-1">{opps.length} active opportunities</p>
+          <p className="text-muted-foreground mt-1">
+            {opps.length}
+            {nextCursor ? "+" : ""} active opportunities
+          </p>
         </div>
         <Link href="/opportunities/new">
           <Button>Post Opportunity</Button>
@@ -84,6 +102,14 @@ export default function OpportunitiesPage() {
               </div>
             </div>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center">
+              <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </>
       )}
     </div>
@@ -6,6 +6,7 @@ import Link from "next/link";
 import { api } from "@/lib/api";
 import type { User, NetworkData, Impression } from "@/lib/types";
 import { Badge } from "@/components/ui/badge";
+import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Separator } from "@/components/ui/separator";
 import { FeedbackForm } from "@/components/feedback-form";
@@ -19,6 +20,7 @@ export default function ProfileDetailPage() {
   const [network, setNetwork] = useState<NetworkData | null>(null);
   const [impression, setImpression] = useState<Impression | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [canLeaveFeedback, setCanLeaveFeedback] = useState(false);
 
   const loadImpression = useCallback(() => {
@@ -34,6 +36,23 @@ export default function ProfileDetailPage() {
     loadImpression();
   }, [id, loadImpression]);
 
+  const loadMore = () => {
+    if (!network?.next_cursor) return;
+    setLoadingMore(true);
+    api.users
+      .network(id, network.next_cursor)
+      .then((page) =>
+        setNetwork((prev) =>
+          prev && {
+            ...prev,
+            connections: [...prev.connections, ...page.connections],
+            next_cursor: page.next_cursor,
+          }
+        )
+      )
+      .finally(() => setLoadingMore(false));
+  };
+
   useEffect(() => {
     if (currentUser && currentUser.id !== id) {
       api.feedback.canLeave(id).then((r) => setCanLeaveFeedback(r.allowed)).catch(() => {});
@@ -150,7 +169,7 @@ export default function ProfileDetailPage() {
           <Separator />
           <div>
             <h2 className="text-xl font-semibold mb-4">
-              Connections ({network.connections.length})
+              Connections ({user.connection_count})
             </h2>
             <div className="grid grid-cols-1 sm:grid-cols-2 gap-3">
               {network.connections.map((conn) => (
@@ -172,6 +191,13 @@ export default function ProfileDetailPage() {
                 </Link>
               ))}
             </div>
+            {network.next_cursor && (
+              <div className="flex justify-center mt-4">
+                <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? "Loading..." : "Load more"}
+                </Button>
+              </div>
+            )}
           </div>
         </>
       )}
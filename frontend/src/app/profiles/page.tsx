@@ -4,18 +4,34 @@ import { useEffect, useState } from "react";
 import { api } from "@/lib/api";
 import type { User } from "@/lib/types";
 import { ProfileCard } from "@/components/profile-card";
+import { Button } from "@/components/ui/button";
 
 export default function ProfilesPage() {
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    api.users.list().then((data) => {
-      setUsers(data);
+    api.users.list().then((page) => {
+      setUsers(page.items);
+      setNextCursor(page.next_cursor);
       setLoading(false);
     });
   }, []);
 
+  const loadMore = () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    api.users
+      .list(nextCursor)
+      .then((page) => {
+        setUsers((prev) => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
+      })
+      .finally(() => setLoadingMore(false));
+  };
+
   if (loading) {
     return (
       <div className="space-y-6">
@@ -34,7 +50,7 @@ export default function ProfilesPage() {
       <div>
         <h1 className="text-3xl font-bold">People in the Network</h1>
         <p className="text-muted-foreground mt-1">
-          {users.length} people ready to connect
+          {users.length}{nextCursor ? "+" : ""} people ready to connect
         </p>
       </div>
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
@@ -42,6 +58,13 @@ export default function ProfilesPage() {
           <ProfileCard key={user.id} user={user} />
         ))}
       </div>
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -66,8 +66,17 @@ export function MatchCard({ match, rank, showConnect, opportunityId }: MatchCard
             <p className="text-xs text-muted-foreground line-clamp-1">{match.user_bio}</p>
           </div>
           <div className="text-right shrink-0">
-            <div className="text-2xl font-bold">{scorePercent}%</div>
-            <div className="text-xs text-muted-foreground">match</div>
+            {match.source === "reverse" ? (
+              <>
+                <div className="text-2xl font-bold">{embeddingPercent}%</div>
+                <div className="text-xs text-muted-foreground">similar, not ranked</div>
+              </>
+            ) : (
+              <>
+                <div className="text-2xl font-bold">{scorePercent}%</div>
+                <div className="text-xs text-muted-foreground">match</div>
+              </>
+            )}
           </div>
         </div>
       </CardHeader>
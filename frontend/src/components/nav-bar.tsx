@@ -13,8 +13,8 @@ export function NavBar() {
   useEffect(() => {
     if (!currentUser) return;
     api.connectionRequests
-      .incoming()
-      .then((reqs) => setPendingCount(reqs.length))
+      .incomingCount()
+      .then((r) => setPendingCount(r.count))
       .catch(() => {});
   }, [currentUser]);
 
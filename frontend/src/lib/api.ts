@@ -6,12 +6,17 @@ import type {
   NetworkData,
   Opportunity,
   OpportunityDetail,
+  Page,
   SearchResult,
   User,
 } from "./types";
 
 const BASE = "/api";
 
+function pageQuery(cursor?: string): string {
+  return cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+}
+
 function getToken(): string | null {
   if (typeof window === "undefined") return null;
   return localStorage.getItem("serendip_token");
@@ -60,15 +65,19 @@ export const api = {
     logout: () => fetcher<void>("/auth/logout", { method: "POST" }),
   },
   users: {
-    list: () => fetcher<User[]>("/users"),
+    list: (cursor?: string) => fetcher<Page<User>>(`/users${pageQuery(cursor)}`),
     get: (id: string) => fetcher<User>(`/users/${id}`),
-    network: (id: string) => fetcher<NetworkData>(`/users/${id}/network`),
-    myNetwork: () => fetcher<LayeredNetwork>("/users/network/me"),
-    search: (q: string) => fetcher<SearchResult[]>(`/users/search?q=${encodeURIComponent(q)}`),
+    network: (id: string, cursor?: string) =>
+      fetcher<NetworkData>(`/users/${id}/network${pageQuery(cursor)}`),
+    myNetwork: (cursor?: string) =>
+      fetcher<LayeredNetwork>(`/users/network/me${pageQuery(cursor)}`),
+    search: (q: string, mode: "lexical" | "hybrid" = "lexical") =>
+      fetcher<SearchResult[]>(`/users/search?q=${encodeURIComponent(q)}&mode=${mode}`),
     impression: (id: string) => fetcher<Impression>(`/users/${id}/impression`),
   },
   opportunities: {
-    list: () => fetcher<Opportunity[]>("/opportunities"),
+    list: (cursor?: string) =>
+      fetcher<Page<Opportunity>>(`/opportunities${pageQuery(cursor)}`),
     get: (id: string) => fetcher<OpportunityDetail>(`/opportunities/${id}`),
     create: (data: { title: string; description: string; type: string; posted_by: string }) =>
       fetcher<OpportunityDetail>("/opportunities", {
@@ -100,8 +109,11 @@ export const api = {
       }),
     check: (opportunityId: string, toUserId: string) =>
       fetcher<{ exists: boolean }>(`/connection-requests/check?opportunity_id=${encodeURIComponent(opportunityId)}&to_user_id=${encodeURIComponent(toUserId)}`),
-    incoming: () => fetcher<ConnectionRequest[]>("/connection-requests/incoming"),
-    outgoing: () => fetcher<ConnectionRequest[]>("/connection-requests/outgoing"),
+    incoming: (cursor?: string) =>
+      fetcher<Page<ConnectionRequest>>(`/connection-requests/incoming${pageQuery(cursor)}`),
+    incomingCount: () => fetcher<{ count: number }>("/connection-requests/incoming/count"),
+    outgoing: (cursor?: string) =>
+      fetcher<Page<ConnectionRequest>>(`/connection-requests/outgoing${pageQuery(cursor)}`),
     byOpportunity: (opportunityId: string) =>
       fetcher<ConnectionRequest[]>(`/connection-requests/by-opportunity/${opportunityId}`),
     accept: (id: string) =>
@@ -44,6 +44,7 @@ export interface Match {
   explanation: string;
   rank: number;
   created_at: string;
+  source: "ranked" | "reverse";
 }
 
 export interface OpportunityDetail {
@@ -62,6 +63,13 @@ export interface Connection {
 export interface NetworkData {
   user: User;
   connections: Connection[];
+  next_cursor: string | null;
+}
+
+/** One page of a list endpoint; pass `next_cursor` back as `cursor` for the next. */
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
 }
 
 export interface ConnectionRequest {
@@ -88,6 +96,7 @@ export interface LayeredNetwork {
   first_degree: NetworkMember[];
   second_degree: NetworkMember[];
   pending_incoming: number;
+  next_cursor: string | null;
 }
 
 export interface SearchResult {